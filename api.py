@@ -1,10 +1,21 @@
 # flask api example
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_restful import Resource, Api
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+import catalog
+import events
+import extractor
+import jobs
+import metrics
 import settings
-import tray
+import timelapse
+import timelines
 import recorder
-import csv
+import recordings
+import mimetypes
+import sys
+import threading
 
 import logging
 from logging.handlers import RotatingFileHandler
@@ -12,6 +23,16 @@ from logging.handlers import RotatingFileHandler
 
 
 INDEX_PATH = r"frontend\public"
+HOST = "127.0.0.1"
+PORT = 5000
+# waitress worker threads. An open event stream holds one for as long as it is open. A media download
+# does not: the file goes to waitress's file wrapper and its I/O thread sends it, see request_media.
+MAX_EVENT_STREAMS = 8  # browser tabs with the web interface open
+SERVER_THREADS = MAX_EVENT_STREAMS + 8  # and a few for the other requests
+# folders of the home directory that can be streamed, by their name in the url
+MEDIA_FOLDERS = {"records": "Records", "extracts": "Extracts", "timelapses": "Timelapses"}
+mimetypes.add_type("video/x-matroska", ".mkv")  # not registered on every windows install
+_EVENT_STREAMS = threading.BoundedSemaphore(MAX_EVENT_STREAMS)  # a slot per open event stream
 
 # this path contains index.html and all the other frontend files
 app = Flask(__name__, static_folder = INDEX_PATH)
@@ -45,22 +66,86 @@ def status():
         return jsonify(recorder.ACTIVE_RECORDER.get_status())
 
 
+@app.route("/api/metrics")
+def loop_metrics():
+    """get the capture loop timings, Prometheus text unless ?format=json or Accept asks for JSON"""
+    wants_json = request.args.get("format") == "json" or (
+        request.accept_mimetypes.best_match(["text/plain", "application/json"]) == "application/json"
+    )
+    if wants_json:
+        return jsonify(metrics.as_dict())
+    return Response(metrics.prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/events")
+def event_stream():
+    """server-sent events: "state" when recording starts, pauses or stops, "status" with the encoder progress
+    answers 503 while MAX_EVENT_STREAMS are open, so the streams never take the worker threads of the other
+    requests. A stream whose client went away ends at its next keepalive, when the write fails"""
+    if not _EVENT_STREAMS.acquire(blocking=False):
+        return jsonify({"error": "too many event streams"}), 503, {"Retry-After": str(events.KEEPALIVE_SECONDS)}
+    response = Response(
+        events.stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # the server closes the response when the stream ends or the client disconnects
+    response.call_on_close(_EVENT_STREAMS.release)
+    return response
+
+
+def control(action: str):
+    """start, stop or pause the recorder, the tray shows the new state if the app runs one"""
+    result = getattr(recorder, action)()
+    # never imported here, it loads pystray and the standalone server has no tray icon
+    tray = sys.modules.get("tray")
+    if tray is not None:
+        tray.show_state(action, result)
+    return result
+
+
+def control_job(action: str):
+    """run a recorder control in the background, answers 202 with the queued job"""
+    job = jobs.run(action, control, action)
+    response = jsonify(job.as_dict())
+    response.status_code = 202
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return response
+
+
 @app.route("/api/controls/start", methods=["POST"])
-def start():
-    tray.start()
-    return jsonify({"status": "started"})
+def start_recording():
+    return control_job("start")
 
 
 @app.route("/api/controls/stop", methods=["POST"])
-def stop():
-    tray.stop()
-    return jsonify({"status": "stopped"})
+def stop_recording():
+    return control_job("stop")
 
 
 @app.route("/api/controls/pause", methods=["POST"])
-def pause():
-    tray.pause()
-    return jsonify({"status": "paused"})
+def pause_recording():
+    return control_job("pause")
+
+
+@app.route("/api/jobs")
+def job_list():
+    """get every background job: controls, extractions, timelapses and recordings (capturing or finalising)"""
+    listing = [job.as_dict() for job in list(jobs.JOBS.values())]
+    listing += [dict(job.as_dict(), kind="extract") for job in list(extractor.JOBS.values())]
+    listing += [dict(job.as_dict(), kind="timelapse") for job in list(timelapse.JOBS.values())]
+    listing += [dict(session, kind="recording") for session in recorder.sessions()]
+    return jsonify(sorted(listing, key=lambda job: job["started"]))
+
+
+@app.route("/api/jobs/<job_id>")
+def job_progress(job_id):
+    """get one background job"""
+    job = jobs.JOBS.get(job_id) or extractor.JOBS.get(job_id) or timelapse.JOBS.get(job_id)
+    job = job or recorder.SESSIONS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job.as_dict())
 
 
 @app.route("/api/media/thumbnails")
@@ -71,29 +156,165 @@ def request_thumbnails():
     thumbnails = [str(p) for p in path.iterdir()]
     return jsonify(thumbnails)
 
+@app.route("/api/search")
+def search():
+    """search the window titles of all recordings, newest first
+    query parameters: q (required), app, since and until (unix time), limit, offset"""
+    text = request.args.get("q", "")
+    results = catalog.search(
+        text,
+        app=request.args.get("app"),
+        since=request.args.get("since", type=float),
+        until=request.args.get("until", type=float),
+        limit=min(request.args.get("limit", 50, type=int), 500),
+        offset=request.args.get("offset", 0, type=int),
+    )
+    return jsonify(results)
+
+@app.route("/api/timelines")
+def request_timelines():
+    """get the apps that have a timeline"""
+    return jsonify(timelines.list_apps())
+
+
+@app.route("/api/extract", methods=["POST"])
+def start_extraction():
+    """extract the takes of the given apps into one video per app, all apps if none are given
+    body: {"apps": ["app name", ...]}"""
+    apps = (request.get_json(silent=True) or {}).get("apps")
+    if apps is not None and not (isinstance(apps, list) and all(isinstance(app, str) for app in apps)):
+        return jsonify({"error": "apps has to be a list of app names"}), 400
+    unknown = sorted(set(apps or ()) - set(timelines.list_apps()))
+    if unknown:
+        return jsonify({"error": "unknown app", "apps": unknown}), 404
+    jobs = extractor.extract(apps)
+    return jsonify([job.as_dict() for job in jobs])
+
+
+@app.route("/api/extract")
+def extraction_progress():
+    """get the progress of all extractions"""
+    return jsonify([job.as_dict() for job in extractor.JOBS.values()])
+
+
+@app.route("/api/extract/<job_id>")
+def extraction_job(job_id):
+    """get the progress of one extraction"""
+    job = extractor.JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown extraction"}), 404
+    return jsonify(job.as_dict())
+
+@app.route("/api/timelapse", methods=["POST"])
+def start_timelapse():
+    """render the timeline of an app into a timelapse
+    body: {"app": "app name", "speed": 10}"""
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not isinstance(body.get("app"), str):
+        return jsonify({"error": "app has to be the name of an app"}), 400
+    speed = body.get("speed", 10)
+    if isinstance(speed, str) and speed.strip().isdigit():
+        speed = int(speed)
+    if type(speed) is not int or speed < 1:
+        return jsonify({"error": "speed has to be a whole number of at least 1"}), 400
+    if body["app"] not in timelines.list_apps():
+        return jsonify({"error": "unknown app"}), 404
+    job = timelapse.render(body["app"], speed)
+    return jsonify(job.as_dict())
+
+
+@app.route("/api/timelapse")
+def timelapse_progress():
+    """get the progress of all timelapses"""
+    return jsonify([job.as_dict() for job in timelapse.JOBS.values()])
+
 # TODO settings route
 #TODO delete recordings route
 
-# TODO recordings route
+@app.route("/api/media/recordings")
 @app.route("/api/recordings")
 def request_recordings():
-    """get the list of recordings"""
-    recdir = settings.HOME_DIR / "Records"
-    # read the recordings from the directory
-    recordings = [str(p) for p in recdir.iterdir()]
-    
-    for record in recordings:
-        # get the metadata tsv file for each recording-
-        #remove the .mkv from the record
-        record = record.replace(".mkv", "")
-        metadata_path = recdir / ".metadata" / f"{record}.tsv"
-        
-        # read the metadata file
-        with open(metadata_path, "r") as f:
-            reader = csv.reader(f, delimiter="\t")
-            metadata = [row for row in reader]
-        # add the metadata to the recording
-        recording["metadata"] = metadata
-        
-
-app.run()
+    """get a page of recordings, newest first
+    query parameters: offset, limit, app, since and until (unix time), q (part of the name)
+    answers 304 if the If-None-Match header has the ETag of the current catalog"""
+    etag = recordings.etag()
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(
+            recordings.page(
+                offset=max(request.args.get("offset", 0, type=int), 0),
+                limit=min(max(request.args.get("limit", 50, type=int), 1), 500),
+                app=request.args.get("app"),
+                since=request.args.get("since", type=float),
+                until=request.args.get("until", type=float),
+                text=request.args.get("q"),
+            )
+        )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"  # always revalidate, a 304 costs next to nothing
+    return response
+
+
+@app.route("/api/media/<folder>/<path:name>")
+def request_media(folder, name):
+    """stream a recording, extract or timelapse
+    supports byte ranges so the browser can seek without downloading the whole file"""
+    if folder not in MEDIA_FOLDERS:
+        return jsonify({"error": "unknown media folder"}), 404
+    # conditional: answers Range, If-Range and If-None-Match requests with 206 or 304
+    directory = settings.HOME_DIR / MEDIA_FOLDERS[folder]
+    response = send_from_directory(
+        directory,
+        name,
+        mimetype=mimetypes.guess_type(name)[0],
+        conditional=True,
+        max_age=0,
+    )
+    # a whole file is handed to the server's wsgi.file_wrapper as is, a range is wrapped in werkzeug's
+    # iterator which the worker thread would have to run until a slow client got every byte. Under
+    # waitress the wrapper gets the file opened at the start of the range instead, it stops after
+    # Content-Length bytes. Either way the worker returns at once and waitress's I/O thread sends
+    # the file in blocks (no sendfile, the bytes still pass through python)
+    if response.status_code == 206 and "wsgi.file_wrapper" in request.environ:
+        file = open(safe_join(str(directory), name), "rb")
+        file.seek(response.content_range.start)
+        response.response.close()
+        response.response = wrap_file(request.environ, file)
+    return response
+
+
+@app.route("/api/media/thumbnails/<path:name>")
+def request_thumbnail(name):
+    """get the animated webp preview of a recording"""
+    return send_from_directory(settings.HOME_DIR / ".thumbnails", name)
+
+
+def run(dev: bool = False, host: str = HOST, port: int = PORT, threads: int = SERVER_THREADS):
+    """serve the api, blocks
+    waitress by default, a pool of worker threads so a slow request does not hold up the others,
+    dev=True runs flask's development server instead"""
+    if dev:
+        app.run(host=host, port=port, threaded=True)
+        return
+    import waitress
+
+    waitress.serve(app, host=host, port=port, threads=threads, ident="SempRecord")
+
+
+def serve_in_background(**kwargs):
+    """serve the api on a daemon thread, takes the arguments of run"""
+    thread = threading.Thread(target=run, kwargs=kwargs, name="API Thread", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the SempRecord API.")
+    parser.add_argument("--dev", action="store_true", help="use flask's development server")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS)
+    args = parser.parse_args()
+    run(dev=args.dev, port=args.port, threads=args.threads)
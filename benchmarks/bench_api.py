@@ -0,0 +1,163 @@
+"""Latency of the API under concurrent status, catalog and media requests.
+
+Serves the API from a temporary home folder, with the development server and
+with waitress, and lets a number of clients fire a mix of requests over
+keep-alive connections for a few seconds:
+    status     GET /api/status
+    catalog    GET /api/media/recordings, every other one revalidating its ETag
+    media      GET of a random 1MB range of a recording
+Meanwhile one client keeps downloading a whole recording and a few event
+streams stay open, like browser tabs would.
+
+    python benchmarks/bench_api.py --clients 16 --seconds 5
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import api  # noqa: E402
+import settings  # noqa: E402
+from bench_recordings import fill  # noqa: E402
+
+MEDIA_FILE = "recording_00000_001.mkv"
+RANGE_BYTES = 1 << 20
+
+
+def serve(server_name: str):
+    """Start the server on a free port, returns (port, stop function)."""
+    if server_name == "waitress":
+        import waitress
+
+        server = waitress.create_server(api.app, host="127.0.0.1", port=0, threads=api.SERVER_THREADS)
+        port = server.effective_port
+        threading.Thread(target=server.run, daemon=True).start()
+        return port, server.close
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no line per request
+
+    server = make_server("127.0.0.1", 0, api.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def client(port: int, media_size: int, until: float, results: dict, seed: int):
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    etag = None
+    kinds = ("status", "catalog", "media")
+    i = seed
+    while perf_counter() < until:
+        kind = kinds[i % len(kinds)]
+        i += 1
+        headers = {}
+        if kind == "status":
+            path = "/api/status"
+        elif kind == "catalog":
+            path = f"/api/media/recordings?offset={rng.randrange(0, 500, 50)}&limit=50"
+            if etag and i % 2:
+                headers["If-None-Match"] = etag
+        else:
+            start = rng.randrange(0, media_size - RANGE_BYTES)
+            path = f"/api/media/records/{MEDIA_FILE}"
+            headers["Range"] = f"bytes={start}-{start + RANGE_BYTES - 1}"
+        begin = perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        results[kind].append(perf_counter() - begin)
+        if kind == "catalog":
+            etag = response.getheader("ETag")
+    connection.close()
+
+
+def downloader(port: int, until: float):
+    """Keeps a slow request in flight: downloads the whole recording again and again."""
+    while perf_counter() < until:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        connection.request("GET", f"/api/media/records/{MEDIA_FILE}")
+        response = connection.getresponse()
+        while response.read(1 << 16):
+            sleep(0.001)  # a client on a slow network
+        connection.close()
+
+
+def event_stream(port: int, stop: threading.Event):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    connection.request("GET", "/api/events")
+    response = connection.getresponse()
+    stop.wait()
+    response.close()
+    connection.close()
+
+
+def run_load(server_name: str, args, media_size: int):
+    port, shutdown = serve(server_name)
+    streams_stop = threading.Event()
+    streams = [threading.Thread(target=event_stream, args=(port, streams_stop), daemon=True) for _ in range(args.streams)]
+    for stream in streams:
+        stream.start()
+    sleep(0.2)
+
+    until = perf_counter() + args.seconds
+    results = {"status": [], "catalog": [], "media": []}
+    threads = [threading.Thread(target=downloader, args=(port, until), daemon=True)]
+    threads += [
+        threading.Thread(target=client, args=(port, media_size, until, results, seed), daemon=True)
+        for seed in range(args.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads[1:]:
+        thread.join()
+    streams_stop.set()
+    shutdown()
+
+    total = sum(len(latencies) for latencies in results.values())
+    print(f"{server_name:9} {total / args.seconds:8.1f} requests/s")
+    for kind, latencies in results.items():
+        if len(latencies) < 2:
+            print(f"  {kind:8} {len(latencies)} requests")
+            continue
+        percentiles = quantiles(latencies, n=100)
+        print(
+            f"  {kind:8} {len(latencies):6} requests   p50 {percentiles[49] * 1000:8.2f}ms"
+            f"   p99 {percentiles[98] * 1000:8.2f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--streams", type=int, default=4, help="event streams kept open")
+    parser.add_argument("--recordings", type=int, default=1000)
+    parser.add_argument("--media-mb", type=int, default=64)
+    parser.add_argument("--server", choices=("dev", "waitress", "both"), default="both")
+    args = parser.parse_args()
+
+    settings.HOME_DIR = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    for folder in ("Records", ".thumbnails", ".metadata"):
+        (settings.HOME_DIR / folder).mkdir()
+    fill(args.recordings, 1)
+    media_size = args.media_mb << 20
+    with open(settings.HOME_DIR / "Records" / MEDIA_FILE, "wb") as f:
+        f.write(os.urandom(media_size))
+
+    print(f"{args.clients} clients, {args.streams} event streams, 1 full download, {args.seconds}s per server")
+    for server_name in ("dev", "waitress") if args.server == "both" else (args.server,):
+        run_load(server_name, args, media_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark of the compiled whitelist/blacklist matchers against the original linear scans.
+
+Run from the repository root:
+    python benchmarks/bench_bouncer.py
+"""
+
+import random
+import sys
+from pathlib import Path
+from timeit import repeat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import bouncer  # noqa: E402
+
+RULE_COUNTS = (10, 100, 1000)
+TITLE_COUNT = 2000
+REPEAT = 5
+
+APPS = ("Visual Studio Code", "Mozilla Firefox", "Blender", "Adobe Photoshop", "Slack", "Figma")
+DOCUMENTS = ("main.py", "README.md", "untitled.blend", "Inbox", "design.fig", "report.docx")
+
+
+def linear_whitelisted(app_name, whitelist):
+    """The original isWhiteListed."""
+    if not app_name or not whitelist:
+        return False
+    for wl in whitelist:
+        if app_name.endswith(wl) or app_name.startswith(wl):
+            return wl
+    return False
+
+
+def linear_blacklisted(app_name, blacklist):
+    """The original isBlackListed."""
+    if not app_name:
+        return True
+    for bl in blacklist:
+        if bl in app_name:
+            return True
+    return False
+
+
+def random_word(rng, length):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length)).capitalize()
+
+
+def make_rules(rng, count):
+    """Realistic app names plus random rules up to count."""
+    whitelist = list(APPS[: count // 2]) + [random_word(rng, rng.randint(4, 14)) for _ in range(count - count // 2)]
+    blacklist = ["Private Browsing", "Bank"] + [random_word(rng, rng.randint(4, 14)) for _ in range(count - 2)]
+    rng.shuffle(whitelist)
+    rng.shuffle(blacklist)
+    return whitelist, blacklist
+
+
+def make_titles(rng, count):
+    titles = []
+    for _ in range(count):
+        app, doc = rng.choice(APPS), rng.choice(DOCUMENTS)
+        title = f"{doc} - {random_word(rng, 6)} - {app}"
+        if rng.random() < 0.05:
+            title += " - Private Browsing"
+        titles.append(title)
+    return titles
+
+
+def best_us(fn, titles):
+    seconds = min(repeat(lambda: [fn(t) for t in titles], repeat=REPEAT, number=1))
+    return seconds / len(titles) * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    titles = make_titles(rng, TITLE_COUNT)
+    print(f"{'rules':>6} {'list':<10} {'linear':>10} {'compiled':>10} {'speedup':>8}")
+    for count in RULE_COUNTS:
+        whitelist, blacklist = make_rules(rng, count)
+        bouncer.set_lists(whitelist, blacklist)
+        for t in titles:
+            assert bouncer.isWhiteListed(t) == linear_whitelisted(t, whitelist), t
+            assert bouncer.isBlackListed(t) == linear_blacklisted(t, blacklist), t
+
+        old = best_us(lambda t: linear_whitelisted(t, whitelist), titles)
+        new = best_us(bouncer.isWhiteListed, titles)
+        print(f"{count:>6} {'whitelist':<10} {old:>8.2f}us {new:>8.2f}us {old / new:>7.1f}x")
+        old = best_us(lambda t: linear_blacklisted(t, blacklist), titles)
+        new = best_us(bouncer.isBlackListed, titles)
+        print(f"{count:>6} {'blacklist':<10} {old:>8.2f}us {new:>8.2f}us {old / new:>7.1f}x")
@@ -0,0 +1,74 @@
+"""Search latency of the focus span catalog over a year of footage.
+
+Fills a catalog in a temporary folder with a year of workdays (8 hours a day,
+a focus change every 20 seconds by default) and times a few typical searches.
+
+    python benchmarks/bench_catalog.py --days 250
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import catalog  # noqa: E402
+import settings  # noqa: E402
+
+APPS = {
+    "Visual Studio Code": ["main.py", "recorder.py", "README.md", "catalog.py", "settings.yaml"],
+    "Mozilla Firefox": ["GitHub", "Stack Overflow", "YouTube", "Python docs", "Gmail"],
+    "Blender": ["robot_arm.blend", "house.blend", "untitled.blend"],
+    "Adobe Photoshop": ["poster.psd", "logo.psd", "banner.psd"],
+}
+QUERIES = ("recorder", "robot", "stack overflow", "poster psd", "pyth", "nothing_matches_this")
+
+
+def fill(days: int, span_seconds: int):
+    rng = random.Random(0)
+    start = 1_700_000_000.0
+    spans = []
+    for day in range(days):
+        recording = f"day_{day:03}"
+        frame = 0
+        t = start + day * 86400
+        for _ in range(8 * 3600 // span_seconds):
+            app = rng.choice(list(APPS))
+            title = f"{rng.choice(APPS[app])} {rng.randint(1, 99)} - {app}"
+            frames = span_seconds * settings.FRAME_RATE
+            spans.append((recording, f"{recording}_001.mkv", app, title, frame, frame + frames, t, t + span_seconds))
+            frame += frames
+            t += span_seconds
+    db = catalog.connect()
+    with db:
+        db.executemany(
+            f"INSERT INTO spans ({', '.join(catalog.COLUMNS)}) VALUES ({', '.join('?' * len(catalog.COLUMNS))})",
+            spans,
+        )
+    db.close()
+    return len(spans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=250)
+    parser.add_argument("--span-seconds", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.HOME_DIR = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    t = perf_counter()
+    count = fill(args.days, args.span_seconds)
+    print(f"inserted {count} spans in {perf_counter() - t:.1f}s ({catalog.catalog_path().stat().st_size / 1e6:.0f}MB)")
+
+    for query in QUERIES:
+        catalog.search(query)  # warm up the page cache
+        t = perf_counter()
+        results = catalog.search(query, limit=50)
+        ms = (perf_counter() - t) * 1000
+        print(f"{query!r:24} {len(results):3} results  {ms:7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
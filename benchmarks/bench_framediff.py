@@ -0,0 +1,47 @@
+"""Microbenchmark of the tiled frame diff against the original frameDiff.
+
+Run from the repository root:
+    python benchmarks/bench_framediff.py
+"""
+
+import sys
+from pathlib import Path
+from timeit import repeat
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from framediff import frameDiff, tiled_diff  # noqa: E402
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440), "4K": (3840, 2160)}
+THRESHOLD = 800  # sampled pixels, about settings.CHANGE_FRACTION of a 1080p frame
+REPEAT = 5
+NUMBER = 20
+
+
+def scenarios(width, height):
+    """Yields (name, A, B) pairs of frames with increasing amounts of change."""
+    rng = np.random.default_rng(0)
+    A = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    yield "static", A, A.copy()
+
+    caret = A.copy()  # a blinking caret, far below the threshold
+    caret[500:520, 700:702] ^= 0xFF
+    yield "caret", A, caret
+
+    scroll = np.roll(A, 40, axis=0)  # a scrolled window, far above the threshold
+    yield "scroll", A, scroll
+
+
+def best_ms(fn):
+    return min(repeat(fn, repeat=REPEAT, number=NUMBER)) / NUMBER * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'resolution':<10} {'scenario':<8} {'frameDiff':>10} {'tiled':>10} {'speedup':>8}")
+    for name, (w, h) in RESOLUTIONS.items():
+        for scenario, A, B in scenarios(w, h):
+            old = best_ms(lambda: frameDiff(A, B))
+            new = best_ms(lambda: tiled_diff(A, B, THRESHOLD))
+            print(f"{name:<10} {scenario:<8} {old:>8.2f}ms {new:>8.2f}ms {old / new:>7.1f}x")
@@ -0,0 +1,80 @@
+"""Overhead of the capture loop metrics.
+
+Times a lap and a skip on their own, then records a synthetic source with
+settings.METRICS on and reports the share of the loop time spent on the
+metrics themselves (laps per iteration times the cost of a lap), which
+should stay well below 1%. The stage timings of that recording are printed
+as /api/metrics would serve them.
+
+    python benchmarks/bench_metrics.py --resolution 1920x1080 --frames 300
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import bouncer  # noqa: E402
+import framesource  # noqa: E402
+import metrics  # noqa: E402
+import recorder  # noqa: E402
+import settings  # noqa: E402
+from bench_pipeline import scaled_script  # noqa: E402
+
+MAX_OVERHEAD = 0.01
+
+
+def lap_cost(number: int = 200_000) -> tuple:
+    """Seconds per lap and per skip on a loop that is not registered."""
+    stats = metrics.LoopMetrics()
+    since = perf_counter()
+    lap = min(timeit.repeat(lambda: stats.lap("grab", since), number=number, repeat=5)) / number
+    skip = min(timeit.repeat(lambda: stats.skip("unchanged"), number=number, repeat=5)) / number
+    return lap, skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    resolution = tuple(int(x) for x in args.resolution.split("x"))
+
+    lap, skip = lap_cost()
+    print(f"lap            {lap * 1e9:.0f}ns")
+    print(f"skip           {skip * 1e9:.0f}ns")
+
+    settings.HOME_DIR = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    for folder in ("Records", ".thumbnails"):
+        (settings.HOME_DIR / folder).mkdir()
+    settings.METRICS = True
+    script = scaled_script(args.frames)
+    bouncer.set_lists([title for _, _, title in script], [])
+    source = framesource.SyntheticSource(resolution, script, loop=False)
+
+    wall = perf_counter()
+    rec = recorder.Recorder(sources=[source])
+    rec.join()
+    wall = perf_counter() - wall
+
+    stats = metrics.snapshot()[1]
+    laps = sum(histogram.count for histogram in stats.stages.values())
+    skips = sum(stats.skipped.values())
+    # the time in the loop, the wait for the next frame included
+    loop_seconds = sum(histogram.sum for histogram in stats.stages.values())
+    overhead = (laps * lap + skips * skip) / loop_seconds
+    print(f"recording      {resolution[0]}x{resolution[1]}, {stats.frames_seen} frames seen, "
+          f"{stats.frames_written} written in {wall:.2f}s")
+    print(f"laps           {laps} ({laps / max(stats.frames_seen, 1):.1f} per frame seen), {skips} skips")
+    print(f"overhead       {overhead:.4%} of {loop_seconds:.2f}s in the loop "
+          f"({'ok' if overhead < MAX_OVERHEAD else 'over'} the {MAX_OVERHEAD:.0%} budget)")
+    for stage, summary in metrics.as_dict()["screens"]["1"]["stages"].items():
+        print(f"  {stage:13} {summary['count']:6} laps   mean {summary['mean_ms'] or 0:9.4f}ms   "
+              f"p99 <= {summary['p99_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
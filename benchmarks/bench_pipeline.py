@@ -0,0 +1,80 @@
+"""End-to-end throughput of the capture, diff and encode pipeline.
+
+Runs a Recorder on a synthetic or replayed frame source as fast as the
+pipeline allows and reports frames/s into ffmpeg and CPU time per frame.
+Works headless on Linux, ffmpeg has to be on the PATH.
+
+    python benchmarks/bench_pipeline.py --resolution 1920x1080 --frames 900
+    python benchmarks/bench_pipeline.py --replay some_recording.mkv --resolution 1920x1080
+"""
+
+import argparse
+import resource
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter, process_time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import bouncer  # noqa: E402
+import framesource  # noqa: E402
+import recorder  # noqa: E402
+import settings  # noqa: E402
+
+
+def scaled_script(frames: int):
+    """The default activity script stretched to roughly `frames` frames."""
+    total = sum(step[1] for step in framesource.DEFAULT_SCRIPT)
+    return [(a, max(1, n * frames // total), t) for a, n, t in framesource.DEFAULT_SCRIPT]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--screens", type=int, default=1, help="number of synthetic screens")
+    parser.add_argument("--replay", help="video file or image folder to replay instead of synthetic frames")
+    args = parser.parse_args()
+    resolution = tuple(int(x) for x in args.resolution.split("x"))
+
+    home = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    (home / "Records").mkdir()
+    settings.HOME_DIR = home
+
+    if args.replay:
+        sources = [framesource.ReplaySource(args.replay, title="Replay", resolution=resolution)]
+        bouncer.set_lists(["Replay"], [])
+    else:
+        script = scaled_script(args.frames)
+        # every screen starts at a different step of the script
+        sources = [
+            framesource.SyntheticSource(resolution, script[i:] + script[:i], loop=False, seed=i)
+            for i in range(args.screens)
+        ]
+        bouncer.set_lists([title for _, _, title in script], [])
+
+    wall, cpu = perf_counter(), process_time()
+    rec = recorder.Recorder(sources=sources)
+    rec.join()
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+    ffmpeg_cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    ffmpeg_cpu = ffmpeg_cpu.ru_utime + ffmpeg_cpu.ru_stime
+
+    seen = sum(getattr(source, "frame_index", 0) for source in sources) or rec.total_frames_recorded
+    written = max(rec.total_frames_recorded, 1)
+    print(f"resolution     {len(sources)}x {resolution[0]}x{resolution[1]} ({recorder.codec_options(*resolution)['vcodec']})")
+    print(f"frames seen    {seen}")
+    print(f"frames written {rec.total_frames_recorded}")
+    print(f"wall time      {wall:.2f}s")
+    print(f"throughput     {rec.total_frames_recorded / wall:.1f} frames/s into ffmpeg")
+    print(f"python cpu     {cpu / written * 1000:.2f}ms per written frame")
+    print(f"ffmpeg cpu     {ffmpeg_cpu / written * 1000:.2f}ms per written frame")
+    print(f"loop seconds   {rec.get_loop_stats()}")
+    for output in rec.outputs:
+        print(f"writer ring    {output.segment.writer.stats()}")
+    for segment in rec.segments:
+        print(f"output         {segment.path} ({segment.path.stat().st_size / 1e6:.1f}MB)")
+
+
+if __name__ == "__main__":
+    main()
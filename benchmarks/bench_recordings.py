@@ -0,0 +1,94 @@
+"""Latency of the recordings catalog behind /api/media/recordings.
+
+Fills a Records folder in a temporary folder with empty segment files and
+their focus spans, then times building the catalog, a refresh with nothing
+changed, a refresh after one recording grew, serving a page and answering a
+conditional GET with a matching ETag.
+
+    python benchmarks/bench_recordings.py --recordings 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import catalog  # noqa: E402
+import recordings  # noqa: E402
+import settings  # noqa: E402
+
+APPS = ("Visual Studio Code", "Mozilla Firefox", "Blender", "Adobe Photoshop")
+
+
+def fill(count: int, segments: int):
+    rng = random.Random(0)
+    records = settings.HOME_DIR / "Records"
+    spans = []
+    t = 1_700_000_000.0
+    for i in range(count):
+        name = f"recording_{i:05}"
+        for index in range(1, segments + 1):
+            clip = f"{name}_{index:03}.mkv"
+            (records / clip).write_bytes(b"\0" * rng.randint(1, 64))
+            frame = 0
+            for _ in range(10):
+                frames = rng.randint(30, 3000)
+                spans.append((name, clip, rng.choice(APPS), "title", frame, frame + frames, t, t + frames / 30))
+                frame += frames
+                t += frames / 30
+    db = catalog.connect()
+    with db:
+        db.executemany(
+            f"INSERT INTO spans ({', '.join(catalog.COLUMNS)}) VALUES ({', '.join('?' * len(catalog.COLUMNS))})",
+            spans,
+        )
+    db.close()
+
+
+def timed(label: str, function, repeat: int = 1):
+    start = perf_counter()
+    for _ in range(repeat):
+        result = function()
+    print(f"{label:28} {(perf_counter() - start) / repeat * 1000:9.2f}ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", type=int, default=5000)
+    parser.add_argument("--segments", type=int, default=2, help="segment files per recording")
+    args = parser.parse_args()
+
+    settings.HOME_DIR = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    for folder in ("Records", ".thumbnails", ".metadata"):
+        (settings.HOME_DIR / folder).mkdir()
+    fill(args.recordings, args.segments)
+    print(f"{args.recordings} recordings, {args.recordings * args.segments} files")
+
+    timed("build", lambda: recordings.refresh(force=True))
+    timed("refresh, nothing changed", lambda: recordings.refresh(force=True), repeat=10)
+    grown = settings.HOME_DIR / "Records" / "recording_00000_001.mkv"
+
+    def grow():
+        with open(grown, "ab") as f:
+            f.write(b"\0")
+        recordings.refresh(force=True)
+
+    timed("refresh, one file grew", grow, repeat=10)
+    timed("page of 50", lambda: recordings.page(offset=100, limit=50), repeat=100)
+    timed("page of 50, filtered", lambda: recordings.page(app="Blender", text="0042"), repeat=100)
+    etag = recordings.etag()
+    timed("conditional GET, unchanged", lambda: recordings.etag() == etag, repeat=100)
+
+    # a restart reads the cached files instead of probing
+    recordings._LOADED, recordings._RECORDINGS, recordings._ETAG = False, {}, None
+    timed("build after restart", lambda: recordings.refresh(force=True))
+    print(f"cache file {os.path.getsize(recordings.cache_path()) / 1e3:.0f}kB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency from starting a recording to the first frame handed to ffmpeg.
+
+Compares naming the recording by unpickling the corpus on every start (the
+old generate_filename, kept here as reference) with the memory-mapped word
+table. Recordings run on a synthetic source so it works headless on Linux.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from random import choice
+from statistics import median
+from time import perf_counter, sleep
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import bouncer  # noqa: E402
+import filename_generator  # noqa: E402
+import framesource  # noqa: E402
+import recorder  # noqa: E402
+import settings  # noqa: E402
+
+
+def pickled_filename():
+    """generate_filename as it was: unpickle and filter the corpus on every call."""
+    with open(filename_generator.CORPUS_PATH, "rb") as f:
+        corpus = pickle.load(f)
+    max_length = filename_generator.MAX_WORD_LENGTH
+    verbs = [v for v in corpus["verbs"] if len(v) <= max_length]
+    nouns = [n for n in corpus["nouns"] if len(n) <= max_length]
+    adjs = [a for a in corpus["adjectives"] if len(a) <= max_length]
+    if choice([True, False]):
+        return choice(adjs) + "_" + choice(nouns)
+    return choice(verbs) + "ing_" + choice(nouns)
+
+
+def first_frame_latency(namer) -> tuple:
+    """Seconds spent naming the recording and until the first frame was written."""
+    recorder.generate_filename = namer
+    title = framesource.DEFAULT_SCRIPT[0][2]
+    source = framesource.SyntheticSource((640, 360), script=[("typing", 100000, title)])
+    start = perf_counter()
+    namer()
+    named = perf_counter() - start
+
+    start = perf_counter()
+    rec = recorder.Recorder(source=source)
+    while rec.total_frames_recorded < 1:
+        sleep(0.0005)
+    latency = perf_counter() - start
+    rec.end_recording()
+    rec.join()
+    return named, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    home = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    (home / "Records").mkdir()
+    settings.HOME_DIR = home
+    settings.SEGMENT_MAX_MINUTES = settings.SEGMENT_MAX_MB = 0  # no standby encoder
+    bouncer.set_lists([framesource.DEFAULT_SCRIPT[0][2]], [])
+
+    for label, namer in (("pickled corpus", pickled_filename), ("word table", filename_generator.generate_filename)):
+        results = [first_frame_latency(namer) for _ in range(args.runs)]
+        naming = median(r[0] for r in results) * 1000
+        latency = median(r[1] for r in results) * 1000
+        print(f"{label:15} naming {naming:8.2f}ms   start to first frame {latency:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Benchmark suite of the recording pipeline components, compared with a baseline.
+
+Times the pieces of the capture loop and the timeline on synthetic data, so a
+run needs no screen, no ffmpeg and works headless on Linux:
+    framediff   frameDiff, tiled_diff and ChangeDetector.changed on 1080p, 1440p
+                and 4K frames that are static, have a blinking caret or scrolled
+    bouncer     admit on a stream of window titles that dwell like a user does,
+                isWhiteListed and isBlackListed on unique titles, for 10 to 1000 rules
+    timelines   EdlDataWriter.add_entry over a long timeline that spans several
+                files, resuming a full EDL file and frame_to_timecode
+    filenames   generate_filename next to a Records folder of existing recordings
+
+Every case reports the best time per operation over a few repeats. --save
+stores the results as the baseline, later runs print the change against it
+in percent. A baseline only means something on the machine that made it.
+
+    python benchmarks/suite.py --save
+    python benchmarks/suite.py
+    python benchmarks/suite.py --filter framediff/4K --fail 10
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import time
+from timeit import Timer
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import bouncer  # noqa: E402
+import filename_generator  # noqa: E402
+import settings  # noqa: E402
+import timelines  # noqa: E402
+from bench_bouncer import RULE_COUNTS, make_rules, make_titles  # noqa: E402
+from bench_framediff import RESOLUTIONS, scenarios  # noqa: E402
+from changedetect import ChangeDetector  # noqa: E402
+from framediff import frameDiff, tiled_diff  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().with_name("baseline.json")
+REPEAT = 5
+MIN_SECONDS = 0.2  # each repeat runs the case at least this long
+NOISE_PERCENT = 5  # smaller changes are reported as noise
+
+TITLE_POOL = 200  # distinct window titles in the title stream
+TITLE_FRAMES = 20_000  # frames in the title stream, about 11 minutes at 30fps
+EDL_ENTRIES = 3000  # takes added to the long timeline, it rolls over to a new file every 999
+EXISTING_RECORDINGS = 2000  # recordings in the Records folder while generating names
+
+
+def framediff_cases():
+    for resolution, (width, height) in RESOLUTIONS.items():
+        detector = ChangeDetector((width, height))
+        for scenario, A, B in scenarios(width, height):
+            prefix = f"framediff/{resolution}/{scenario}"
+            yield f"{prefix}/frameDiff", lambda A=A, B=B: frameDiff(A, B), 1
+            yield f"{prefix}/tiled_diff", lambda A=A, B=B: tiled_diff(A, B, detector.threshold), 1
+            yield f"{prefix}/changed", lambda A=A, B=B: detector.changed(A, B), 1
+
+
+def title_stream(rng: random.Random, frames: int) -> list:
+    """The focused window title of every frame, the user stays in a window for a while then switches."""
+    pool = make_titles(rng, TITLE_POOL)
+    stream = []
+    while len(stream) < frames:
+        stream += [rng.choice(pool)] * rng.randint(1, 300)
+    return stream[:frames]
+
+
+def bouncer_cases():
+    rng = random.Random(0)
+    stream = title_stream(rng, TITLE_FRAMES)
+    unique = make_titles(rng, TITLE_POOL * 10)
+    for count in RULE_COUNTS:
+        whitelist, blacklist = make_rules(rng, count)
+
+        def admit_stream(whitelist=whitelist, blacklist=blacklist):
+            bouncer.set_lists(whitelist, blacklist)  # starts with no verdicts cached
+            for title in stream:
+                bouncer.admit(title)
+
+        def whitelisted(whitelist=whitelist, blacklist=blacklist):
+            bouncer.set_lists(whitelist, blacklist)
+            for title in unique:
+                bouncer.isWhiteListed(title)
+
+        def blacklisted(whitelist=whitelist, blacklist=blacklist):
+            bouncer.set_lists(whitelist, blacklist)
+            for title in unique:
+                bouncer.isBlackListed(title)
+
+        yield f"bouncer/{count} rules/admit stream", admit_stream, len(stream)
+        yield f"bouncer/{count} rules/isWhiteListed", whitelisted, len(unique)
+        yield f"bouncer/{count} rules/isBlackListed", blacklisted, len(unique)
+
+
+def timeline_cases():
+    rng = random.Random(0)
+    clips = [f"{filename_generator.generate_filename()}_001.mkv" for _ in range(20)]
+    # (start, end) of the takes, a few seconds to several minutes long
+    takes = []
+    for _ in range(EDL_ENTRIES):
+        start = rng.randrange(0, 30 * 3600)
+        takes.append((start, start + rng.randint(30, 30 * 600), rng.choice(clips)))
+    apps = iter(range(1_000_000))
+
+    def long_timeline():
+        writer = timelines.EdlDataWriter(f"Bench App {next(apps)}")
+        for start, end, clip in takes:
+            writer.add_entry(start, end, clip)
+        writer.close()
+
+    full = timelines.EdlDataWriter("Bench Full")
+    for start, end, clip in takes[: timelines.EDL_MAX_ENTRIES]:
+        full.add_entry(start, end, clip)
+    full.close()
+
+    def resume():
+        timelines.EdlDataWriter("Bench Full", 1).close()
+
+    frames = [rng.randrange(0, 30 * 3600 * 24) for _ in range(10_000)]
+
+    def timecodes():
+        for frame in frames:
+            timelines.frame_to_timecode(frame)
+            timelines.frame_to_timecode(frame, True)
+
+    yield "timelines/add_entry", long_timeline, len(takes)
+    yield "timelines/resume full file", resume, 1
+    yield "timelines/frame_to_timecode", timecodes, 2 * len(frames)
+
+
+def filename_cases():
+    random.seed(0)
+    records = settings.HOME_DIR / "Records"
+    for _ in range(EXISTING_RECORDINGS):
+        (records / f"{filename_generator.generate_filename()}_001.mkv").touch()
+
+    def names(count=1000):
+        for _ in range(count):
+            filename_generator.generate_filename()
+
+    yield "filenames/generate_filename", names, 1000
+
+
+GROUPS = {
+    "framediff": framediff_cases,
+    "bouncer": bouncer_cases,
+    "timelines": timeline_cases,
+    "filenames": filename_cases,
+}
+
+
+def best_seconds(fn, ops: int, repeat: int) -> float:
+    """Best time of one operation over the repeats, each repeat runs for at least MIN_SECONDS."""
+    timer = Timer(fn)
+    number = 1
+    while timer.timeit(number) < MIN_SECONDS and number < 1 << 20:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number / ops
+
+
+def machine() -> dict:
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def human(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f}{unit}"
+    return f"{seconds / 1e-9:8.0f}ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="only the cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--fail", type=float, metavar="PERCENT", help="exit with 1 if a case got slower by more")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine():
+            print(f"The baseline was made on another machine or setup: {baseline.get('machine')}")
+    elif not args.save:
+        print(f"No baseline at {args.baseline}, run with --save to store one")
+    previous = baseline.get("results", {})
+
+    settings.HOME_DIR = Path(tempfile.mkdtemp(prefix="semprecord_bench_"))
+    (settings.HOME_DIR / "Records").mkdir()
+    results, regressions = {}, []
+    print(f"{'case':<44} {'per op':>10} {'baseline':>10} {'change':>8}")
+    # add_entry prints every entry, the setup and the cases run with the output discarded
+    report = sys.stdout
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for group, cases in GROUPS.items():
+            head = args.filter.split("/")[0]
+            if head in GROUPS and head != group:
+                continue  # not worth making the frames and files of a group that is filtered out
+            for name, fn, ops in cases():
+                if args.filter not in name:
+                    continue
+                seconds = best_seconds(fn, ops, args.repeat)
+                results[name] = seconds
+                line = f"{name:<44} {human(seconds):>10}"
+                if name in previous:
+                    change = (seconds / previous[name] - 1) * 100
+                    mark = "" if abs(change) < NOISE_PERCENT else (" slower" if change > 0 else " faster")
+                    line += f" {human(previous[name]):>10} {change:+7.1f}%{mark}"
+                    if args.fail is not None and change > args.fail:
+                        regressions.append(name)
+                print(line, file=report, flush=True)
+
+    if args.save:
+        if args.filter:
+            # keep the cases that did not run this time
+            results = {**previous, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "time": time(), "results": results}, f, indent=1)
+        print(f"Saved the baseline to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} cases got more than {args.fail}% slower: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,88 @@ If no app is focused, no app is recorded.
 """
 
 
+import re
 import tkinter as tk
 from tkinter import messagebox
 import threading
+from functools import lru_cache
 from time import sleep
-from settings import HOME_DIR
+import settings
 
 WHITELIST = tuple()
 BLACKLIST = tuple()
+_LOADED = False  # the lists are read from .settings on first use, see _ensure_loaded
+_LOAD_LOCK = threading.Lock()
+
+# The lists are compiled into matchers by set_lists, so a lookup does not get
+# slower with every rule that is added:
+# - the whitelist goes into two tries, one of the rules and one of the reversed
+#   rules, walking the title (or the reversed title) finds every rule that is
+#   a prefix (or suffix) of it in one pass.
+# - the blacklist goes into a single regex built from a trie of the rules,
+#   shared prefixes are factored out so the regex engine never backtracks
+#   through hundreds of alternatives.
+_END = ""  # key of the rule index in a trie node, never a single character
+_PREFIXES = {}
+_SUFFIXES = {}
+_BLACKLIST_MATCHER = None
+
+
+def _build_trie(rules) -> dict:
+    root = {}
+    for i, rule in enumerate(rules):
+        node = root
+        for ch in rule:
+            node = node.setdefault(ch, {})
+        node.setdefault(_END, i)  # duplicates keep the index of the first rule
+    return root
+
+
+def _first_rule(trie: dict, text: str):
+    """Returns the lowest index of the rules in the trie that are a prefix of text, or None."""
+    best = trie.get(_END)
+    node = trie
+    for ch in text:
+        node = node.get(ch)
+        if node is None:
+            break
+        i = node.get(_END)
+        if i is not None and (best is None or i < best):
+            best = i
+    return best
+
+
+def _trie_regex(node: dict) -> str:
+    """Returns a regex that matches any rule stored below node."""
+    alternatives = [
+        re.escape(ch) + _trie_regex(child) for ch, child in node.items() if ch != _END
+    ]
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and _END not in node:
+        return alternatives[0]
+    group = "(?:" + "|".join(alternatives) + ")"
+    # a rule ends here, the longer rules below are optional
+    return group + "?" if _END in node else group
 
 
 def isWhiteListed(app_name: str) -> str|bool:
-    """Returns the whitlisted app name if it is whitelisted, otherwise False."""
+    """Returns the whitlisted app name if it is whitelisted, otherwise False.
+    If several rules match, the first one in the whitelist wins."""
 
     if not app_name:
         return False
 
+    if not _LOADED:
+        _ensure_loaded()
     if not WHITELIST:
         return False
 
-    for wl in WHITELIST:
-        if app_name.endswith(wl) or app_name.startswith(wl):
-            return wl
+    prefix = _first_rule(_PREFIXES, app_name)
+    suffix = _first_rule(_SUFFIXES, app_name[::-1])
+    matches = [i for i in (prefix, suffix) if i is not None]
+    if matches:
+        return WHITELIST[min(matches)]
 
     return False
 
@@ -38,51 +98,79 @@ def isBlackListed(app_name: str) -> bool:
     if not app_name:# if no app is focused app_name ""
         return True
 
-    if not BLACKLIST:
+    if not _LOADED:
+        _ensure_loaded()
+    if _BLACKLIST_MATCHER is None:
         return False
 
-    for bl in BLACKLIST:
-        if bl in app_name:
-            return True
+    return _BLACKLIST_MATCHER.search(app_name) is not None
 
-    return False
+
+@lru_cache(maxsize=1024)
+def admit(app_name: str) -> str|bool:
+    """Returns the whitelisted app name if the app should be recorded, otherwise False.
+    Verdicts are memoized per title, the cache is cleared whenever the lists change."""
+    if isBlackListed(app_name):
+        return False
+    return isWhiteListed(app_name)
+
+
+def set_lists(whitelist, blacklist):
+    """Replace both lists, rebuild the matchers and forget all verdicts made with the old lists."""
+    global WHITELIST, BLACKLIST, _PREFIXES, _SUFFIXES, _BLACKLIST_MATCHER, _LOADED
+    _LOADED = True
+    WHITELIST = tuple(whitelist)
+    BLACKLIST = tuple(blacklist)
+    _PREFIXES = _build_trie(WHITELIST)
+    _SUFFIXES = _build_trie(wl[::-1] for wl in WHITELIST)
+    _BLACKLIST_MATCHER = re.compile(_trie_regex(_build_trie(BLACKLIST))) if BLACKLIST else None
+    admit.cache_clear()
 
 
 def update_lists():
-    global WHITELIST, BLACKLIST
     wl = whitelist_listbox.get(0, tk.END)
     bl = blacklist_listbox.get(0, tk.END)
     # cleanse the lists of trailing newline characters
-    WHITELIST = tuple([item.replace("\n", "") for item in wl])
-    BLACKLIST = tuple([item.replace("\n", "") for item in bl])
+    set_lists(
+        [item.replace("\n", "") for item in wl],
+        [item.replace("\n", "") for item in bl],
+    )
     print(WHITELIST, BLACKLIST)
 
 
 def save_lists():
-    with open(HOME_DIR / ".settings" / "whitelist.txt", "w") as f:
+    _ensure_loaded()
+    with open(settings.HOME_DIR / ".settings" / "whitelist.txt", "w") as f:
         for item in WHITELIST:
             f.write(item + "\n")
 
-    with open(HOME_DIR / ".settings" / "blacklist.txt", "w") as f:
+    with open(settings.HOME_DIR / ".settings" / "blacklist.txt", "w") as f:
         for item in BLACKLIST:
             f.write(item + "\n")
 
 
 def load_lists():
-    global WHITELIST, BLACKLIST
     try:
-        with open(HOME_DIR / ".settings" / "whitelist.txt", "r") as f:
-            WHITELIST = tuple(f.readlines())
-            WHITELIST = tuple([item.strip() for item in WHITELIST])
+        with open(settings.HOME_DIR / ".settings" / "whitelist.txt", "r") as f:
+            whitelist = [item.strip() for item in f.readlines()]
     except FileNotFoundError:
-        WHITELIST = tuple()
+        whitelist = []
 
     try:
-        with open(HOME_DIR / ".settings" / "blacklist.txt", "r") as f:
-            BLACKLIST = tuple(f.readlines())
-            BLACKLIST = tuple([item.strip() for item in BLACKLIST])
+        with open(settings.HOME_DIR / ".settings" / "blacklist.txt", "r") as f:
+            blacklist = [item.strip() for item in f.readlines()]
     except FileNotFoundError:
-        BLACKLIST = tuple()
+        blacklist = []
+
+    set_lists(whitelist, blacklist)
+
+
+def _ensure_loaded():
+    """Read the lists from .settings the first time they are needed, unless set_lists came first.
+    Importing the module stays free of file access, the home folder may still change at startup."""
+    with _LOAD_LOCK:
+        if not _LOADED:
+            load_lists()
 
 
 def add_to_list(listbox, entry):
@@ -123,6 +211,7 @@ def create_window():
     global whitelist_listbox, blacklist_listbox
     global whitelist_state, blacklist_state
     global root
+    _ensure_loaded()
     root = tk.Tk()
     root.title("Whitelist and Blacklist Manager")
 
@@ -203,8 +292,6 @@ def close_window():
     root.update()
 
 
-load_lists()
-
 if __name__ == "__main__":
     from pprint import pprint
 
@@ -14,7 +14,8 @@ if (!(Test-Path -Path ".\venv")) {
 # Set the variables
 $dot = "."
 $icon = "icon.ico"
-$corpus = "corpus.pkl"
+$words = "filename_words.bin"
+$icons = "icons"
 $readme = "README.md"
 $license = "LICENSE.txt"
 $frontDir = "frontend/public"
@@ -24,8 +25,13 @@ $ffmpeg = "ffmpeg.exe"
 & ".\venv\Scripts\activate"
 
 
-# Run icon_generator.py if icon.ico does not already exist
-if (!(Test-Path -Path ".\icon.ico")) {
+# Build the word table of the file name generator if it does not already exist
+if (!(Test-Path -Path ".\filename_words.bin")) {
+    & python ".\filename_generator.py"
+}
+
+# Run icon_generator.py if icon.ico or the prerendered tray icons do not already exist
+if (!(Test-Path -Path ".\icon.ico") -or !(Test-Path -Path ".\icons")) {
     & ".\icon_generator.py"
 }
 
@@ -37,10 +43,13 @@ $pyInstallerArgs = @(
 
     # Data files
     "--add-data=$icon;$dot",
-    "--add-data=$corpus;$dot",
+    "--add-data=$words;$dot",
+    "--add-data=$icons;$icons",
     "--add-data=$readme;$dot",
     "--add-data=$license;$dot",
     "--add-data=$frontDir;$frontDir",
+    # imported when the api starts
+    "--hidden-import=waitress",
     # Binaries
     "--add-binary=$ffmpeg;$dot",
     "main.py"
@@ -0,0 +1,191 @@
+"""Searchable catalog of everything that was on screen while recording.
+
+Every focus span, a stretch of a recording during which one window title was
+in focus, is stored in an SQLite database in .metadata/catalog.sqlite with
+the recording, the clip file, the app, the title, its start and end frame in
+the clip and the wall-clock time. Window titles are indexed with FTS5 so a
+search stays fast over a year of footage.
+
+The capture loop only puts spans on a queue, a writer thread inserts them in
+batches so the disk never holds up capture.
+"""
+
+import queue
+import sqlite3
+import threading as tr
+from time import time
+
+import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    id INTEGER PRIMARY KEY,
+    recording TEXT NOT NULL,
+    clip TEXT NOT NULL,
+    app TEXT NOT NULL,
+    title TEXT NOT NULL,
+    start_frame INTEGER NOT NULL,
+    end_frame INTEGER NOT NULL,
+    started REAL NOT NULL,
+    ended REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spans_started ON spans (started);
+CREATE INDEX IF NOT EXISTS spans_recording ON spans (recording, start_frame);
+CREATE VIRTUAL TABLE IF NOT EXISTS titles USING fts5 (
+    title, app, content='spans', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS spans_insert AFTER INSERT ON spans BEGIN
+    INSERT INTO titles (rowid, title, app) VALUES (new.id, new.title, new.app);
+END;
+CREATE TRIGGER IF NOT EXISTS spans_delete AFTER DELETE ON spans BEGIN
+    INSERT INTO titles (titles, rowid, title, app) VALUES ('delete', old.id, old.title, old.app);
+END;
+"""
+
+COLUMNS = ("recording", "clip", "app", "title", "start_frame", "end_frame", "started", "ended")
+BATCH_SIZE = 256  # spans inserted per transaction at most
+
+_QUEUE = queue.Queue()
+_WRITER = None
+_WRITER_LOCK = tr.Lock()
+_PREPARED = set()  # databases whose schema and journal mode were set up by this process
+_PREPARE_LOCK = tr.Lock()
+
+
+def catalog_path():
+    return settings.HOME_DIR / ".metadata" / "catalog.sqlite"
+
+
+def connect(path=None) -> sqlite3.Connection:
+    """Open the catalog, creating it the first time this process opens it."""
+    path = path or catalog_path()
+    with _PREPARE_LOCK:
+        if path not in _PREPARED:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path))
+            try:
+                # readers (the API) do not block the writer and the other way around, stored in the file
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(SCHEMA)
+            finally:
+                db.close()
+            _PREPARED.add(path)
+    db = sqlite3.connect(str(path))
+    db.row_factory = sqlite3.Row
+    return db
+
+
+def _writer_thread():
+    db, path = None, None
+    while True:
+        batch = [_QUEUE.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        if path != catalog_path():
+            # first batch, or the home folder was changed in the settings
+            if db is not None:
+                db.close()
+            path = catalog_path()
+            db = connect(path)
+            # a per connection setting, only the writer commits
+            db.execute("PRAGMA synchronous=NORMAL")
+        spans = [span for span in batch if span is not None]
+        try:
+            with db:
+                db.executemany(
+                    f"INSERT INTO spans ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    spans,
+                )
+        except sqlite3.Error as e:
+            print(f"Could not catalog {len(spans)} spans: {e}")
+        for _ in batch:
+            _QUEUE.task_done()
+
+
+def add_span(
+    recording: str,
+    clip: str,
+    app: str,
+    title: str,
+    start_frame: int,
+    end_frame: int,
+    started: float,
+    ended: float = None,
+):
+    """Queue a focus span for the catalog, returns immediately."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = tr.Thread(target=_writer_thread, name="Catalog Thread", daemon=True)
+            _WRITER.start()
+    _QUEUE.put((recording, clip, app, title or "", start_frame, end_frame, started, ended or time()))
+
+
+def flush():
+    """Wait until every queued span is in the database.
+    Called when a recording finished its files and before the program exits."""
+    if _WRITER is not None:
+        _QUEUE.join()
+
+
+def _match_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word has to match, the last one as a prefix."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+def search(
+    text: str,
+    app: str = None,
+    since: float = None,
+    until: float = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> list:
+    """Find the spans whose window title (or app) matches the text, newest first.
+
+    Args:
+        text (str): Words to look for, the last word may be incomplete.
+        app (str): Only spans of this app.
+        since (float): Only spans that ended after this unix time.
+        until (float): Only spans that started before this unix time.
+    Returns:
+        list: One dict per span with the columns plus start_ms and end_ms, the offsets within the clip.
+    """
+    query = _match_query(text)
+    if not query:
+        return []
+    conditions, params = ["titles MATCH ?"], [query]
+    if app:
+        conditions.append("spans.app = ?")
+        params.append(app)
+    if since is not None:
+        conditions.append("spans.ended >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("spans.started <= ?")
+        params.append(until)
+
+    db = connect()
+    try:
+        rows = db.execute(
+            f"""SELECT spans.* FROM titles JOIN spans ON spans.id = titles.rowid
+            WHERE {' AND '.join(conditions)}
+            ORDER BY titles.rowid DESC LIMIT ? OFFSET ?""",  # spans are inserted in time order
+            (*params, limit, offset),
+        ).fetchall()
+    finally:
+        db.close()
+
+    results = []
+    for row in rows:
+        span = {column: row[column] for column in COLUMNS}
+        span["start_ms"] = span["start_frame"] * 1000 // settings.FRAME_RATE
+        span["end_ms"] = span["end_frame"] * 1000 // settings.FRAME_RATE
+        results.append(span)
+    return results
@@ -0,0 +1,125 @@
+"""Noise-aware change detection on top of the tiled frame diff.
+
+Small things that change all day without anything happening, like a blinking
+caret, the taskbar clock or a spinner, should not keep the recorder encoding.
+The ChangeDetector ignores tiles that are:
+- inside one of the user's settings.IGNORE_REGIONS,
+- learned as noise by calibrating on a short sample of an idle screen,
+- around the mouse cursor (settings.IGNORE_CURSOR_RADIUS).
+
+The threshold is a fraction of the sampled pixels so it means the same at
+1080p and at 4K. Calibration can raise it above the noise floor it measured.
+"""
+
+import numpy as np
+
+import settings
+from framediff import DIFF_SUBSAMPLE, TILE_SIZE, tile_grid, tiled_diff
+
+NOISE_TILE_RATE = 0.05  # a tile that changes in more than this share of idle frame pairs is noise
+NOISE_MARGIN = 2.0  # the calibrated threshold is this many times the remaining noise
+# a calibration that finds more of the screen noisy than this share of the tiles saw activity, not noise
+MAX_NOISE_SHARE = 0.1
+
+
+class ChangeDetector:
+    def __init__(
+        self,
+        resolution: tuple,
+        fraction: float = None,
+        regions: list = None,
+        cursor_radius: int = None,
+    ):
+        """
+        Args:
+            resolution (tuple): Width and height of the frames.
+            fraction (float): Share of the sampled pixels that has to change, settings.CHANGE_FRACTION by default.
+            regions (list): Ignored [x, y, width, height] rectangles in screen pixels, settings.IGNORE_REGIONS by default.
+            cursor_radius (int): Ignored distance around the cursor in pixels, settings.IGNORE_CURSOR_RADIUS by default.
+        """
+        self.width, self.height = resolution
+        fraction = settings.CHANGE_FRACTION if fraction is None else fraction
+        regions = settings.IGNORE_REGIONS if regions is None else regions
+        self.cursor_radius = settings.IGNORE_CURSOR_RADIUS if cursor_radius is None else cursor_radius
+
+        self.rows, self.cols = tile_grid((self.height, self.width))
+        sampled = -(-self.height // DIFF_SUBSAMPLE) * -(-self.width // DIFF_SUBSAMPLE)
+        self.threshold = max(1, int(fraction * sampled))
+
+        self.user_mask = np.zeros((self.rows, self.cols), dtype=bool)
+        for region in regions:
+            self.user_mask |= self.region_tiles(*region)
+        self.learned_mask = np.zeros_like(self.user_mask)
+        self._static_mask = self.user_mask.copy()
+        self._samples = []  # tile counts of the frame pairs sampled for the calibration
+
+    def region_tiles(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        """Returns the tile map of all tiles that overlap the rectangle."""
+        tile = TILE_SIZE * DIFF_SUBSAMPLE  # tile size in screen pixels
+        mask = np.zeros((self.rows, self.cols), dtype=bool)
+        x0, y0 = max(0, x // tile), max(0, y // tile)
+        x1, y1 = (x + w - 1) // tile + 1, (y + h - 1) // tile + 1
+        if w > 0 and h > 0:
+            mask[y0:y1, x0:x1] = True
+        return mask
+
+    def ignore_mask(self, cursor: tuple = None):
+        """Returns the tiles to ignore, or None if no tile is ignored."""
+        mask = self._static_mask
+        if cursor is not None and self.cursor_radius > 0:
+            r = self.cursor_radius
+            mask = mask | self.region_tiles(cursor[0] - r, cursor[1] - r, 2 * r, 2 * r)
+        return mask if mask.any() else None
+
+    def changed(self, A: np.ndarray, B: np.ndarray, cursor: tuple = None) -> bool:
+        """True if enough changed between the frames outside the ignored tiles."""
+        return tiled_diff(A, B, self.threshold, self.ignore_mask(cursor)).count >= self.threshold
+
+    def calibrate(self, frames):
+        """Learn the noise of an idle screen from a short run of consecutive frames.
+        Only the previous frame is kept, frames can be a generator. See finish_calibration.
+        """
+        previous = None
+        for frame in frames:
+            if previous is not None:
+                self.sample(previous, frame)
+            previous = frame
+        self.finish_calibration()
+
+    def sample(self, A: np.ndarray, B: np.ndarray):
+        """Add a pair of consecutive frames to the calibration, an unchanged pair counts too."""
+        self._samples.append(tiled_diff(A, B, ignore=self._static_mask).counts)
+
+    def finish_calibration(self):
+        """Learn the noise from the sampled frame pairs and forget them.
+
+        Tiles that change in more than NOISE_TILE_RATE of the frame pairs are
+        ignored from now on. If the noise that is left would still cross the
+        threshold, the threshold is raised to NOISE_MARGIN times that noise.
+        If more than MAX_NOISE_SHARE of the tiles changed, the screen was not
+        idle and the calibration is discarded.
+        """
+        counts, self._samples = self._samples, []
+        if not counts:
+            return
+        counts = np.stack(counts)
+
+        hits = np.count_nonzero(counts, axis=0)
+        learned = hits > NOISE_TILE_RATE * len(counts)
+        if learned.mean() > MAX_NOISE_SHARE:
+            # the user was typing, scrolling or watching something while calibrating,
+            # masking all that would hide it for the whole recording
+            print(
+                f"Calibration discarded: {learned.mean():.0%} of the screen changed, "
+                f"more than the {MAX_NOISE_SHARE:.0%} that can be noise"
+            )
+            return
+        self.learned_mask = learned
+        self._static_mask = self.user_mask | self.learned_mask
+
+        noise = int(counts[:, ~self._static_mask].sum(axis=1).max())
+        self.threshold = max(self.threshold, int(noise * NOISE_MARGIN) + 1)
+        print(
+            f"Calibrated change detection: {int(self.learned_mask.sum())} noisy tiles ignored, "
+            f"threshold {self.threshold} sampled pixels"
+        )
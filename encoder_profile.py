@@ -0,0 +1,268 @@
+"""Picks the encoder settings this machine can sustain in real time.
+
+Calibration runs short encodes of synthetic frames with every candidate codec,
+from the preset that compresses best to the fastest one, and keeps the first
+configuration that encodes faster than settings.FRAME_RATE with some margin.
+Every trial runs as many encoders at the same time as a recording does, one
+per captured output and the standby encoder of each output that overlaps it
+around a rollover, and splits the CPU threads between them. For that preset
+the quality (CRF, or CQ for NVENC) is stepped from settings.QUALITY to the
+best one whose output stays within settings.TARGET_MB_PER_HOUR.
+The codec, preset, quality and thread count are stored per resolution in
+.settings/encoder_profile.yaml and used by recorder.mkv_encoder from then on.
+
+Run this file to calibrate the resolution of every monitor, or the given ones:
+    python encoder_profile.py
+    python encoder_profile.py 1920x1080 2560x1440
+"""
+
+import os
+import tempfile
+import threading as tr
+from pathlib import Path
+from time import perf_counter, time
+
+import ffmpeg
+import yaml
+
+import framesource
+import settings
+import util
+
+REALTIME_MARGIN = 1.25  # a profile has to encode this many times faster than real time
+TRIAL_SECONDS = 3  # seconds of video encoded per trial
+# the distinct frames cycled through during a trial, only activities that change the picture every frame
+POOL_SCRIPT = (("typing", 2, "Editor"), ("scroll", 4, "Browser"), ("video", 4, "Video"))
+
+QUALITY_RANGE = (18, 42)  # CRF and CQ values calibration may pick, higher is smaller and worse
+QUALITY_STEP = 3  # CRF and CQ change between quality trials, about 1.4 times the size per step
+
+# candidates in order of preference, presets from best compression to fastest
+CANDIDATES = (
+    ("hevc_nvenc", ("p7", "p6", "p5", "p4", "p3", "p2", "p1")),
+    ("libx265", ("medium", "fast", "faster", "veryfast", "superfast", "ultrafast")),
+    ("libx264", ("medium", "fast", "faster", "veryfast", "superfast", "ultrafast")),
+)
+
+
+PROBE_MAX_AGE = 7 * 24 * 3600  # seconds before the cached encoder probe is refreshed in the background
+_DEFAULT_CODEC = None
+
+
+def probe_path() -> Path:
+    return settings.HOME_DIR / ".settings" / "encoder_probe.yaml"
+
+
+def _read_probe():
+    try:
+        with open(probe_path(), "r") as f:
+            return yaml.safe_load(f)
+    except (FileNotFoundError, yaml.YAMLError):
+        return None
+
+
+def refresh_probe() -> dict:
+    """Probe the GPU for NVENC through NVML and cache the result on disk."""
+    global _DEFAULT_CODEC
+    probe = {"codec": "hevc_nvenc" if util.nvenc_available() else "libx265", "time": time()}
+    try:
+        with open(probe_path(), "w") as f:
+            yaml.dump(probe, f)
+    except OSError as e:
+        print(f"Could not cache the encoder probe: {e}")
+    _DEFAULT_CODEC = probe["codec"]
+    return probe
+
+
+def probe_is_stale() -> bool:
+    probe = _read_probe()
+    return probe is None or time() - probe.get("time", 0) > PROBE_MAX_AGE
+
+
+def default_codec() -> str:
+    """hevc_nvenc if the GPU can encode HEVC, libx265 otherwise.
+    NVML is only probed when there is no cached probe, see refresh_probe."""
+    global _DEFAULT_CODEC
+    if _DEFAULT_CODEC is None:
+        probe = _read_probe()
+        _DEFAULT_CODEC = probe["codec"] if probe and "codec" in probe else refresh_probe()["codec"]
+    return _DEFAULT_CODEC
+
+
+def profile_path() -> Path:
+    return settings.HOME_DIR / ".settings" / "encoder_profile.yaml"
+
+
+def _read_profiles() -> dict:
+    try:
+        with open(profile_path(), "r") as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def load(width: int, height: int):
+    """Returns the calibrated profile for the resolution, None if it was never calibrated."""
+    return _read_profiles().get(f"{width}x{height}")
+
+
+def save(width: int, height: int, profile: dict):
+    profiles = _read_profiles()
+    profiles[f"{width}x{height}"] = profile
+    with open(profile_path(), "w") as f:
+        yaml.dump(profiles, f)
+
+
+def ffmpeg_options(profile: dict) -> dict:
+    """Turns a profile into ffmpeg output options, settings.QUALITY if the profile has no quality."""
+    codec = profile["codec"]
+    quality = profile.get("quality", settings.QUALITY)
+    if codec.endswith("_nvenc"):
+        return dict(vcodec=codec, cq=quality, preset=profile["preset"], tune="hq", weighted_pred=1)
+    options = dict(vcodec=codec, crf=quality, preset=profile["preset"], threads=profile["threads"])
+    if codec == "libx265":
+        # closed GOPs so every keyframe is a clean cut point for the extractor
+        options["x265-params"] = f"pools={profile['threads']}:log-level=error:open-gop=0"
+    return options
+
+
+def _frame_pool(resolution: tuple) -> list:
+    """A few distinct desktop-like frames, cycled to feed the encoder without generating frames on the fly."""
+    source = framesource.SyntheticSource(resolution, POOL_SCRIPT, loop=False)
+    return [source.get_latest_frame() for _ in range(sum(step[1] for step in POOL_SCRIPT))]
+
+
+def concurrent_encoders() -> int:
+    """Encoders that can run at the same time while recording: one per output in settings.CAPTURE_OUTPUTS,
+    twice that with segments, when every output rolls over to its standby encoder at once."""
+    outputs = settings.CAPTURE_OUTPUTS
+    count = (len(util.get_monitors()) or 1) if outputs == "all" else len(outputs)
+    if settings.SEGMENT_MAX_MINUTES or settings.SEGMENT_MAX_MB:
+        count *= 2
+    return max(1, count)
+
+
+def target_bytes_per_frame() -> float:
+    return settings.TARGET_MB_PER_HOUR * 1_000_000 / (3600 * settings.FRAME_RATE)
+
+
+def trial(profile: dict, resolution: tuple, pool: list, directory: Path, encoders: int = 1):
+    """Encode TRIAL_SECONDS of video with the profile on encoders encoders at the same time.
+    Returns the fps of the slowest one and the bytes per frame, None if the profile is too slow or does not work."""
+    w, h = resolution
+    frames = TRIAL_SECONDS * settings.FRAME_RATE
+    budget = frames / (settings.FRAME_RATE * REALTIME_MARGIN)
+    name = f"{profile['codec']}_{profile['preset']}_{profile['quality']}"
+    paths = [directory / f"{name}_{i}.mkv" for i in range(encoders)]
+    processes = [
+        ffmpeg.input("pipe:", format="rawvideo", pix_fmt="rgb24", s=f"{w}x{h}", r=settings.FRAME_RATE)
+        .output(str(path), pix_fmt="yuv420p", **ffmpeg_options(profile))
+        .global_args("-loglevel", "error")
+        .overwrite_output()
+        .run_async(pipe_stdin=True, quiet=True)
+        for path in paths
+    ]
+    elapsed = [None] * encoders  # seconds each encoder took, None if it did not finish in the budget
+    start = perf_counter()
+
+    def feed(i):
+        process = processes[i]
+        try:
+            for n in range(frames):
+                # every encoder starts at another frame of the pool, like screens that show different things
+                process.stdin.write(pool[(n + i) % len(pool)].data)
+                if perf_counter() - start > budget:
+                    return  # already too slow, no need to finish
+            process.stdin.close()
+            process.wait()
+            elapsed[i] = perf_counter() - start
+        except OSError:
+            pass  # the encoder is not available and ffmpeg quit
+
+    feeders = [tr.Thread(target=feed, args=(i,), name="Calibration Feed Thread") for i in range(encoders)]
+    for feeder in feeders:
+        feeder.start()
+    for feeder in feeders:
+        feeder.join()
+    for process in processes:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    if None in elapsed or any(process.returncode != 0 for process in processes) or max(elapsed) > budget:
+        return None
+    size = sum(path.stat().st_size for path in paths) / encoders
+    return {"fps": round(frames / max(elapsed), 1), "bytes_per_frame": int(size // frames)}
+
+
+def pick_quality(run) -> tuple:
+    """Step the quality from settings.QUALITY to the best one that stays within the size target.
+    run(quality) returns the trial result, None if too slow. Returns (quality, result), None if
+    settings.QUALITY is already too slow. If no quality in QUALITY_RANGE reaches the target the smallest is taken."""
+    target = target_bytes_per_frame()
+    quality = min(max(settings.QUALITY, QUALITY_RANGE[0]), QUALITY_RANGE[1])
+    result = run(quality)
+    if result is None:
+        return None
+    best = (quality, result)
+    # a lower CRF or CQ means better quality, bigger files and slower encoding
+    step = -QUALITY_STEP if result["bytes_per_frame"] <= target else QUALITY_STEP
+    while QUALITY_RANGE[0] <= quality + step <= QUALITY_RANGE[1]:
+        quality += step
+        result = run(quality)
+        if result is None:
+            break  # better quality is too slow
+        if step < 0 and result["bytes_per_frame"] > target:
+            break  # better quality is too big
+        best = (quality, result)
+        if step > 0 and result["bytes_per_frame"] <= target:
+            break  # the best quality that fits
+    return best
+
+
+def calibrate(width: int, height: int) -> dict:
+    """Find, store and return the best profile that sustains real time at this resolution."""
+    pool = _frame_pool((width, height))
+    encoders = concurrent_encoders()
+    threads = max(1, (os.cpu_count() or 1) // encoders)
+    nvenc = refresh_probe()["codec"].endswith("_nvenc")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for codec, presets in CANDIDATES:
+            if codec.endswith("_nvenc") and not nvenc:
+                continue
+            for preset in presets:
+                profile = {"codec": codec, "preset": preset, "threads": threads}
+
+                def run(quality):
+                    result = trial({**profile, "quality": quality}, (width, height), pool, Path(directory), encoders)
+                    print(f"{width}x{height} {codec} {preset} quality {quality} x{encoders}: {result or 'too slow'}")
+                    return result
+
+                picked = pick_quality(run)
+                if picked is not None:
+                    profile["quality"], result = picked
+                    profile.update(result)
+                    save(width, height, profile)
+                    return profile
+
+    raise RuntimeError(f"No encoder can sustain {settings.FRAME_RATE} fps at {width}x{height}")
+
+
+def calibrate_all() -> list:
+    """Calibrate the resolution of every monitor, or the primary screen if they can not be listed."""
+    resolutions = {(r - l, b - t) for l, t, r, b in util.get_monitors()}
+    if not resolutions:
+        resolutions = {util.get_desktop_resolution()}
+    return [calibrate(w, h) for w, h in sorted(resolutions)]
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        profiles = [calibrate(*map(int, arg.split("x"))) for arg in sys.argv[1:]]
+    else:
+        profiles = calibrate_all()
+    for profile in profiles:
+        print(profile)
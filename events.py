@@ -0,0 +1,99 @@
+"""Pushes recorder state changes and encoder metrics to whoever listens.
+
+There is one publisher in the process. recorder.start, stop and pause publish
+a "state" event as they happen, every recording publishes a "recording" event
+when it moves on from capturing to finalising and done. While someone listens, a single status thread
+publishes the encoder progress of the active recording as a "status" event,
+at most every STATUS_SECONDS and only when it changed. However many browser
+tabs are open, the status is read once and fanned out to a queue per
+subscriber. The web interface gets the events over server-sent events from
+/api/events, the tray subscribes in process.
+
+A new subscriber gets the latest event of every kind first, so it never has
+to ask for the current state.
+"""
+
+import json
+import queue
+import threading as tr
+from time import sleep
+
+STATUS_SECONDS = 1.0  # the encoder status is published at most this often
+KEEPALIVE_SECONDS = 15  # comment lines sent to idle event streams so proxies do not close them
+SUBSCRIBER_QUEUE = 64  # events buffered per subscriber, a subscriber that falls behind loses the oldest
+
+_LOCK = tr.Lock()
+_SUBSCRIBERS = set()
+_LATEST = {}  # event kind -> (id, kind, data)
+_NEXT_ID = 1
+_STATUS_THREAD = None
+
+
+def publish(kind: str, data: dict):
+    """Send an event to every subscriber, never blocks."""
+    global _NEXT_ID
+    with _LOCK:
+        event = (_NEXT_ID, kind, data)
+        _NEXT_ID += 1
+        _LATEST[kind] = event
+        subscribers = list(_SUBSCRIBERS)
+    for subscriber in subscribers:
+        while True:
+            try:
+                subscriber.put_nowait(event)
+                break
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+def subscribe() -> queue.Queue:
+    """A queue that receives (id, kind, data) for every event from now on, after the latest of each kind."""
+    global _STATUS_THREAD
+    subscriber = queue.Queue(SUBSCRIBER_QUEUE)
+    with _LOCK:
+        for event in sorted(_LATEST.values()):
+            subscriber.put_nowait(event)
+        _SUBSCRIBERS.add(subscriber)
+        if _STATUS_THREAD is None:
+            _STATUS_THREAD = tr.Thread(target=_status_thread, name="Event Status Thread", daemon=True)
+            _STATUS_THREAD.start()
+    return subscriber
+
+
+def unsubscribe(subscriber: queue.Queue):
+    with _LOCK:
+        _SUBSCRIBERS.discard(subscriber)
+
+
+def _status_thread():
+    import recorder
+
+    last = None
+    while True:
+        sleep(STATUS_SECONDS)
+        if not _SUBSCRIBERS:
+            continue
+        active = recorder.ACTIVE_RECORDER
+        status = active.get_status() if active is not None else {}
+        if status and status != last:
+            publish("status", status)
+        last = status
+
+
+def stream():
+    """Server-sent events for the web interface, runs until the client disconnects."""
+    subscriber = subscribe()
+    try:
+        yield f"retry: {int(STATUS_SECONDS * 1000)}\n\n"
+        while True:
+            try:
+                event_id, kind, data = subscriber.get(timeout=KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+    finally:
+        unsubscribe(subscriber)
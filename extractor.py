@@ -0,0 +1,232 @@
+"""Cuts the takes of an app out of the recordings into a single video per app.
+
+The takes come from the EDL timeline of the app. Every take is split at the
+keyframes of its clip: the whole GOPs in the middle are stream copied without
+touching the pixels, only the frames before the first and after the last
+keyframe are re-encoded with the recorder's encoder settings. The pieces are
+joined with the concat demuxer, again without re-encoding.
+
+Pieces of all running extractions share one pool of ffmpeg workers. Every
+extraction is an Extraction job whose progress the API reports.
+"""
+
+import os
+import re
+import shutil
+import threading as tr
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import time
+from typing import NamedTuple
+
+import ffmpeg
+
+import recorder
+import settings
+import timelines
+
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 2) // 2)  # ffmpeg processes running at the same time
+
+# encoders for the edges, by the codec of the recording
+EDGE_ENCODERS = {"hevc": "libx265", "h264": "libx264"}
+CODEC_FAMILIES = {"hevc_nvenc": "hevc", "libx265": "hevc", "h264_nvenc": "h264", "libx264": "h264"}
+
+_POOL = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS, thread_name_prefix="Extract Worker")
+JOBS = {}  # job id -> Extraction
+
+
+class Piece(NamedTuple):
+    clip: str  # path of the recording
+    start_frame: int
+    frames: int
+    copy: bool  # stream copy whole GOPs, otherwise re-encode
+    seek: float  # input seek position in seconds
+
+
+class ClipInfo(NamedTuple):
+    codec: str
+    width: int
+    height: int
+    keyframes: list  # frame numbers of the keyframes, ascending
+
+
+def probe_clip(path) -> ClipInfo:
+    """Codec, size and keyframes of a recording. Only the keyframes are decoded.
+    Runs ffmpeg itself with the showinfo filter, ffprobe does not ship with the app."""
+    _, log = (
+        ffmpeg.input(str(path), skip_frame="nokey")
+        .output("-", format="null", map="0:v:0", vf="showinfo")
+        .global_args("-nostats")
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    log = log.decode(errors="replace")
+    codec = re.search(r"Stream #0:\d+.*?: Video: (\w+)", log).group(1)
+    width, height = map(int, re.search(r"\bs:(\d+)x(\d+)", log).groups())
+    keyframes = [round(float(t) * settings.FRAME_RATE) for t in re.findall(r"pts_time:([\d.]+)", log)]
+    return ClipInfo(codec, width, height, sorted(keyframes))
+
+
+def plan_take(clip: str, take: timelines.Take, keyframes: list) -> list:
+    """Split a take into pieces: re-encoded edges around the stream copied keyframe-aligned middle."""
+    start, end = take.start_frame, take.end_frame
+    fps = settings.FRAME_RATE
+    inside = [k for k in keyframes if start <= k <= end]
+    if len(inside) < 2:
+        # no whole GOP inside the take
+        return [Piece(clip, start, end - start, False, start / fps)] if end > start else []
+    first, last = inside[0], inside[-1]
+    pieces = []
+    if first > start:
+        pieces.append(Piece(clip, start, first - start, False, start / fps))
+    # stream copy starts at the last keyframe before the seek position, the decode timestamp of a
+    # keyframe is a few frames early with B-frames so aim between the first and the next keyframe
+    pieces.append(Piece(clip, first, last - first, True, (first + inside[1]) / 2 / fps))
+    if end > last:
+        pieces.append(Piece(clip, last, end - last, False, last / fps))
+    return pieces
+
+
+def edge_options(info: ClipInfo) -> dict:
+    """Encoder options for re-encoded edges, they have to match the codec of the copied pieces."""
+    options = recorder.codec_options(info.width, info.height)
+    if CODEC_FAMILIES.get(options["vcodec"]) != info.codec:
+        options = dict(vcodec=EDGE_ENCODERS[info.codec], crf=settings.QUALITY, preset="veryfast")
+    return options
+
+
+def cut_piece(piece: Piece, info: ClipInfo, path: str):
+    """Write one piece to path, runs on a pool worker."""
+    if piece.copy:
+        stream = ffmpeg.input(piece.clip, ss=piece.seek).output(
+            path, vcodec="copy", an=None, avoid_negative_ts="make_zero", **{"frames:v": piece.frames}
+        )
+    else:
+        # seeking is frame accurate when re-encoding
+        stream = ffmpeg.input(piece.clip, ss=piece.seek).output(
+            path,
+            an=None,
+            r=settings.FRAME_RATE,
+            pix_fmt="yuv420p",
+            **recorder.COLOR_OPTIONS,
+            **edge_options(info),
+            **{"frames:v": piece.frames},
+        )
+    stream.global_args("-loglevel", "error").overwrite_output().run(capture_stdout=True, capture_stderr=True)
+
+
+class Extraction:
+    """Extraction of one app, runs on its own thread and hands its pieces to the shared pool."""
+
+    def __init__(self, appname: str):
+        self.id = uuid.uuid4().hex[:8]
+        self.appname = appname
+        self.state = "queued"  # queued, running, done, failed
+        self.error = None
+        self.output = settings.HOME_DIR / "Extracts" / f"{appname}.mkv"
+        self.takes = 0
+        self.skipped_takes = 0  # takes whose recording is missing
+        self.pieces = 0
+        self.pieces_done = 0
+        self.copied_frames = 0
+        self.encoded_frames = 0
+        self.started = time()
+        self.finished = None
+        self._lock = tr.Lock()  # pieces finish on several workers
+        self.thread = tr.Thread(target=self._run, name=f"Extraction {appname}", daemon=True)
+
+    def start(self):
+        JOBS[self.id] = self
+        self.thread.start()
+        return self
+
+    def _run(self):
+        self.state = "running"
+        workdir = settings.HOME_DIR / ".cache" / f"extract_{self.id}"
+        try:
+            workdir.mkdir(parents=True, exist_ok=True)
+            self._extract(workdir)
+            self.state = "done"
+            print(f"Extracted {self.appname}: {self.output}")
+        except Exception as e:
+            self.state = "failed"
+            self.error = getattr(e, "stderr", None) and e.stderr.decode(errors="replace").strip() or str(e)
+            print(f"Extraction of {self.appname} failed: {self.error}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            self.finished = time()
+
+    def _extract(self, workdir):
+        takes = timelines.read_takes(self.appname)
+        self.takes = len(takes)
+        clips = {}
+        plan = []
+        for take in takes:
+            clip = settings.HOME_DIR / "Records" / take.clip_name
+            if not clip.exists():
+                self.skipped_takes += 1
+                continue
+            if clip not in clips:
+                clips[clip] = probe_clip(clip)
+            plan.extend((piece, clips[clip]) for piece in plan_take(str(clip), take, clips[clip].keyframes))
+        if not plan:
+            raise FileNotFoundError(f"No recorded takes of {self.appname} left to extract")
+
+        self.pieces = len(plan)
+        paths = [str(workdir / f"{i:05}.mkv") for i in range(len(plan))]
+        futures = [_POOL.submit(self._cut, piece, info, path) for (piece, info), path in zip(plan, paths)]
+        wait(futures)
+        for future in futures:
+            future.result()  # raise the first error
+
+        # every piece lasts exactly its frames: the concat demuxer would otherwise take the duration from the
+        # container, which for a stream copied piece includes its B-frame delay and leaves a gap after it
+        listing = workdir / "pieces.txt"
+        listing.write_text(
+            "".join(
+                f"file '{path}'\nduration {piece.frames / settings.FRAME_RATE:.6f}\n"
+                for (piece, _), path in zip(plan, paths)
+            ),
+            encoding="utf-8",
+        )
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        (
+            ffmpeg.input(str(listing), format="concat", safe=0)
+            .output(str(self.output), c="copy")
+            .global_args("-loglevel", "error")
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+
+    def _cut(self, piece: Piece, info: ClipInfo, path: str):
+        cut_piece(piece, info, path)
+        with self._lock:
+            if piece.copy:
+                self.copied_frames += piece.frames
+            else:
+                self.encoded_frames += piece.frames
+            self.pieces_done += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "app": self.appname,
+            "state": self.state,
+            "error": self.error,
+            "output": str(self.output),
+            "takes": self.takes,
+            "skipped_takes": self.skipped_takes,
+            "pieces": self.pieces,
+            "pieces_done": self.pieces_done,
+            "progress": round(self.pieces_done / self.pieces, 3) if self.pieces else 0.0,
+            "copied_frames": self.copied_frames,
+            "encoded_frames": self.encoded_frames,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def extract(appnames: list = None) -> list:
+    """Start extracting the apps, every app with a timeline by default. Returns the started jobs."""
+    timelines.flush_all_edl_writers()
+    appnames = appnames or timelines.list_apps()
+    return [Extraction(appname).start() for appname in appnames]
@@ -0,0 +1,97 @@
+"""Reads the machine-readable progress of an ffmpeg process.
+
+ffmpeg started with `-progress pipe:1 -nostats` writes a block of key=value
+lines to stdout about twice a second, closed by a `progress=continue` or
+`progress=end` line. A ProgressReader follows that stream on its own thread,
+fills a fixed set of numeric fields and publishes them as an immutable
+Progress snapshot once a block is complete. Readers just take the latest
+snapshot, there is no lock and no string parsing on their side.
+"""
+
+import threading as tr
+from typing import NamedTuple
+
+PROGRESS_ARGS = ("-progress", "pipe:1", "-nostats")  # global ffmpeg arguments
+MAX_LINE = 256  # longer lines are not progress output, they are read in pieces and ignored
+
+
+class Progress(NamedTuple):
+    frame: int = 0
+    fps: float = 0.0
+    q: float = 0.0  # quantizer of the first video stream
+    bitrate: float = 0.0  # kbit/s
+    size: int = 0  # bytes written so far
+    time: float = 0.0  # seconds of video written so far
+    speed: float = 0.0  # encoding speed as a multiple of real time
+    dup: int = 0  # frames duplicated to keep the frame rate
+    drop: int = 0  # frames dropped to keep the frame rate
+    ended: bool = False
+
+
+def _number(value: bytes, suffix: bytes = b"") -> float:
+    """Parse a progress value, "N/A" and garbage count as 0."""
+    try:
+        return float(value.removesuffix(suffix))
+    except ValueError:
+        return 0.0
+
+
+# progress key -> (field index in Progress, parser)
+_FIELDS = {
+    b"frame": (0, lambda v: int(_number(v))),
+    b"fps": (1, _number),
+    b"stream_0_0_q": (2, _number),
+    b"bitrate": (3, lambda v: _number(v, b"kbits/s")),
+    b"total_size": (4, lambda v: int(_number(v))),
+    b"out_time_us": (5, lambda v: _number(v) / 1_000_000),
+    b"speed": (6, lambda v: _number(v, b"x")),
+    b"dup_frames": (7, lambda v: int(_number(v))),
+    b"drop_frames": (8, lambda v: int(_number(v))),
+}
+
+
+class ProgressReader:
+    def __init__(self, stream, name: str = "Progress Thread"):
+        """
+        Args:
+            stream: The binary stdout of an ffmpeg process started with PROGRESS_ARGS.
+            name (str): Name of the reader thread.
+        """
+        self.stream = stream
+        self.snapshot = Progress()
+        self.thread = tr.Thread(target=self._read_thread, name=name, daemon=True)
+        self.thread.start()
+
+    def _read_thread(self):
+        values = list(Progress())
+        while True:
+            line = self.stream.readline(MAX_LINE)
+            if not line:
+                break  # ffmpeg exited
+            key, _, value = line.rstrip().partition(b"=")
+            field = _FIELDS.get(key)
+            if field is not None:
+                values[field[0]] = field[1](value)
+            elif key == b"progress":
+                values[-1] = value == b"end"
+                # swapping the reference is atomic, readers see either the old or the new block
+                self.snapshot = Progress(*values)
+        if not self.snapshot.ended:
+            self.snapshot = self.snapshot._replace(ended=True)
+
+    def status(self) -> dict:
+        """The latest snapshot in the units of the ffmpeg stats line, as shown by the API and the tray."""
+        p = self.snapshot
+        minutes, seconds = divmod(p.time, 60)
+        hours, minutes = divmod(int(minutes), 60)
+        return {
+            "frame": p.frame,
+            "fps": p.fps,
+            "q": p.q,
+            "size": f"{p.size // 1024}kB",
+            "time": f"{hours:02}:{minutes:02}:{seconds:05.2f}",
+            "bitrate": f"{p.bitrate:.1f}kbits/s",
+            "speed": f"{p.speed:.3g}x",
+            "dup": p.dup,
+            "drop": p.drop,
+        }
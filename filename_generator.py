@@ -1,33 +1,97 @@
+"""Random, readable recording names like "broad_lake" or "voting_pine".
+
+The words come from original_corpus.pkl, filtered to at most MAX_WORD_LENGTH
+characters. The filtered words are stored once in a compact table of fixed
+width records (filename_words.bin) that is memory-mapped on first use, so
+picking a word is a single slice instead of unpickling the whole corpus.
+
+Run this file to rebuild the table after changing the corpus or the filter:
+    python filename_generator.py
+"""
+
+import mmap
 import pickle
-from random import choice
-import os
+import struct
+from random import choice, randrange
 from pathlib import Path
+
+import settings
+
 MAX_WORD_LENGTH = 5
 CORPUS_PATH = Path(__file__).resolve().with_name("original_corpus.pkl")
+TABLE_PATH = Path(__file__).resolve().with_name("filename_words.bin")
+# magic, record width, number of adjectives, nouns and verbs, followed by the records in that order
+TABLE_HEADER = struct.Struct("<4sB3I")
+TABLE_MAGIC = b"SRWT"
+PARTS = ("adjectives", "nouns", "verbs")
+MAX_ATTEMPTS = 20  # names tried before accepting one that is taken
 
-def generate_filename():
-    # load the corpus from the pickle file
-    with open(CORPUS_PATH, 'rb') as f:
+_TABLE = None  # (mmap, record width, {part: (first record, count)})
+
+
+def build_table(corpus_path: Path = CORPUS_PATH, table_path: Path = TABLE_PATH):
+    """Filter the corpus and write the word table."""
+    with open(corpus_path, "rb") as f:
         corpus = pickle.load(f)
-        verbs = corpus['verbs']
-        nouns = corpus['nouns']
-        adjs = corpus['adjectives']
-        
-        #filter verbs nouns and adjectives to be less or equal to MAX_WORD_LENGTH
-        
-        verbs = [v for v in verbs if len(v) <= MAX_WORD_LENGTH]
-        nouns = [n for n in nouns if len(n) <=MAX_WORD_LENGTH]
-        adjs = [a for a in adjs if len(a) <=MAX_WORD_LENGTH]
-
-        
+    words = {part: [w.encode() for w in corpus[part] if len(w) <= MAX_WORD_LENGTH] for part in PARTS}
+    width = max(len(w) for part in PARTS for w in words[part])
+
+    with open(table_path, "wb") as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, width, *(len(words[part]) for part in PARTS)))
+        for part in PARTS:
+            f.write(b"".join(w.ljust(width, b"\0") for w in words[part]))
+
+
+def _table():
+    global _TABLE
+    if _TABLE is None:
+        if not TABLE_PATH.exists():
+            build_table()
+        with open(TABLE_PATH, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, width, *counts = TABLE_HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"{TABLE_PATH} is not a word table")
+        parts, first = {}, 0
+        for part, count in zip(PARTS, counts):
+            parts[part] = (first, count)
+            first += count
+        _TABLE = (data, width, parts)
+    return _TABLE
 
+
+def random_word(part: str) -> str:
+    data, width, parts = _table()
+    first, count = parts[part]
+    start = TABLE_HEADER.size + (first + randrange(count)) * width
+    return data[start : start + width].rstrip(b"\0").decode()
+
+
+def _random_name() -> str:
     if choice([True, False]):
-        return choice(adjs) + "_" + choice(nouns)
+        return random_word("adjectives") + "_" + random_word("nouns")
     else:
-        return choice(verbs) + "ing_" + choice(nouns)
-    
-    
+        return random_word("verbs") + "ing_" + random_word("nouns")
+
+
+def _taken(name: str, records: Path) -> bool:
+    """True if a recording, single or multi-screen, already uses the name."""
+    return (records / f"{name}_001.mkv").exists() or (records / f"{name}_screen1_001.mkv").exists()
+
+
+def generate_filename() -> str:
+    """Returns a random name that no recording in the Records folder uses yet."""
+    records = settings.HOME_DIR / "Records"
+    for _ in range(MAX_ATTEMPTS):
+        name = _random_name()
+        if not _taken(name, records):
+            return name
+    return name  # with tens of millions of names only a huge Records folder gets here
+
+
 if __name__ == "__main__":
+    build_table()
+    print(f"Built {TABLE_PATH}")
     # generate 20 filenames
-    for i in range(80):
+    for i in range(20):
         print(generate_filename())
@@ -0,0 +1,115 @@
+"""Tiled frame differencing with early exit.
+
+The subsampled frame is split into a grid of tiles. The grid is compared one
+band (row of tiles) at a time so the comparison can stop as soon as the number
+of changed pixels crosses the threshold. The per-band results are kept as a
+small boolean tile map that later stages can reuse to find out *where* the
+screen changed.
+
+Each sampled pixel is compared as a single 32 bit word instead of three
+separate sub-pixels. The word covers the RGB bytes of the sampled pixel plus
+the red byte of its right neighbour, which makes the comparison roughly four
+times cheaper and slightly more sensitive than a per sub-pixel comparison.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+DIFF_SUBSAMPLE = 4
+TILE_SIZE = 32  # in subsampled pixels, 128 screen pixels with DIFF_SUBSAMPLE = 4
+
+
+class TileDiff(NamedTuple):
+    count: int  # changed sampled pixels in the bands that were scanned
+    tiles: np.ndarray  # bool (rows, cols), True where a tile changed
+    complete: bool  # False if the scan stopped early, unscanned bands are False
+    counts: np.ndarray  # int32 (rows, cols), changed sampled pixels per tile
+
+
+def frameDiff(A: np.ndarray, B: np.ndarray):
+    """
+    Calculate the difference between two frames by subsampling and comparing their elements.
+    This function downsamples the input arrays `A` and `B` by a factor defined by the
+    global constant `DIFF_SUBSAMPLE`, then computes the total number of differing
+    elements between the two subsampled arrays.
+    Args:
+        A (np.ndarray): The first input frame as a 2D NumPy array.
+        B (np.ndarray): The second input frame as a 2D NumPy array.
+    Returns:
+        int: The total count of differing elements between the subsampled frames.
+    """
+
+    A = A[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
+    B = B[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
+    # summ the whole frame into one value
+    diff = np.sum(A != B)
+    return diff
+
+
+def tile_grid(shape: tuple) -> tuple:
+    """Returns the (rows, cols) of the tile grid for a frame of the given shape."""
+    h = -(-shape[0] // DIFF_SUBSAMPLE)
+    w = -(-shape[1] // DIFF_SUBSAMPLE)
+    return -(-h // TILE_SIZE), -(-w // TILE_SIZE)
+
+
+def _sampled(frame: np.ndarray) -> Optional[np.ndarray]:
+    """Returns a 2D view with one comparable element per sampled pixel."""
+    h, w = frame.shape[:2]
+    if frame.ndim == 3 and frame.flags.c_contiguous and (w * frame.shape[2]) % 4 == 0:
+        # reinterpret every row as 32 bit words, a sampled pixel starts every
+        # DIFF_SUBSAMPLE * channels bytes which is every `step` words
+        channels = frame.shape[2]
+        if (DIFF_SUBSAMPLE * channels) % 4 == 0:
+            words = frame.reshape(h, -1).view(np.uint32)
+            step = DIFF_SUBSAMPLE * channels // 4
+            return words[::DIFF_SUBSAMPLE, ::step]
+    return None
+
+
+def tiled_diff(
+    A: np.ndarray,
+    B: np.ndarray,
+    threshold: Optional[int] = None,
+    ignore: Optional[np.ndarray] = None,
+) -> TileDiff:
+    """
+    Compare two frames tile by tile.
+
+    Args:
+        A (np.ndarray): The first frame (height, width, channels).
+        B (np.ndarray): The second frame, same shape as A.
+        threshold (int, optional): Stop scanning once this many sampled pixels changed.
+        ignore (np.ndarray, optional): Bool tile map, changes in True tiles are not counted.
+    Returns:
+        TileDiff: The number of changed sampled pixels and the tile change map.
+    """
+    rows, cols = tile_grid(A.shape)
+    counts = np.zeros((rows, cols), dtype=np.int32)
+
+    a, b = _sampled(A), _sampled(B)
+    if a is None or b is None:
+        # odd layouts fall back to a per sub-pixel comparison, any change in a pixel counts once
+        a = A[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
+        b = B[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
+        per_pixel = a.ndim == 3
+    else:
+        per_pixel = False
+
+    starts = np.arange(0, a.shape[1], TILE_SIZE)
+    count = 0
+    for r in range(rows):
+        y = r * TILE_SIZE
+        changed = a[y : y + TILE_SIZE] != b[y : y + TILE_SIZE]
+        if per_pixel:
+            changed = changed.any(axis=2)
+        per_tile = counts[r]
+        np.add.reduceat(changed.sum(axis=0, dtype=np.int32), starts, out=per_tile)
+        if ignore is not None:
+            per_tile[ignore[r]] = 0
+        count += int(per_tile.sum())
+        if threshold is not None and count >= threshold:
+            return TileDiff(count, counts > 0, r == rows - 1, counts)
+
+    return TileDiff(count, counts > 0, True, counts)
@@ -0,0 +1,396 @@
+"""Frame sources feed the recorder with RGB frames.
+
+A frame source hides where frames come from so the capture, diff and encode
+pipeline can run away from a Windows desktop:
+- DxcamSource: the real desktop through dxcam (Windows only).
+- SyntheticSource: a deterministic generator that plays a script of activities.
+- ReplaySource: frames read back from a video file or an image sequence.
+
+Every source returns frames as (height, width, 3) uint8 RGB arrays and a new
+array for every frame, the recorder keeps a reference to the previous one.
+"""
+
+import threading
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import Optional
+
+import numpy as np
+
+import mouse_cursor
+import settings
+import util
+
+
+class FrameSource:
+    """Base class of all frame sources."""
+
+    resolution: tuple = (0, 0)  # width, height
+    free_running: bool = False  # True if frames come as fast as they are asked for
+
+    def start(self, target_fps: int):
+        """Start delivering frames at roughly target_fps."""
+
+    def get_latest_frame(self) -> Optional[np.ndarray]:
+        """Returns the newest frame or None once the source is exhausted."""
+        raise NotImplementedError
+
+    def current_frame(self) -> Optional[np.ndarray]:
+        """Like get_latest_frame, but never waits for the screen to change:
+        returns the previous frame again if nothing changed since."""
+        return self.get_latest_frame()
+
+    def window_title(self) -> Optional[str]:
+        """Returns the title of the focused window while the current frame was taken."""
+        return util.getForegroundWindowTitle()
+
+    def cursor_position(self) -> Optional[tuple]:
+        """Returns the (x, y) position of the mouse cursor within the frame, None if unknown."""
+        return mouse_cursor.cursor_position()
+
+    def watch_focus(self, callback):
+        """Call callback whenever the focused window changes.
+        Returns a function that stops watching, or None if changes can not be watched."""
+        return util.watch_foreground(callback)
+
+    def stop(self):
+        """Release the capture device. May be called from another thread while
+        get_latest_frame waits for a frame, which then returns None. Stopping twice is fine."""
+
+
+class DxcamSource(FrameSource):
+    """Captures the desktop with dxcam.
+
+    dxcam hands out one camera per output, every recording of an output gets the
+    same camera object. The source therefore never starts or stops the camera
+    itself, it grabs frames at the target fps on the recording's own thread and
+    stop() only ends the wait of this source.
+    """
+
+    def __init__(self, output_idx: int = 0):
+        import dxcam  # windows only, imported on demand
+
+        self.camera = dxcam.create(output_idx=output_idx, output_color="RGB")
+        self.interval = 0
+        self._stopped = threading.Event()
+        self._last = None  # the last frame grabbed by this source
+        self.resolution = (self.camera.width, self.camera.height)
+        # top left corner of the output on the virtual desktop, cursor positions are relative to it
+        try:
+            rect = self.camera._output.desc.DesktopCoordinates
+            self.origin = (rect.left, rect.top)
+        except AttributeError:
+            self.origin = (0, 0)
+
+    def start(self, target_fps: int):
+        self.interval = 1 / target_fps
+        self._stopped.clear()
+
+    def get_latest_frame(self):
+        """Waits until the screen changed, like the capture thread of dxcam would, or until stop()."""
+        while not self._stopped.is_set():
+            frame = self.camera.grab()  # None while nothing changed on the output
+            if frame is not None:
+                self._last = frame
+                return frame
+            self._stopped.wait(self.interval)
+        return None
+
+    def current_frame(self):
+        if self._last is None:
+            return self.get_latest_frame()  # nothing to repeat yet
+        if self._stopped.is_set():
+            return None
+        frame = self.camera.grab()
+        if frame is not None:
+            self._last = frame
+        return self._last
+
+    def cursor_position(self):
+        position = mouse_cursor.cursor_position()
+        if position is None:
+            return None
+        return position[0] - self.origin[0], position[1] - self.origin[1]
+
+    def stop(self):
+        self._stopped.set()
+
+
+# An activity script is a list of steps: (activity, frames, window title)
+# idle:    nothing changes
+# caret:   a blinking caret, a few pixels change every half second
+# typing:  text appears line by line
+# scroll:  the whole window scrolls up
+# video:   a large region changes completely every frame
+DEFAULT_SCRIPT = (
+    ("typing", 300, "main.py - Visual Studio Code"),
+    ("caret", 150, "main.py - Visual Studio Code"),
+    ("scroll", 150, "Mozilla Firefox"),
+    ("idle", 150, "Mozilla Firefox"),
+    ("video", 150, "YouTube - Mozilla Firefox"),
+)
+
+
+class SyntheticSource(FrameSource):
+    """Generates frames from an activity script, the same script always gives the same frames.
+
+    Steps are counted in frames, not in seconds, so the output does not depend on
+    how fast the frames are consumed. With realtime=True get_latest_frame is paced
+    to the target fps like a real capture device.
+    """
+
+    def __init__(
+        self,
+        resolution: tuple = (1920, 1080),
+        script=DEFAULT_SCRIPT,
+        loop: bool = True,
+        realtime: bool = False,
+        seed: int = 0,
+    ):
+        self.resolution = tuple(resolution)
+        self.script = [tuple(step) for step in script]
+        self.loop = loop
+        self.realtime = realtime
+        self.free_running = not realtime
+        self.frame_index = 0
+        self.interval = 0
+        self._next_frame_time = 0
+
+        w, h = self.resolution
+        rng = np.random.default_rng(seed)
+        # a desktop-like canvas: flat background with a few textured windows
+        self.canvas = np.full((h, w, 3), 32, dtype=np.uint8)
+        for _ in range(6):
+            x, y = int(rng.integers(0, w // 2)), int(rng.integers(0, h // 2))
+            ww, wh = int(rng.integers(w // 8, w // 2)), int(rng.integers(h // 8, h // 2))
+            self.canvas[y : y + wh, x : x + ww] = rng.integers(0, 256, 3, dtype=np.uint8)
+        self.noise = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        self._title = self.script[0][2] if self.script else None
+
+    def start(self, target_fps: int):
+        self.interval = 1 / target_fps
+        self._next_frame_time = perf_counter()
+
+    def _step(self):
+        """Returns the (activity, frame within the step, title) of the current frame."""
+        total = sum(step[1] for step in self.script)
+        i = self.frame_index
+        if self.loop and total:
+            i %= total
+        elif i >= total:
+            return None
+        for activity, frames, title in self.script:
+            if i < frames:
+                return activity, i, title
+            i -= frames
+
+    def get_latest_frame(self):
+        step = self._step()
+        if step is None:
+            return None
+        activity, n, self._title = step
+        h, w = self.canvas.shape[:2]
+
+        if activity == "caret":
+            x, y = w // 3, h // 3
+            self.canvas[y : y + 20, x : x + 2] = 255 if (n // 15) % 2 else 32
+        elif activity == "typing":
+            line = (n // 10) % max(1, (h - 80) // 24)
+            col = (n % 10) * 12
+            self.canvas[40 + line * 24 : 56 + line * 24, 60 + col : 70 + col] = 230
+        elif activity == "scroll":
+            self.canvas[:] = np.roll(self.canvas, -8, axis=0)
+        elif activity == "video":
+            vh, vw = h // 2, w // 2
+            shift = (n * 7) % vh
+            self.canvas[h // 4 : h // 4 + vh, w // 4 : w // 4 + vw] = np.roll(
+                self.noise[:vh, :vw], shift, axis=0
+            )
+        self.frame_index += 1
+
+        if self.realtime and self.interval:
+            self._next_frame_time += self.interval
+            delay = self._next_frame_time - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        return self.canvas.copy()
+
+    def window_title(self):
+        return self._title
+
+    def cursor_position(self):
+        return None
+
+    def watch_focus(self, callback):
+        return None
+
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".webp", ".qoi")
+
+
+class ReplaySource(FrameSource):
+    """Replays frames from a video file or a folder of images (sorted by name).
+
+    The resolution of a video is probed with ffprobe unless it is passed in.
+    """
+
+    def __init__(
+        self,
+        path,
+        title: str = "Replay",
+        resolution: tuple = None,
+        loop: bool = False,
+        realtime: bool = False,
+    ):
+        self.path = Path(path)
+        self.title = title
+        self.loop = loop
+        self.realtime = realtime
+        self.free_running = not realtime
+        self.interval = 0
+        self._next_frame_time = 0
+        self.process = None
+        self._stopped = False
+        self._reading = threading.Lock()  # held while a frame is read from the video
+
+        if self.path.is_dir():
+            self.images = sorted(p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+            if not self.images:
+                raise FileNotFoundError(f"No images found in {self.path}")
+            self.image_index = 0
+            h, w = self._read_image(self.images[0]).shape[:2]
+            self.resolution = (w, h)
+        elif resolution is not None:
+            self.images = None
+            self.resolution = tuple(resolution)
+        else:
+            import ffmpeg  # probing needs ffprobe next to ffmpeg
+
+            self.images = None
+            probe = ffmpeg.probe(str(self.path))
+            video = next(s for s in probe["streams"] if s["codec_type"] == "video")
+            self.resolution = (int(video["width"]), int(video["height"]))
+
+    @staticmethod
+    def _read_image(path: Path) -> np.ndarray:
+        if path.suffix.lower() == ".qoi":
+            import qoi
+
+            return qoi.read(str(path))[..., :3]
+        from PIL import Image
+
+        with Image.open(path) as image:
+            return np.asarray(image.convert("RGB"))
+
+    def _open_video(self):
+        import ffmpeg
+
+        self.process = (
+            ffmpeg.input(str(self.path))
+            .output("pipe:", format="rawvideo", pix_fmt="rgb24")
+            .global_args("-loglevel", "error")
+            .run_async(pipe_stdout=True)
+        )
+
+    def start(self, target_fps: int):
+        self.interval = 1 / target_fps
+        self._next_frame_time = perf_counter()
+        self._stopped = False
+        if self.images is None:
+            self._open_video()
+
+    def _next_frame(self):
+        if self.images is not None:
+            if self.image_index >= len(self.images):
+                if not self.loop:
+                    return None
+                self.image_index = 0
+            frame = self._read_image(self.images[self.image_index])
+            self.image_index += 1
+            return frame
+
+        w, h = self.resolution
+        frame_size = w * h * 3
+        with self._reading:
+            if self.process is None:
+                return None  # stopped
+            data = self.process.stdout.read(frame_size)
+            if len(data) < frame_size:
+                self._close_video()
+                if not self.loop or self._stopped:
+                    return None
+                self._open_video()
+                data = self.process.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    return None
+        return np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)
+
+    def get_latest_frame(self):
+        frame = self._next_frame()
+        if frame is not None and self.realtime and self.interval:
+            self._next_frame_time += self.interval
+            delay = self._next_frame_time - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        return frame
+
+    def window_title(self):
+        return self.title
+
+    def cursor_position(self):
+        return None
+
+    def watch_focus(self, callback):
+        return None
+
+    def _close_video(self):
+        self.process.stdout.close()
+        self.process.terminate()
+        self.process.wait()
+        self.process = None
+
+    def stop(self):
+        self._stopped = True
+        process = self.process
+        if process is not None:
+            process.terminate()  # ends a read that waits for the next frame on another thread
+        with self._reading:
+            if self.process is not None:
+                self._close_video()
+
+
+SOURCES = {
+    "dxcam": DxcamSource,
+    "synthetic": SyntheticSource,
+    "replay": ReplaySource,
+}
+
+
+def open_source(kind: str = None, **kwargs) -> FrameSource:
+    """Create the frame source named in settings.FRAME_SOURCE unless another kind is given."""
+    kind = kind or settings.FRAME_SOURCE
+    if kind not in SOURCES:
+        raise ValueError(f"Unknown frame source: {kind}")
+    if kind == "replay":
+        kwargs.setdefault("path", settings.REPLAY_PATH)
+    return SOURCES[kind](**kwargs)
+
+
+def open_sources(kind: str = None, outputs=None) -> list:
+    """Create one frame source per output (monitor) in settings.CAPTURE_OUTPUTS unless outputs are given.
+    Outputs is a list of output indices or "all"."""
+    kind = kind or settings.FRAME_SOURCE
+    outputs = settings.CAPTURE_OUTPUTS if outputs is None else outputs
+    if kind == "replay":
+        return [open_source(kind)]  # a replay is a single screen
+
+    if outputs == "all":
+        outputs = range(len(util.get_monitors())) if kind == "dxcam" else [0]
+    if kind == "synthetic":
+        # every screen plays the script from a different step so they change at different times
+        script = list(DEFAULT_SCRIPT)
+        return [
+            SyntheticSource(script=script[i % len(script) :] + script[: i % len(script)], seed=i)
+            for i in outputs
+        ]
+    return [open_source(kind, output_idx=i) for i in outputs]
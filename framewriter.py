@@ -0,0 +1,107 @@
+"""Decouples frame capture from the encoder.
+
+Captured frames are copied into a ring of preallocated buffers. A dedicated
+writer thread pushes the filled buffers into the ffmpeg pipe straight from
+buffer memory, so an encoder hiccup only fills the ring instead of stalling
+the capture loop. Capture only blocks once every slot of the ring is waiting
+to be written.
+"""
+
+import threading as tr
+from time import perf_counter
+
+import numpy as np
+
+
+class FrameWriter:
+    def __init__(self, pipe, shape: tuple, slots: int = 8):
+        """
+        Args:
+            pipe: A writable binary pipe, usually the stdin of an ffmpeg process.
+            shape (tuple): Shape of every frame, (height, width, channels).
+            slots (int): Number of frames the ring can hold.
+        """
+        self.pipe = pipe
+        self.ring = [np.empty(shape, dtype=np.uint8) for _ in range(max(2, slots))]
+        self.head = 0  # next slot to fill
+        self.tail = 0  # next slot to write
+        self.filled = 0
+        self.closing = False
+        self.error = None
+
+        self.frames_written = 0
+        self.high_water = 0
+        self.stall_seconds = 0.0
+
+        self.cond = tr.Condition()
+        self.thread = tr.Thread(target=self._write_thread, name="Writer Thread", daemon=True)
+        self.thread.start()
+
+    def put(self, frame: np.ndarray) -> bool:
+        """Queue a copy of the frame for writing, blocks while the ring is full.
+        Returns False if the pipe is broken."""
+        with self.cond:
+            if self.filled == len(self.ring) and self.error is None:
+                stalled = perf_counter()
+                while self.filled == len(self.ring) and self.error is None:
+                    self.cond.wait()
+                self.stall_seconds += perf_counter() - stalled
+            if self.error is not None:
+                return False
+            slot = self.ring[self.head]
+
+        # the writer thread never reads a slot before it is marked filled
+        np.copyto(slot, frame)
+
+        with self.cond:
+            self.head = (self.head + 1) % len(self.ring)
+            self.filled += 1
+            self.high_water = max(self.high_water, self.filled)
+            self.cond.notify_all()
+        return True
+
+    def _write_thread(self):
+        while True:
+            with self.cond:
+                while self.filled == 0 and not self.closing:
+                    self.cond.wait()
+                if self.filled == 0:
+                    break  # closing and drained
+                slot = self.ring[self.tail]
+
+            try:
+                self.pipe.write(slot.data)
+            except (OSError, ValueError) as e:
+                with self.cond:
+                    self.error = e
+                    self.cond.notify_all()
+                break
+
+            with self.cond:
+                self.tail = (self.tail + 1) % len(self.ring)
+                self.filled -= 1
+                self.frames_written += 1
+                self.cond.notify_all()
+
+    def close(self):
+        """Write the remaining frames and close the pipe.
+        A failed write or close is kept in error, the caller decides what it means."""
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join()
+        try:
+            self.pipe.close()
+        except OSError as e:
+            if self.error is None:
+                self.error = e
+
+    def stats(self) -> dict:
+        """Occupancy of the ring and the time capture spent waiting for a free slot."""
+        return {
+            "slots": len(self.ring),
+            "occupancy": self.filled,
+            "high_water": self.high_water,
+            "frames_written": self.frames_written,
+            "stall_seconds": round(self.stall_seconds, 3),
+        }
@@ -1 +1 @@
-var app=function(){"use strict";function t(){}function e(t,e){for(const n in e)t[n]=e[n];return t}function n(t){return t()}function r(){return Object.create(null)}function o(t){t.forEach(n)}function l(t){return"function"==typeof t}function c(t,e){return t!=t?e==e:t!==e||t&&"object"==typeof t||"function"==typeof t}let s,i;function u(t,e){return s||(s=document.createElement("a")),s.href=e,t===s.href}function a(e,n,r){e.$$.on_destroy.push(function(e,...n){if(null==e)return t;const r=e.subscribe(...n);return r.unsubscribe?()=>r.unsubscribe():r}(n,r))}function f(t,e){const n={};e=new Set(e);for(const r in t)e.has(r)||"$"===r[0]||(n[r]=t[r]);return n}function d(t,e){t.appendChild(e)}function h(t,e,n){t.insertBefore(e,n||null)}function g(t){t.parentNode&&t.parentNode.removeChild(t)}function p(t,e){for(let n=0;n<t.length;n+=1)t[n]&&t[n].d(e)}function m(t){return document.createElement(t)}function $(t){return document.createElementNS("http://www.w3.org/2000/svg",t)}function b(t){return document.createTextNode(t)}function v(){return b(" ")}function w(){return b("")}function y(t,e,n,r){return t.addEventListener(e,n,r),()=>t.removeEventListener(e,n,r)}function x(t,e,n){null==n?t.removeAttribute(e):t.getAttribute(e)!==n&&t.setAttribute(e,n)}function z(t,e){for(const n in e)x(t,n,e[n])}function _(t,e){e=""+e,t.data!==e&&(t.data=e)}function M(t){i=t}const H=[],S=[];let E=[];const k=[],L=Promise.resolve();let j=!1;function C(t){E.push(t)}const O=new Set;let T=0;function V(){if(0!==T)return;const t=i;do{try{for(;T<H.length;){const t=H[T];T++,M(t),B(t.$$)}}catch(t){throw H.length=0,T=0,t}for(M(null),H.length=0,T=0;S.length;)S.pop()();for(let t=0;t<E.length;t+=1){const e=E[t];O.has(e)||(O.add(e),e())}E.length=0}while(H.length);for(;k.length;)k.pop()();j=!1,O.clear(),M(t)}function B(t){if(null!==t.fragment){t.update(),o(t.before_update);const e=t.dirty;t.dirty=[-1],t.fragment&&t.fragment.p(t.ctx,e),t.after_update.forEach(C)}}const N=new Set;function A(t,e){t&&t.i&&(N.delete(t),t.i(e))}function P(t,e,n,r){if(t&&t.o){if(N.has(t))return;N.add(t),undefined.c.push((()=>{N.delete(t),r&&(n&&t.d(1),r())})),t.o(e)}else r&&r()}function R(t,e){const n={},r={},o={$$scope:1};let l=t.length;for(;l--;){const c=t[l],s=e[l];if(s){for(const t in c)t in s||(r[t]=1);for(const t in s)o[t]||(n[t]=s[t],o[t]=1);t[l]=s}else for(const t in c)o[t]=1}for(const t in r)t in n||(n[t]=void 0);return n}function q(t){t&&t.c()}function D(t,e,r,c){const{fragment:s,after_update:i}=t.$$;s&&s.m(e,r),c||C((()=>{const e=t.$$.on_mount.map(n).filter(l);t.$$.on_destroy?t.$$.on_destroy.push(...e):o(e),t.$$.on_mount=[]})),i.forEach(C)}function I(t,e){const n=t.$$;null!==n.fragment&&(!function(t){const e=[],n=[];E.forEach((r=>-1===t.indexOf(r)?e.push(r):n.push(r))),n.forEach((t=>t())),E=e}(n.after_update),o(n.on_destroy),n.fragment&&n.fragment.d(e),n.on_destroy=n.fragment=null,n.ctx=[])}function G(t,e){-1===t.$$.dirty[0]&&(H.push(t),j||(j=!0,L.then(V)),t.$$.dirty.fill(0)),t.$$.dirty[e/31|0]|=1<<e%31}function F(e,n,l,c,s,u,a,f=[-1]){const d=i;M(e);const h=e.$$={fragment:null,ctx:[],props:u,update:t,not_equal:s,bound:r(),on_mount:[],on_destroy:[],on_disconnect:[],before_update:[],after_update:[],context:new Map(n.context||(d?d.$$.context:[])),callbacks:r(),dirty:f,skip_bound:!1,root:n.target||d.$$.root};a&&a(h.root);let p=!1;if(h.ctx=l?l(e,n.props||{},((t,n,...r)=>{const o=r.length?r[0]:n;return h.ctx&&s(h.ctx[t],h.ctx[t]=o)&&(!h.skip_bound&&h.bound[t]&&h.bound[t](o),p&&G(e,t)),n})):[],h.update(),p=!0,o(h.before_update),h.fragment=!!c&&c(h.ctx),n.target){if(n.hydrate){const t=function(t){return Array.from(t.childNodes)}(n.target);h.fragment&&h.fragment.l(t),t.forEach(g)}else h.fragment&&h.fragment.c();n.intro&&A(e.$$.fragment),D(e,n.target,n.anchor,n.customElement),V()}M(d)}class J{$destroy(){I(this,1),this.$destroy=t}$on(e,n){if(!l(n))return t;const r=this.$$.callbacks[e]||(this.$$.callbacks[e]=[]);return r.push(n),()=>{const t=r.indexOf(n);-1!==t&&r.splice(t,1)}}$set(t){var e;this.$$set&&(e=t,0!==Object.keys(e).length)&&(this.$$.skip_bound=!0,this.$$set(t),this.$$.skip_bound=!1)}}function K(t,e,n){const r=t.slice();return r[5]=e[n],r}function Q(t,e,n){const r=t.slice();return r[5]=e[n],r}function U(t,e,n){const r=t.slice();return r[5]=e[n],r}function W(t,e,n){const r=t.slice();return r[5]=e[n],r}function X(t,e,n){const r=t.slice();return r[5]=e[n],r}function Y(t,e,n){const r=t.slice();return r[5]=e[n],r}function Z(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("path"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function tt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("rect"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function et(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("circle"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function nt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("polygon"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function rt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("polyline"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function ot(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("line"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function lt(n){let r,o,l,c,s,i,u=n[1]?.path??[],a=[];for(let t=0;t<u.length;t+=1)a[t]=Z(Y(n,u,t));let f=n[1]?.rect??[],m=[];for(let t=0;t<f.length;t+=1)m[t]=tt(X(n,f,t));let b=n[1]?.circle??[],v=[];for(let t=0;t<b.length;t+=1)v[t]=et(W(n,b,t));let y=n[1]?.polygon??[],x=[];for(let t=0;t<y.length;t+=1)x[t]=nt(U(n,y,t));let _=n[1]?.polyline??[],M=[];for(let t=0;t<_.length;t+=1)M[t]=rt(Q(n,_,t));let H=n[1]?.line??[],S=[];for(let t=0;t<H.length;t+=1)S[t]=ot(K(n,H,t));let E=[n[1]?.a,{xmlns:"http://www.w3.org/2000/svg"},{width:n[0]},{height:n[0]},n[2]],k={};for(let t=0;t<E.length;t+=1)k=e(k,E[t]);return{c(){r=$("svg");for(let t=0;t<a.length;t+=1)a[t].c();o=w();for(let t=0;t<m.length;t+=1)m[t].c();l=w();for(let t=0;t<v.length;t+=1)v[t].c();c=w();for(let t=0;t<x.length;t+=1)x[t].c();s=w();for(let t=0;t<M.length;t+=1)M[t].c();i=w();for(let t=0;t<S.length;t+=1)S[t].c();z(r,k)},m(t,e){h(t,r,e);for(let t=0;t<a.length;t+=1)a[t]&&a[t].m(r,null);d(r,o);for(let t=0;t<m.length;t+=1)m[t]&&m[t].m(r,null);d(r,l);for(let t=0;t<v.length;t+=1)v[t]&&v[t].m(r,null);d(r,c);for(let t=0;t<x.length;t+=1)x[t]&&x[t].m(r,null);d(r,s);for(let t=0;t<M.length;t+=1)M[t]&&M[t].m(r,null);d(r,i);for(let t=0;t<S.length;t+=1)S[t]&&S[t].m(r,null)},p(t,[e]){if(2&e){let n;for(u=t[1]?.path??[],n=0;n<u.length;n+=1){const l=Y(t,u,n);a[n]?a[n].p(l,e):(a[n]=Z(l),a[n].c(),a[n].m(r,o))}for(;n<a.length;n+=1)a[n].d(1);a.length=u.length}if(2&e){let n;for(f=t[1]?.rect??[],n=0;n<f.length;n+=1){const o=X(t,f,n);m[n]?m[n].p(o,e):(m[n]=tt(o),m[n].c(),m[n].m(r,l))}for(;n<m.length;n+=1)m[n].d(1);m.length=f.length}if(2&e){let n;for(b=t[1]?.circle??[],n=0;n<b.length;n+=1){const o=W(t,b,n);v[n]?v[n].p(o,e):(v[n]=et(o),v[n].c(),v[n].m(r,c))}for(;n<v.length;n+=1)v[n].d(1);v.length=b.length}if(2&e){let n;for(y=t[1]?.polygon??[],n=0;n<y.length;n+=1){const o=U(t,y,n);x[n]?x[n].p(o,e):(x[n]=nt(o),x[n].c(),x[n].m(r,s))}for(;n<x.length;n+=1)x[n].d(1);x.length=y.length}if(2&e){let n;for(_=t[1]?.polyline??[],n=0;n<_.length;n+=1){const o=Q(t,_,n);M[n]?M[n].p(o,e):(M[n]=rt(o),M[n].c(),M[n].m(r,i))}for(;n<M.length;n+=1)M[n].d(1);M.length=_.length}if(2&e){let n;for(H=t[1]?.line??[],n=0;n<H.length;n+=1){const o=K(t,H,n);S[n]?S[n].p(o,e):(S[n]=ot(o),S[n].c(),S[n].m(r,null))}for(;n<S.length;n+=1)S[n].d(1);S.length=H.length}z(r,k=R(E,[2&e&&t[1]?.a,{xmlns:"http://www.w3.org/2000/svg"},1&e&&{width:t[0]},1&e&&{height:t[0]},4&e&&t[2]]))},i:t,o:t,d(t){t&&g(r),p(a,t),p(m,t),p(v,t),p(x,t),p(M,t),p(S,t)}}}function ct(t,n,r){let o;const l=["src","size","theme"];let c=f(n,l),{src:s}=n,{size:i="100%"}=n,{theme:u="default"}=n;if("100%"!==i&&"x"!=i.slice(-1)&&"m"!=i.slice(-1)&&"%"!=i.slice(-1))try{i=parseInt(i)+"px"}catch(t){i="100%"}return t.$$set=t=>{n=e(e({},n),function(t){const e={};for(const n in t)"$"!==n[0]&&(e[n]=t[n]);return e}(t)),r(2,c=f(n,l)),"src"in t&&r(3,s=t.src),"size"in t&&r(0,i=t.size),"theme"in t&&r(4,u=t.theme)},t.$$.update=()=>{24&t.$$.dirty&&r(1,o=s?.[u]??s?.default)},[i,o,c,s,u]}class st extends J{constructor(t){super(),F(this,t,ct,lt,c,{src:3,size:0,theme:4})}}const it={default:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M13 21V11h8v10h-8zM3 13V3h8v10H3zm6-2V5H5v6h4zM3 21v-6h8v6H3zm2-2h4v-2H5v2zm10 0h4v-6h-4v6zM13 3h8v6h-8V3zm2 2v2h4V5h-4z"}]},solid:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M3 13h8V3H3v10zm0 8h8v-6H3v6zm10 0h8V11h-8v10zm0-18v6h8V3h-8z"}]}},ut={default:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M12 1l9.5 5.5v11L12 23l-9.5-5.5v-11L12 1zm0 2.311L4.5 7.653v8.694l7.5 4.342 7.5-4.342V7.653L12 3.311zM12 16a4 4 0 1 1 0-8 4 4 0 0 1 0 8zm0-2a2 2 0 1 0 0-4 2 2 0 0 0 0 4z"}]},solid:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M12 1l9.5 5.5v11L12 23l-9.5-5.5v-11L12 1zm0 14a3 3 0 1 0 0-6 3 3 0 0 0 0 6z"}]}},at=[];const ft="http://localhost:5000/api";const dt=function(e,n=t){let r;const o=new Set;function l(t){if(c(e,t)&&(e=t,r)){const t=!at.length;for(const t of o)t[1](),at.push(t,e);if(t){for(let t=0;t<at.length;t+=2)at[t][0](at[t+1]);at.length=0}}}return{set:l,update:function(t){l(t(e))},subscribe:function(c,s=t){const i=[c,s];return o.add(i),1===o.size&&(r=n(l)||t),c(e),()=>{o.delete(i),0===o.size&&r&&(r(),r=null)}}}}({});async function ht(){const t=await async function(){const t=await fetch(`${ft}/status`,{method:"GET",cache:"no-cache"}),e=await t.json();return gt=!0,e}();dt.set(t)}let gt=!1;function pt(t,e,n){const r=t.slice();return r[5]=e[n][0],r[6]=e[n][1],r}function mt(t){let e,n,r,o,l,c=t[0].status+"";return{c(){e=m("tr"),n=m("td"),n.textContent="Status",r=v(),o=m("td"),l=b(c)},m(t,c){h(t,e,c),d(e,n),d(e,r),d(e,o),d(o,l)},p(t,e){1&e&&c!==(c=t[0].status+"")&&_(l,c)},d(t){t&&g(e)}}}function $t(t){let e,n=Object.entries(t[0]),r=[];for(let e=0;e<n.length;e+=1)r[e]=bt(pt(t,n,e));return{c(){for(let t=0;t<r.length;t+=1)r[t].c();e=w()},m(t,n){for(let e=0;e<r.length;e+=1)r[e]&&r[e].m(t,n);h(t,e,n)},p(t,o){if(1&o){let l;for(n=Object.entries(t[0]),l=0;l<n.length;l+=1){const c=pt(t,n,l);r[l]?r[l].p(c,o):(r[l]=bt(c),r[l].c(),r[l].m(e.parentNode,e))}for(;l<r.length;l+=1)r[l].d(1);r.length=n.length}},d(t){p(r,t),t&&g(e)}}}function bt(t){let e,n,r,o,l,c,s,i=t[5]+"",u=t[6]+"";return{c(){e=m("tr"),n=m("td"),r=b(i),o=v(),l=m("td"),c=b(u),s=v()},m(t,i){h(t,e,i),d(e,n),d(n,r),d(e,o),d(e,l),d(l,c),d(e,s)},p(t,e){1&e&&i!==(i=t[5]+"")&&_(r,i),1&e&&u!==(u=t[6]+"")&&_(c,u)},d(t){t&&g(e)}}}function vt(t){let e,n,r,l,c,s,i,u,a,f,p,$,w,z,_,M,H,S,E,k,L,j,C,O,T,V,B,N,R,G,F,J,K,Q,U,W,X;function Y(t,e){return"stopped"!=t[0]?.status?$t:mt}s=new st({props:{src:it,class:"w-5 h-5 mr-2"}}),$=new st({props:{src:ut,class:"w-5 h-5 mr-2"}});let Z=Y(t),tt=Z(t);return{c(){e=m("ul"),n=m("li"),n.innerHTML="<span>Menu</span>",r=v(),l=m("li"),c=m("a"),q(s.$$.fragment),i=v(),u=m("span"),u.textContent="Dashboard",a=v(),f=m("li"),p=m("a"),q($.$$.fragment),w=v(),z=m("span"),z.textContent="Settings",_=v(),M=m("li"),M.innerHTML="<span>Actions</span>",H=v(),S=m("div"),E=m("button"),k=b("Start"),L=v(),j=m("button"),C=b("Pause"),T=v(),V=m("button"),B=b("Stop"),R=v(),G=m("li"),G.innerHTML="<span>Status</span>",F=v(),J=m("div"),K=m("table"),Q=m("tbody"),tt.c(),x(n,"class","menu-title"),x(c,"href","#"),x(c,"class","menu-item"),x(p,"href","#"),x(p,"class","menu-item"),x(M,"class","menu-title mt-6"),x(E,"class","btn bg-green-500 hover:bg-green-600 text-white rounded-btn"),E.disabled=t[1],x(j,"class","btn bg-orange-500 hover:bg-orange-600 text-white rounded-btn"),j.disabled=O=!t[1],x(V,"class","btn bg-red-600 hover:bg-red-700 text-white rounded-btn"),V.disabled=N=!t[1],x(S,"class","btn-group flex justify-center"),x(G,"class","menu-title mt-6"),x(K,"class","table table-compact w-full"),x(J,"class","overflow-x-auto"),x(e,"class","menu p-4 w-80 bg-base-300 text-base-content")},m(o,g){h(o,e,g),d(e,n),d(e,r),d(e,l),d(l,c),D(s,c,null),d(c,i),d(c,u),d(e,a),d(e,f),d(f,p),D($,p,null),d(p,w),d(p,z),d(e,_),d(e,M),d(e,H),d(e,S),d(S,E),d(E,k),d(S,L),d(S,j),d(j,C),d(S,T),d(S,V),d(V,B),d(e,R),d(e,G),d(e,F),d(e,J),d(J,K),d(K,Q),tt.m(Q,null),U=!0,W||(X=[y(E,"click",t[2]),y(j,"click",t[3]),y(V,"click",t[4])],W=!0)},p(t,[e]){(!U||2&e)&&(E.disabled=t[1]),(!U||2&e&&O!==(O=!t[1]))&&(j.disabled=O),(!U||2&e&&N!==(N=!t[1]))&&(V.disabled=N),Z===(Z=Y(t))&&tt?tt.p(t,e):(tt.d(1),tt=Z(t),tt&&(tt.c(),tt.m(Q,null)))},i(t){U||(A(s.$$.fragment,t),A($.$$.fragment,t),U=!0)},o(t){P(s.$$.fragment,t),P($.$$.fragment,t),U=!1},d(t){t&&g(e),I(s),I($),tt.d(),W=!1,o(X)}}}function wt(t,e,n){let r;a(t,dt,(t=>n(0,r=t)));let o=!1;return t.$$.update=()=>{1&t.$$.dirty&&n(1,o="stopped"!=r.status&&"paused"!=r.status)},[r,o,()=>{!async function(){await fetch(`${ft}/controls/start`,{method:"POST"})}()},()=>{!async function(){await fetch(`${ft}/controls/pause`,{method:"POST"})}()},()=>{!async function(){await fetch(`${ft}/controls/stop`,{method:"POST"})}()}]}ht(),setInterval((()=>{gt||ht(),gt=!1}),5e3);class yt extends J{constructor(t){super(),F(this,t,wt,vt,c,{})}}function xt(t,e,n){const r=t.slice();return r[1]=e[n],r}function zt(t){let e,n,r,o,l,c,s,i,a,f,p,$,w,y,z,M,H=t[1].title+"",S=t[1].duration+"",E=t[1].date+"";return{c(){e=m("div"),n=m("figure"),r=m("img"),l=v(),c=m("div"),s=m("h2"),i=b(H),a=v(),f=m("div"),p=m("div"),$=b(S),w=v(),y=m("div"),z=b(E),M=v(),u(r.src,o=t[1].thumbnail)||x(r,"src",o),x(r,"alt","thumbnail"),x(s,"class","card-title first-letter:uppercase"),x(p,"class","badge badge-outline"),x(y,"class","badge badge-outline"),x(f,"class","card-actions justify-end"),x(c,"class","card-body"),x(e,"class","card card-compact bg-base-300 shadow-xl hover:cursor-pointer hover:scale-105 transition-transform")},m(t,o){h(t,e,o),d(e,n),d(n,r),d(e,l),d(e,c),d(c,s),d(s,i),d(c,a),d(c,f),d(f,p),d(p,$),d(f,w),d(f,y),d(y,z),d(e,M)},p(t,e){1&e&&!u(r.src,o=t[1].thumbnail)&&x(r,"src",o),1&e&&H!==(H=t[1].title+"")&&_(i,H),1&e&&S!==(S=t[1].duration+"")&&_($,S),1&e&&E!==(E=t[1].date+"")&&_(z,E)},d(t){t&&g(e)}}}function _t(e){let n,r,o,l,c=e[0],s=[];for(let t=0;t<c.length;t+=1)s[t]=zt(xt(e,c,t));return{c(){n=m("div"),r=m("div"),r.innerHTML='<h1 class="text-3xl font-bold">Dashboard</h1>',o=v(),l=m("div");for(let t=0;t<s.length;t+=1)s[t].c();x(r,"class","flex justify-between items-center"),x(l,"class","grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4 mt-6"),x(n,"class","p-6 pb-16")},m(t,e){h(t,n,e),d(n,r),d(n,o),d(n,l);for(let t=0;t<s.length;t+=1)s[t]&&s[t].m(l,null)},p(t,[e]){if(1&e){let n;for(c=t[0],n=0;n<c.length;n+=1){const r=xt(t,c,n);s[n]?s[n].p(r,e):(s[n]=zt(r),s[n].c(),s[n].m(l,null))}for(;n<s.length;n+=1)s[n].d(1);s.length=c.length}},i:t,o:t,d(t){t&&g(n),p(s,t)}}}function Mt(t,e,n){let{allRecordings:r=[]}=e;return async function(){return(await fetch(`${ft}/media/recordings`)).json()}().then((t=>{n(0,r=t),console.log(t)})),t.$$set=t=>{"allRecordings"in t&&n(0,r=t.allRecordings)},[r]}class Ht extends J{constructor(t){super(),F(this,t,Mt,_t,c,{allRecordings:0})}}function St(e){let n,r,o,l,c,s,i,u,a,f,p;return c=new Ht({}),f=new yt({}),{c(){n=m("div"),r=m("input"),o=v(),l=m("div"),q(c.$$.fragment),s=v(),i=m("div"),u=m("label"),a=v(),q(f.$$.fragment),x(r,"id","sideBtn"),x(r,"type","checkbox"),x(r,"class","drawer-toggle"),x(l,"class","drawer-content"),x(u,"for","sideBtn"),x(u,"class","drawer-overlay"),x(i,"class","drawer-side grid-flow-dense"),x(n,"class","drawer drawer-mobile")},m(t,e){h(t,n,e),d(n,r),d(n,o),d(n,l),D(c,l,null),d(n,s),d(n,i),d(i,u),d(i,a),D(f,i,null),p=!0},p:t,i(t){p||(A(c.$$.fragment,t),A(f.$$.fragment,t),p=!0)},o(t){P(c.$$.fragment,t),P(f.$$.fragment,t),p=!1},d(t){t&&g(n),I(c),I(f)}}}return new class extends J{constructor(t){super(),F(this,t,null,St,c,{})}}({target:document.querySelector("body")})}();
+var app=function(){"use strict";function t(){}function e(t,e){for(const n in e)t[n]=e[n];return t}function n(t){return t()}function r(){return Object.create(null)}function o(t){t.forEach(n)}function l(t){return"function"==typeof t}function c(t,e){return t!=t?e==e:t!==e||t&&"object"==typeof t||"function"==typeof t}let s,i;function u(t,e){return s||(s=document.createElement("a")),s.href=e,t===s.href}function a(e,n,r){e.$$.on_destroy.push(function(e,...n){if(null==e)return t;const r=e.subscribe(...n);return r.unsubscribe?()=>r.unsubscribe():r}(n,r))}function f(t,e){const n={};e=new Set(e);for(const r in t)e.has(r)||"$"===r[0]||(n[r]=t[r]);return n}function d(t,e){t.appendChild(e)}function h(t,e,n){t.insertBefore(e,n||null)}function g(t){t.parentNode&&t.parentNode.removeChild(t)}function p(t,e){for(let n=0;n<t.length;n+=1)t[n]&&t[n].d(e)}function m(t){return document.createElement(t)}function $(t){return document.createElementNS("http://www.w3.org/2000/svg",t)}function b(t){return document.createTextNode(t)}function v(){return b(" ")}function w(){return b("")}function y(t,e,n,r){return t.addEventListener(e,n,r),()=>t.removeEventListener(e,n,r)}function x(t,e,n){null==n?t.removeAttribute(e):t.getAttribute(e)!==n&&t.setAttribute(e,n)}function z(t,e){for(const n in e)x(t,n,e[n])}function _(t,e){e=""+e,t.data!==e&&(t.data=e)}function M(t){i=t}const H=[],S=[];let E=[];const k=[],L=Promise.resolve();let j=!1;function C(t){E.push(t)}const O=new Set;let T=0;function V(){if(0!==T)return;const t=i;do{try{for(;T<H.length;){const t=H[T];T++,M(t),B(t.$$)}}catch(t){throw H.length=0,T=0,t}for(M(null),H.length=0,T=0;S.length;)S.pop()();for(let t=0;t<E.length;t+=1){const e=E[t];O.has(e)||(O.add(e),e())}E.length=0}while(H.length);for(;k.length;)k.pop()();j=!1,O.clear(),M(t)}function B(t){if(null!==t.fragment){t.update(),o(t.before_update);const e=t.dirty;t.dirty=[-1],t.fragment&&t.fragment.p(t.ctx,e),t.after_update.forEach(C)}}const N=new Set;function A(t,e){t&&t.i&&(N.delete(t),t.i(e))}function P(t,e,n,r){if(t&&t.o){if(N.has(t))return;N.add(t),undefined.c.push((()=>{N.delete(t),r&&(n&&t.d(1),r())})),t.o(e)}else r&&r()}function R(t,e){const n={},r={},o={$$scope:1};let l=t.length;for(;l--;){const c=t[l],s=e[l];if(s){for(const t in c)t in s||(r[t]=1);for(const t in s)o[t]||(n[t]=s[t],o[t]=1);t[l]=s}else for(const t in c)o[t]=1}for(const t in r)t in n||(n[t]=void 0);return n}function q(t){t&&t.c()}function D(t,e,r,c){const{fragment:s,after_update:i}=t.$$;s&&s.m(e,r),c||C((()=>{const e=t.$$.on_mount.map(n).filter(l);t.$$.on_destroy?t.$$.on_destroy.push(...e):o(e),t.$$.on_mount=[]})),i.forEach(C)}function I(t,e){const n=t.$$;null!==n.fragment&&(!function(t){const e=[],n=[];E.forEach((r=>-1===t.indexOf(r)?e.push(r):n.push(r))),n.forEach((t=>t())),E=e}(n.after_update),o(n.on_destroy),n.fragment&&n.fragment.d(e),n.on_destroy=n.fragment=null,n.ctx=[])}function G(t,e){-1===t.$$.dirty[0]&&(H.push(t),j||(j=!0,L.then(V)),t.$$.dirty.fill(0)),t.$$.dirty[e/31|0]|=1<<e%31}function F(e,n,l,c,s,u,a,f=[-1]){const d=i;M(e);const h=e.$$={fragment:null,ctx:[],props:u,update:t,not_equal:s,bound:r(),on_mount:[],on_destroy:[],on_disconnect:[],before_update:[],after_update:[],context:new Map(n.context||(d?d.$$.context:[])),callbacks:r(),dirty:f,skip_bound:!1,root:n.target||d.$$.root};a&&a(h.root);let p=!1;if(h.ctx=l?l(e,n.props||{},((t,n,...r)=>{const o=r.length?r[0]:n;return h.ctx&&s(h.ctx[t],h.ctx[t]=o)&&(!h.skip_bound&&h.bound[t]&&h.bound[t](o),p&&G(e,t)),n})):[],h.update(),p=!0,o(h.before_update),h.fragment=!!c&&c(h.ctx),n.target){if(n.hydrate){const t=function(t){return Array.from(t.childNodes)}(n.target);h.fragment&&h.fragment.l(t),t.forEach(g)}else h.fragment&&h.fragment.c();n.intro&&A(e.$$.fragment),D(e,n.target,n.anchor,n.customElement),V()}M(d)}class J{$destroy(){I(this,1),this.$destroy=t}$on(e,n){if(!l(n))return t;const r=this.$$.callbacks[e]||(this.$$.callbacks[e]=[]);return r.push(n),()=>{const t=r.indexOf(n);-1!==t&&r.splice(t,1)}}$set(t){var e;this.$$set&&(e=t,0!==Object.keys(e).length)&&(this.$$.skip_bound=!0,this.$$set(t),this.$$.skip_bound=!1)}}function K(t,e,n){const r=t.slice();return r[5]=e[n],r}function Q(t,e,n){const r=t.slice();return r[5]=e[n],r}function U(t,e,n){const r=t.slice();return r[5]=e[n],r}function W(t,e,n){const r=t.slice();return r[5]=e[n],r}function X(t,e,n){const r=t.slice();return r[5]=e[n],r}function Y(t,e,n){const r=t.slice();return r[5]=e[n],r}function Z(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("path"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function tt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("rect"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function et(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("circle"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function nt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("polygon"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function rt(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("polyline"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function ot(t){let n,r=[t[5]],o={};for(let t=0;t<r.length;t+=1)o=e(o,r[t]);return{c(){n=$("line"),z(n,o)},m(t,e){h(t,n,e)},p(t,e){z(n,o=R(r,[2&e&&t[5]]))},d(t){t&&g(n)}}}function lt(n){let r,o,l,c,s,i,u=n[1]?.path??[],a=[];for(let t=0;t<u.length;t+=1)a[t]=Z(Y(n,u,t));let f=n[1]?.rect??[],m=[];for(let t=0;t<f.length;t+=1)m[t]=tt(X(n,f,t));let b=n[1]?.circle??[],v=[];for(let t=0;t<b.length;t+=1)v[t]=et(W(n,b,t));let y=n[1]?.polygon??[],x=[];for(let t=0;t<y.length;t+=1)x[t]=nt(U(n,y,t));let _=n[1]?.polyline??[],M=[];for(let t=0;t<_.length;t+=1)M[t]=rt(Q(n,_,t));let H=n[1]?.line??[],S=[];for(let t=0;t<H.length;t+=1)S[t]=ot(K(n,H,t));let E=[n[1]?.a,{xmlns:"http://www.w3.org/2000/svg"},{width:n[0]},{height:n[0]},n[2]],k={};for(let t=0;t<E.length;t+=1)k=e(k,E[t]);return{c(){r=$("svg");for(let t=0;t<a.length;t+=1)a[t].c();o=w();for(let t=0;t<m.length;t+=1)m[t].c();l=w();for(let t=0;t<v.length;t+=1)v[t].c();c=w();for(let t=0;t<x.length;t+=1)x[t].c();s=w();for(let t=0;t<M.length;t+=1)M[t].c();i=w();for(let t=0;t<S.length;t+=1)S[t].c();z(r,k)},m(t,e){h(t,r,e);for(let t=0;t<a.length;t+=1)a[t]&&a[t].m(r,null);d(r,o);for(let t=0;t<m.length;t+=1)m[t]&&m[t].m(r,null);d(r,l);for(let t=0;t<v.length;t+=1)v[t]&&v[t].m(r,null);d(r,c);for(let t=0;t<x.length;t+=1)x[t]&&x[t].m(r,null);d(r,s);for(let t=0;t<M.length;t+=1)M[t]&&M[t].m(r,null);d(r,i);for(let t=0;t<S.length;t+=1)S[t]&&S[t].m(r,null)},p(t,[e]){if(2&e){let n;for(u=t[1]?.path??[],n=0;n<u.length;n+=1){const l=Y(t,u,n);a[n]?a[n].p(l,e):(a[n]=Z(l),a[n].c(),a[n].m(r,o))}for(;n<a.length;n+=1)a[n].d(1);a.length=u.length}if(2&e){let n;for(f=t[1]?.rect??[],n=0;n<f.length;n+=1){const o=X(t,f,n);m[n]?m[n].p(o,e):(m[n]=tt(o),m[n].c(),m[n].m(r,l))}for(;n<m.length;n+=1)m[n].d(1);m.length=f.length}if(2&e){let n;for(b=t[1]?.circle??[],n=0;n<b.length;n+=1){const o=W(t,b,n);v[n]?v[n].p(o,e):(v[n]=et(o),v[n].c(),v[n].m(r,c))}for(;n<v.length;n+=1)v[n].d(1);v.length=b.length}if(2&e){let n;for(y=t[1]?.polygon??[],n=0;n<y.length;n+=1){const o=U(t,y,n);x[n]?x[n].p(o,e):(x[n]=nt(o),x[n].c(),x[n].m(r,s))}for(;n<x.length;n+=1)x[n].d(1);x.length=y.length}if(2&e){let n;for(_=t[1]?.polyline??[],n=0;n<_.length;n+=1){const o=Q(t,_,n);M[n]?M[n].p(o,e):(M[n]=rt(o),M[n].c(),M[n].m(r,i))}for(;n<M.length;n+=1)M[n].d(1);M.length=_.length}if(2&e){let n;for(H=t[1]?.line??[],n=0;n<H.length;n+=1){const o=K(t,H,n);S[n]?S[n].p(o,e):(S[n]=ot(o),S[n].c(),S[n].m(r,null))}for(;n<S.length;n+=1)S[n].d(1);S.length=H.length}z(r,k=R(E,[2&e&&t[1]?.a,{xmlns:"http://www.w3.org/2000/svg"},1&e&&{width:t[0]},1&e&&{height:t[0]},4&e&&t[2]]))},i:t,o:t,d(t){t&&g(r),p(a,t),p(m,t),p(v,t),p(x,t),p(M,t),p(S,t)}}}function ct(t,n,r){let o;const l=["src","size","theme"];let c=f(n,l),{src:s}=n,{size:i="100%"}=n,{theme:u="default"}=n;if("100%"!==i&&"x"!=i.slice(-1)&&"m"!=i.slice(-1)&&"%"!=i.slice(-1))try{i=parseInt(i)+"px"}catch(t){i="100%"}return t.$$set=t=>{n=e(e({},n),function(t){const e={};for(const n in t)"$"!==n[0]&&(e[n]=t[n]);return e}(t)),r(2,c=f(n,l)),"src"in t&&r(3,s=t.src),"size"in t&&r(0,i=t.size),"theme"in t&&r(4,u=t.theme)},t.$$.update=()=>{24&t.$$.dirty&&r(1,o=s?.[u]??s?.default)},[i,o,c,s,u]}class st extends J{constructor(t){super(),F(this,t,ct,lt,c,{src:3,size:0,theme:4})}}const it={default:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M13 21V11h8v10h-8zM3 13V3h8v10H3zm6-2V5H5v6h4zM3 21v-6h8v6H3zm2-2h4v-2H5v2zm10 0h4v-6h-4v6zM13 3h8v6h-8V3zm2 2v2h4V5h-4z"}]},solid:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M3 13h8V3H3v10zm0 8h8v-6H3v6zm10 0h8V11h-8v10zm0-18v6h8V3h-8z"}]}},ut={default:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M12 1l9.5 5.5v11L12 23l-9.5-5.5v-11L12 1zm0 2.311L4.5 7.653v8.694l7.5 4.342 7.5-4.342V7.653L12 3.311zM12 16a4 4 0 1 1 0-8 4 4 0 0 1 0 8zm0-2a2 2 0 1 0 0-4 2 2 0 0 0 0 4z"}]},solid:{a:{viewBox:"0 0 24 24",fill:"currentColor"},path:[{fill:"none",d:"M0 0h24v24H0z"},{d:"M12 1l9.5 5.5v11L12 23l-9.5-5.5v-11L12 1zm0 14a3 3 0 1 0 0-6 3 3 0 0 0 0 6z"}]}},at=[];const kt="http://localhost:5000",ft=`${kt}/api`;const dt=function(e,n=t){let r;const o=new Set;function l(t){if(c(e,t)&&(e=t,r)){const t=!at.length;for(const t of o)t[1](),at.push(t,e);if(t){for(let t=0;t<at.length;t+=2)at[t][0](at[t+1]);at.length=0}}}return{set:l,update:function(t){l(t(e))},subscribe:function(c,s=t){const i=[c,s];return o.add(i),1===o.size&&(r=n(l)||t),c(e),()=>{o.delete(i),0===o.size&&r&&(r(),r=null)}}}}({});async function ht(){return(await fetch(`${ft}/status`,{method:"GET",cache:"no-cache"})).json()}function gt(){const t=new EventSource(`${ft}/events`);t.addEventListener("state",(t=>{const e=JSON.parse(t.data);"stopped"===e.status?dt.set({status:"stopped"}):dt.update((t=>({...t,status:e.status})))})),t.addEventListener("status",(t=>{const e=JSON.parse(t.data);dt.update((t=>"stopped"===t.status?t:{...t,...e}))}))}function pt(t,e,n){const r=t.slice();return r[5]=e[n][0],r[6]=e[n][1],r}function mt(t){let e,n,r,o,l,c=t[0].status+"";return{c(){e=m("tr"),n=m("td"),n.textContent="Status",r=v(),o=m("td"),l=b(c)},m(t,c){h(t,e,c),d(e,n),d(e,r),d(e,o),d(o,l)},p(t,e){1&e&&c!==(c=t[0].status+"")&&_(l,c)},d(t){t&&g(e)}}}function $t(t){let e,n=Object.entries(t[0]),r=[];for(let e=0;e<n.length;e+=1)r[e]=bt(pt(t,n,e));return{c(){for(let t=0;t<r.length;t+=1)r[t].c();e=w()},m(t,n){for(let e=0;e<r.length;e+=1)r[e]&&r[e].m(t,n);h(t,e,n)},p(t,o){if(1&o){let l;for(n=Object.entries(t[0]),l=0;l<n.length;l+=1){const c=pt(t,n,l);r[l]?r[l].p(c,o):(r[l]=bt(c),r[l].c(),r[l].m(e.parentNode,e))}for(;l<r.length;l+=1)r[l].d(1);r.length=n.length}},d(t){p(r,t),t&&g(e)}}}function bt(t){let e,n,r,o,l,c,s,i=t[5]+"",u=t[6]+"";return{c(){e=m("tr"),n=m("td"),r=b(i),o=v(),l=m("td"),c=b(u),s=v()},m(t,i){h(t,e,i),d(e,n),d(n,r),d(e,o),d(e,l),d(l,c),d(e,s)},p(t,e){1&e&&i!==(i=t[5]+"")&&_(r,i),1&e&&u!==(u=t[6]+"")&&_(c,u)},d(t){t&&g(e)}}}function vt(t){let e,n,r,l,c,s,i,u,a,f,p,$,w,z,_,M,H,S,E,k,L,j,C,O,T,V,B,N,R,G,F,J,K,Q,U,W,X;function Y(t,e){return"stopped"!=t[0]?.status?$t:mt}s=new st({props:{src:it,class:"w-5 h-5 mr-2"}}),$=new st({props:{src:ut,class:"w-5 h-5 mr-2"}});let Z=Y(t),tt=Z(t);return{c(){e=m("ul"),n=m("li"),n.innerHTML="<span>Menu</span>",r=v(),l=m("li"),c=m("a"),q(s.$$.fragment),i=v(),u=m("span"),u.textContent="Dashboard",a=v(),f=m("li"),p=m("a"),q($.$$.fragment),w=v(),z=m("span"),z.textContent="Settings",_=v(),M=m("li"),M.innerHTML="<span>Actions</span>",H=v(),S=m("div"),E=m("button"),k=b("Start"),L=v(),j=m("button"),C=b("Pause"),T=v(),V=m("button"),B=b("Stop"),R=v(),G=m("li"),G.innerHTML="<span>Status</span>",F=v(),J=m("div"),K=m("table"),Q=m("tbody"),tt.c(),x(n,"class","menu-title"),x(c,"href","#"),x(c,"class","menu-item"),x(p,"href","#"),x(p,"class","menu-item"),x(M,"class","menu-title mt-6"),x(E,"class","btn bg-green-500 hover:bg-green-600 text-white rounded-btn"),E.disabled=t[1],x(j,"class","btn bg-orange-500 hover:bg-orange-600 text-white rounded-btn"),j.disabled=O=!t[1],x(V,"class","btn bg-red-600 hover:bg-red-700 text-white rounded-btn"),V.disabled=N=!t[1],x(S,"class","btn-group flex justify-center"),x(G,"class","menu-title mt-6"),x(K,"class","table table-compact w-full"),x(J,"class","overflow-x-auto"),x(e,"class","menu p-4 w-80 bg-base-300 text-base-content")},m(o,g){h(o,e,g),d(e,n),d(e,r),d(e,l),d(l,c),D(s,c,null),d(c,i),d(c,u),d(e,a),d(e,f),d(f,p),D($,p,null),d(p,w),d(p,z),d(e,_),d(e,M),d(e,H),d(e,S),d(S,E),d(E,k),d(S,L),d(S,j),d(j,C),d(S,T),d(S,V),d(V,B),d(e,R),d(e,G),d(e,F),d(e,J),d(J,K),d(K,Q),tt.m(Q,null),U=!0,W||(X=[y(E,"click",t[2]),y(j,"click",t[3]),y(V,"click",t[4])],W=!0)},p(t,[e]){(!U||2&e)&&(E.disabled=t[1]),(!U||2&e&&O!==(O=!t[1]))&&(j.disabled=O),(!U||2&e&&N!==(N=!t[1]))&&(V.disabled=N),Z===(Z=Y(t))&&tt?tt.p(t,e):(tt.d(1),tt=Z(t),tt&&(tt.c(),tt.m(Q,null)))},i(t){U||(A(s.$$.fragment,t),A($.$$.fragment,t),U=!0)},o(t){P(s.$$.fragment,t),P($.$$.fragment,t),U=!1},d(t){t&&g(e),I(s),I($),tt.d(),W=!1,o(X)}}}function wt(t,e,n){let r;a(t,dt,(t=>n(0,r=t)));let o=!1;return t.$$.update=()=>{1&t.$$.dirty&&n(1,o="stopped"!=r.status&&"paused"!=r.status)},[r,o,()=>{!async function(){await fetch(`${ft}/controls/start`,{method:"POST"})}()},()=>{!async function(){await fetch(`${ft}/controls/pause`,{method:"POST"})}()},()=>{!async function(){await fetch(`${ft}/controls/stop`,{method:"POST"})}()}]}ht().then((t=>dt.set(t))),gt();class yt extends J{constructor(t){super(),F(this,t,wt,vt,c,{})}}function xt(t,e,n){const r=t.slice();return r[1]=e[n],r}function zt(t){let e,n,r,o,l,c,s,i,a,f,p,$,w,y,z,M,H=t[1].title+"",S=t[1].duration+"",E=t[1].date+"";return{c(){e=m("div"),n=m("figure"),r=m("img"),l=v(),c=m("div"),s=m("h2"),i=b(H),a=v(),f=m("div"),p=m("div"),$=b(S),w=v(),y=m("div"),z=b(E),M=v(),u(r.src,o=t[1].thumbnail)||x(r,"src",o),x(r,"alt","thumbnail"),x(s,"class","card-title first-letter:uppercase"),x(p,"class","badge badge-outline"),x(y,"class","badge badge-outline"),x(f,"class","card-actions justify-end"),x(c,"class","card-body"),x(e,"class","card card-compact bg-base-300 shadow-xl hover:cursor-pointer hover:scale-105 transition-transform")},m(t,o){h(t,e,o),d(e,n),d(n,r),d(e,l),d(e,c),d(c,s),d(s,i),d(c,a),d(c,f),d(f,p),d(p,$),d(f,w),d(f,y),d(y,z),d(e,M)},p(t,e){1&e&&!u(r.src,o=t[1].thumbnail)&&x(r,"src",o),1&e&&H!==(H=t[1].title+"")&&_(i,H),1&e&&S!==(S=t[1].duration+"")&&_($,S),1&e&&E!==(E=t[1].date+"")&&_(z,E)},d(t){t&&g(e)}}}function _t(e){let n,r,o,l,c=e[0],s=[];for(let t=0;t<c.length;t+=1)s[t]=zt(xt(e,c,t));return{c(){n=m("div"),r=m("div"),r.innerHTML='<h1 class="text-3xl font-bold">Dashboard</h1>',o=v(),l=m("div");for(let t=0;t<s.length;t+=1)s[t].c();x(r,"class","flex justify-between items-center"),x(l,"class","grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4 mt-6"),x(n,"class","p-6 pb-16")},m(t,e){h(t,n,e),d(n,r),d(n,o),d(n,l);for(let t=0;t<s.length;t+=1)s[t]&&s[t].m(l,null)},p(t,[e]){if(1&e){let n;for(c=t[0],n=0;n<c.length;n+=1){const r=xt(t,c,n);s[n]?s[n].p(r,e):(s[n]=zt(r),s[n].c(),s[n].m(l,null))}for(;n<s.length;n+=1)s[n].d(1);s.length=c.length}},i:t,o:t,d(t){t&&g(n),p(s,t)}}}function Mt(t,e,n){let{allRecordings:r=[]}=e;return async function(t={}){const e=new URLSearchParams;for(const[n,r]of Object.entries(t))void 0!==r&&e.set(n,String(r));const n=await(await fetch(`${ft}/media/recordings?${e}`)).json();for(const t of n.items)t.thumbnail&&(t.thumbnail=kt+t.thumbnail);return n}().then((t=>{n(0,r=t.items)})),t.$$set=t=>{"allRecordings"in t&&n(0,r=t.allRecordings)},[r]}class Ht extends J{constructor(t){super(),F(this,t,Mt,_t,c,{allRecordings:0})}}function St(e){let n,r,o,l,c,s,i,u,a,f,p;return c=new Ht({}),f=new yt({}),{c(){n=m("div"),r=m("input"),o=v(),l=m("div"),q(c.$$.fragment),s=v(),i=m("div"),u=m("label"),a=v(),q(f.$$.fragment),x(r,"id","sideBtn"),x(r,"type","checkbox"),x(r,"class","drawer-toggle"),x(l,"class","drawer-content"),x(u,"for","sideBtn"),x(u,"class","drawer-overlay"),x(i,"class","drawer-side grid-flow-dense"),x(n,"class","drawer drawer-mobile")},m(t,e){h(t,n,e),d(n,r),d(n,o),d(n,l),D(c,l,null),d(n,s),d(n,i),d(i,u),d(i,a),D(f,i,null),p=!0},p:t,i(t){p||(A(c.$$.fragment,t),A(f.$$.fragment,t),p=!0)},o(t){P(c.$$.fragment,t),P(f.$$.fragment,t),p=!1},d(t){t&&g(n),I(c),I(f)}}}return new class extends J{constructor(t){super(),F(this,t,null,St,c,{})}}({target:document.querySelector("body")})}();
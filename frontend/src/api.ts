@@ -3,17 +3,58 @@ import { writable } from "svelte/store";
 export interface Recording {
     id: string;
     title: string;
-    duration: number;
+    files: string[];
+    screens: number;
+    size: number; // bytes
+    duration: number; // seconds
+    started: number; // unix time
     date: string;
-    thumbnail: string;
+    apps: string[]; // most recorded first
+    thumbnail: string | null;
 }
 
-const API_URL = 'http://localhost:5000/api';
+export interface RecordingsPage {
+    total: number;
+    offset: number;
+    limit: number;
+    items: Recording[];
+}
 
-//get list of recordings
-export async function getRecordings(): Promise<Recording[]> {
-    const response = await fetch(`${API_URL}/media/recordings`);
-    return response.json() as Promise<Recording[]>;
+export interface RecordingsQuery {
+    offset?: number;
+    limit?: number;
+    app?: string;
+    since?: number;
+    until?: number;
+    q?: string;
+}
+
+const SERVER_URL = 'http://localhost:5000';
+const API_URL = `${SERVER_URL}/api`;
+
+//get a page of recordings, newest first
+//the browser revalidates with the ETag, an unchanged catalog answers 304
+export async function getRecordings(query: RecordingsQuery = {}): Promise<RecordingsPage> {
+    const params = new URLSearchParams();
+    for (const [key, value] of Object.entries(query)) {
+        if (value !== undefined) {
+            params.set(key, String(value));
+        }
+    }
+    const response = await fetch(`${API_URL}/media/recordings?${params}`);
+    const page = await response.json() as RecordingsPage;
+    for (const recording of page.items) {
+        if (recording.thumbnail) {
+            recording.thumbnail = SERVER_URL + recording.thumbnail;
+        }
+    }
+    return page;
+}
+
+//url of a video in the Records, Extracts or Timelapses folder, for a <video> element
+//the server answers byte ranges, so the browser can seek without downloading the file
+export function mediaUrl(folder: "records" | "extracts" | "timelapses", file: string): string {
+    return `${API_URL}/media/${folder}/${encodeURIComponent(file)}`;
 }
 
 export type status = {
@@ -32,22 +73,27 @@ export type status = {
 //make svelte writeable of status object
 export const status = writable<status>({});
 
-async function refreshData() {
-    const data = await getStatus();
-    status.set(data);
+//the backend pushes "state" when recording starts, pauses or stops
+//and "status" with the encoder progress while recording, see events.py
+function subscribe() {
+    const source = new EventSource(`${API_URL}/events`);
+    source.addEventListener("state", (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        if (data.status === "stopped") {
+            status.set({ status: "stopped" });
+        } else {
+            status.update((current) => ({ ...current, status: data.status }));
+        }
+    });
+    source.addEventListener("status", (event) => {
+        const data = JSON.parse((event as MessageEvent).data);
+        status.update((current) => (current.status === "stopped" ? current : { ...current, ...data }));
+    });
 }
 
-
-let gotResults = false;
-refreshData();
-
-//trigger every 5 seconds if the previous one finished
-setInterval(() => {
-    if (!gotResults) {
-        refreshData();
-    }
-    gotResults = false;
-}, 5000);
+//the current state once, the events only tell what changes
+getStatus().then((data) => status.set(data));
+subscribe();
 
 //get status of recording
 export async function getStatus(): Promise<status> {
@@ -55,9 +101,7 @@ export async function getStatus(): Promise<status> {
         method: 'GET',
         cache: 'no-cache',
     });
-    const data = await response.json();
-    gotResults = true;
-    return data as Promise<status>;
+    return response.json() as Promise<status>;
 }
 
 //start recording
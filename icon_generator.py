@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from PIL import Image, ImageDraw
 
 # rgb(248, 30, 38)
@@ -61,17 +63,49 @@ def icon_generator(size: int, outer_color: tuple, inner_color: tuple = None):
     return image
 
 
-class ICONS:
-    auto_recording = icon_generator(SIZE, RED)
-    manual_recording = icon_generator(SIZE, GREEN, RED)
-    paused = icon_generator(SIZE, YELLOW)
-    standby = icon_generator(SIZE, GREEN, GRAY)
-    inactive = icon_generator(SIZE, GRAY)
-    rendering = icon_generator(SIZE, BLUE)
+# tray icons by state: outer ring color, inner fill color
+ICON_COLORS = {
+    "auto_recording": (RED, None),
+    "manual_recording": (GREEN, RED),
+    "paused": (YELLOW, None),
+    "standby": (GREEN, GRAY),
+    "inactive": (GRAY, None),
+    "rendering": (BLUE, None),
+}
+ICON_DIR = Path(__file__).resolve().with_name("icons")
+
+
+def prerender_icons():
+    """Render every tray icon to a png in ICON_DIR, they are loaded from there at runtime."""
+    ICON_DIR.mkdir(exist_ok=True)
+    for name, colors in ICON_COLORS.items():
+        icon_generator(SIZE, *colors).save(ICON_DIR / f"{name}.png")
+
+
+class _Icons:
+    """Tray icons, each one is loaded from its prerendered png on first use.
+    Icons without a png are rendered, which is a lot slower."""
+
+    def __getattr__(self, name: str):
+        if name not in ICON_COLORS:
+            raise AttributeError(name)
+        path = ICON_DIR / f"{name}.png"
+        if path.exists():
+            with Image.open(path) as image:
+                icon = image.convert("RGBA")
+        else:
+            icon = icon_generator(SIZE, *ICON_COLORS[name])
+        setattr(self, name, icon)  # __getattr__ is not called again for this icon
+        return icon
+
+
+ICONS = _Icons()
 
 
 if __name__ == "__main__":
-    # When running this file as a script, it will generate an icon containing the folloring resolutions:
+    # When running this file as a script, it will prerender the tray icons and
+    # generate an icon containing the folloring resolutions:
+    prerender_icons()
     muli_res = [icon_generator(size, BLUE) for size in SIZES]
     ico_image = Image.new("RGBA", (256, 256), (255, 255, 255, 0))
     ico_image.save("icon.ico", format="ICO", transparency=0, append_images=muli_res)
@@ -0,0 +1,68 @@
+"""Background jobs for actions that take too long to answer a request with.
+
+The API hands recording controls (start, stop, pause) to run() and answers
+right away with the queued job, the client follows it at /api/jobs/<id>.
+Control jobs run one after the other on a single worker, in the order they
+were requested, so a stop never overtakes the start before it.
+"""
+
+import threading as tr
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+MAX_FINISHED = 100  # finished jobs kept for the job list
+
+_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Control Worker")
+_LOCK = tr.Lock()
+JOBS = {}  # job id -> Job, oldest first
+
+
+class Job:
+    """One action running in the background."""
+
+    def __init__(self, kind: str, function, *args):
+        self.id = uuid.uuid4().hex[:8]
+        self.kind = kind
+        self.state = "queued"  # queued, running, done, failed
+        self.error = None
+        self.result = None
+        self.started = time()
+        self.finished = None
+        self._function = function
+        self._args = args
+
+    def _run(self):
+        self.state = "running"
+        try:
+            self.result = self._function(*self._args)
+            self.state = "done"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"{self.kind} job failed: {self.error}")
+        finally:
+            self.finished = time()
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "error": self.error,
+            "result": self.result,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def run(kind: str, function, *args) -> Job:
+    """Queue function(*args) on the control worker, returns the queued job."""
+    job = Job(kind, function, *args)
+    with _LOCK:
+        JOBS[job.id] = job
+        finished = [job_id for job_id, old in JOBS.items() if old.finished is not None]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED)]:
+            del JOBS[job_id]
+    _POOL.submit(job._run)
+    return job
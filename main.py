@@ -1,5 +1,76 @@
-import precheck
-import bouncer
-import recorder
-import tray
-import trigger
+from time import perf_counter
+
+STARTED = perf_counter()
+
+import json
+import multiprocessing
+from time import time
+
+VERSION = "0.1"  # keep in sync with MyAppVersion in InnoSetup.iss
+
+
+class StartupReport:
+    """Times the steps of the startup, the report is appended to .logs/startup.jsonl
+    so the time from launch to the tray icon can be compared between releases."""
+
+    def __init__(self):
+        self.steps = {}
+        self._last = STARTED
+
+    def step(self, name: str):
+        now = perf_counter()
+        self.steps[name] = round((now - self._last) * 1000, 1)
+        self._last = now
+
+    def save(self):
+        import settings
+
+        report = {
+            "version": VERSION,
+            "time": time(),
+            "ready_ms": round((self._last - STARTED) * 1000, 1),
+            "steps_ms": self.steps,
+        }
+        print(f"Started in {report['ready_ms']}ms: {self.steps}")
+        try:
+            with open(settings.HOME_DIR / ".logs" / "startup.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(report) + "\n")
+        except OSError as e:
+            print(f"Could not save the startup report: {e}")
+
+
+def main():
+    report = StartupReport()
+
+    import precheck
+
+    precheck.run()
+    report.step("precheck")
+
+    import bouncer
+    import recorder
+    import tray
+    import trigger
+    import settings
+
+    report.step("imports")
+
+    def on_tray_ready(icon):
+        report.step("tray")
+        if settings.USE_AUTOTRIGGER:
+            trigger.enable()
+        import api
+
+        api.serve_in_background()
+        report.step("api")
+        report.save()
+        precheck.run_background()
+
+    tray.run(setup=on_tray_ready)
+
+
+if __name__ == "__main__":
+    # thumbnail previews are built in spawned worker processes,
+    # they import this file again and must not start the app
+    multiprocessing.freeze_support()
+    main()
@@ -5,8 +5,8 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[('ffmpeg.exe', '.')],
-    datas=[('icon.ico', '.'), ('corpus.pkl', '.'), ('README.md', '.'), ('LICENSE.txt', '.'), ('frontend/public', 'frontend/public')],
-    hiddenimports=[],
+    datas=[('icon.ico', '.'), ('filename_words.bin', '.'), ('icons', 'icons'), ('README.md', '.'), ('LICENSE.txt', '.'), ('frontend/public', 'frontend/public')],
+    hiddenimports=['waitress'],  # imported when the api starts
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
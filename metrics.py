@@ -0,0 +1,208 @@
+"""Timing histograms and counters of the capture loop, served at /api/metrics.
+
+Every capture loop (one per recorded screen) times its stages into its own
+histograms and counts what happened to the frames it saw. Only the loop's own
+thread writes to its metrics, so there is no lock on the hot path, a stage
+costs two perf_counter calls and a bisect. When a recording ends its metrics
+are folded into the totals of its screen, so the exported counters only ever
+grow, like Prometheus expects.
+
+Stages, in loop order:
+    capture_wait  parked until the next frame is due (or a resume, a stop, a focus change)
+    grab          taking the latest frame from the frame source
+    window_title  reading the title of the focused window
+    bouncer       checking the title against the white- and blacklist
+    frame_diff    comparing the frame with the previous one
+    write         handing the frame to the writer, includes waiting for a free ring slot
+    thumbnail     offering the frame to the thumbnailer
+
+Set settings.METRICS to False to skip the timing altogether.
+"""
+
+import threading as tr
+from bisect import bisect_left
+from time import perf_counter
+
+import settings
+
+# upper bounds of the histogram buckets in seconds, from 100µs to 1s
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STAGES = ("capture_wait", "grab", "window_title", "bouncer", "frame_diff", "write", "thumbnail")
+SKIP_REASONS = ("unchanged", "out_of_scope", "paused")
+PREFIX = "semprecord"
+
+_LOCK = tr.Lock()
+_LIVE = set()  # LoopMetrics of running capture loops
+_TOTALS = {}  # screen -> LoopMetrics of the capture loops that ended
+
+
+class Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+    def add(self, other: "Histogram"):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, None without observations."""
+        total = self.count
+        if not total:
+            return None
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= q * total:
+                return bound
+
+
+class LoopMetrics:
+    """Metrics of one capture loop."""
+
+    def __init__(self, screen: int = 1):
+        self.screen = screen
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.frames_seen = 0
+        self.frames_written = 0
+        self.skipped = dict.fromkeys(SKIP_REASONS, 0)
+        self.write_stall_seconds = 0.0
+
+    def lap(self, stage: str, since: float) -> float:
+        """Account the time since `since` to the stage, returns now for the next lap."""
+        now = perf_counter()
+        self.stages[stage].observe(now - since)
+        return now
+
+    def skip(self, reason: str):
+        self.skipped[reason] += 1
+
+    def add(self, other: "LoopMetrics"):
+        for stage, histogram in other.stages.items():
+            self.stages[stage].add(histogram)
+        self.frames_seen += other.frames_seen
+        self.frames_written += other.frames_written
+        for reason, count in other.skipped.items():
+            self.skipped[reason] += count
+        self.write_stall_seconds += other.write_stall_seconds
+
+    def retire(self):
+        """The loop ended, fold its metrics into the totals of its screen."""
+        with _LOCK:
+            _LIVE.discard(self)
+            _TOTALS.setdefault(self.screen, LoopMetrics(self.screen)).add(self)
+
+
+class _NoMetrics(LoopMetrics):
+    """Stand-in while settings.METRICS is off, nothing is timed or counted."""
+
+    def lap(self, stage: str, since: float) -> float:
+        return since
+
+    def skip(self, reason: str):
+        pass
+
+    def retire(self):
+        pass
+
+
+def loop_metrics(screen: int = None) -> LoopMetrics:
+    """Metrics for a new capture loop of the screen, screens count from 1."""
+    if not settings.METRICS:
+        return _NoMetrics(screen or 1)
+    metrics = LoopMetrics(screen or 1)
+    with _LOCK:
+        _LIVE.add(metrics)
+    return metrics
+
+
+def snapshot() -> dict:
+    """screen -> LoopMetrics with everything counted so far, ended and running loops together."""
+    with _LOCK:
+        screens = {}
+        for metrics in list(_TOTALS.values()) + list(_LIVE):
+            screens.setdefault(metrics.screen, LoopMetrics(metrics.screen)).add(metrics)
+    return dict(sorted(screens.items()))
+
+
+def as_dict() -> dict:
+    """The metrics as JSON, with the quantiles estimated from the buckets."""
+    screens = {}
+    for screen, metrics in snapshot().items():
+        stages = {}
+        for stage, histogram in metrics.stages.items():
+            count = histogram.count
+            stages[stage] = {
+                "count": count,
+                "seconds": round(histogram.sum, 6),
+                "mean_ms": round(histogram.sum / count * 1000, 4) if count else None,
+                "p50_ms": _ms(histogram.quantile(0.5)),
+                "p99_ms": _ms(histogram.quantile(0.99)),
+                "buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"], histogram.counts)),
+            }
+        screens[str(screen)] = {
+            "frames_seen": metrics.frames_seen,
+            "frames_written": metrics.frames_written,
+            "frames_skipped": dict(metrics.skipped),
+            "write_stall_seconds": round(metrics.write_stall_seconds, 6),
+            "stages": stages,
+        }
+    return {"enabled": settings.METRICS, "buckets": list(BUCKETS), "screens": screens}
+
+
+def _ms(seconds: float):
+    """Milliseconds for JSON, quantiles beyond the last bucket are reported as "+Inf"."""
+    if seconds is None:
+        return None
+    return "+Inf" if seconds == float("inf") else seconds * 1000
+
+
+def prometheus() -> str:
+    """The metrics in the Prometheus text exposition format."""
+    screens = snapshot()
+    lines = [
+        f"# HELP {PREFIX}_loop_stage_seconds Time spent in each stage of the capture loop.",
+        f"# TYPE {PREFIX}_loop_stage_seconds histogram",
+    ]
+    for screen, metrics in screens.items():
+        for stage, histogram in metrics.stages.items():
+            labels = f'screen="{screen}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip([str(bound) for bound in BUCKETS] + ["+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'{PREFIX}_loop_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{PREFIX}_loop_stage_seconds_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"{PREFIX}_loop_stage_seconds_count{{{labels}}} {cumulative}")
+
+    counters = (
+        ("frames_seen_total", "Frames taken from the frame source.", lambda m: [("", m.frames_seen)]),
+        ("frames_written_total", "Frames handed to the encoder.", lambda m: [("", m.frames_written)]),
+        (
+            "frames_skipped_total",
+            "Loop iterations that wrote no frame, by reason.",
+            lambda m: [(f',reason="{reason}"', count) for reason, count in m.skipped.items()],
+        ),
+        (
+            "write_stall_seconds_total",
+            "Time the capture loop waited for a free slot in the writer ring.",
+            lambda m: [("", m.write_stall_seconds)],
+        ),
+    )
+    for name, help_text, values in counters:
+        lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}_{name} counter")
+        for screen, metrics in screens.items():
+            for labels, value in values(metrics):
+                lines.append(f'{PREFIX}_{name}{{screen="{screen}"{labels}}} {value!r}')
+    return "\n".join(lines) + "\n"
@@ -4,6 +4,15 @@ import ctypes
 class POINT(ctypes.Structure):
     _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
 
+def cursor_position():
+    """Returns the (x, y) position of the cursor in screen pixels, None if it is unknown."""
+    if not hasattr(ctypes, "windll"):
+        return None
+    cursor_pos = POINT()
+    if not ctypes.windll.user32.GetCursorPos(ctypes.byref(cursor_pos)):
+        return None
+    return cursor_pos.x, cursor_pos.y
+
 def cursor_pos_generator():
     """ A generator function which returns the cursor position """
     cursor_pos = POINT()
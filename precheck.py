@@ -1,11 +1,16 @@
 import os
 import pathlib
+import threading
+from time import time
 
 import win32api
 import win32con
 
 import settings
 
+# files written after this are from the current run and are never cleaned up
+STARTED = time()
+
 
 def create_folders():
     """
@@ -18,6 +23,8 @@ def create_folders():
     - .settings: saves multiple setting profiles as yaml files
     - .thumbnails: saves thumbnails as webp animations
     - Records: saves the actual recordings as mkv files
+    - Extracts: saves the videos extracted per app
+    - Timelapses: saves the timelapses rendered per app
     """
     # Create the HOME_DIR if it doesn't exist
     if not settings.HOME_DIR:
@@ -38,6 +45,8 @@ def create_folders():
         ".settings",
         ".thumbnails",
         "Records",
+        "Extracts",
+        "Timelapses",
     ]:
         (HOME_DIR / folder).mkdir(exist_ok=True)
 
@@ -51,16 +60,36 @@ def cleaning_out_my_closet():
     """clear out corrupst files by deleting any file less than 1MB from the Records folder"""
     MIN_SIZE = 1_000_000
     for file in (settings.HOME_DIR / "Records").iterdir():
-        if file.stat().st_size < MIN_SIZE:
+        stat = file.stat()
+        if stat.st_size < MIN_SIZE and stat.st_mtime < STARTED:
             file.unlink()
             print(f"Deleted {file.name}")
 
 
-create_folders()
-cleaning_out_my_closet()
+def load_settings():
+    try:
+        settings.load()
+    except FileNotFoundError:
+        print("No settings file found. Creating a new one.")
+        settings.save()
+
+
+def run():
+    """Checks that have to pass before the app starts: folders and settings."""
+    create_folders()
+    load_settings()
+
+
+def background_checks():
+    import encoder_profile
+
+    cleaning_out_my_closet()
+    if encoder_profile.probe_is_stale():
+        encoder_profile.refresh_probe()
+
 
-try:
-    settings.load()
-except FileNotFoundError:
-    print("No settings file found. Creating a new one.")
-    settings.save()
+def run_background():
+    """Checks that can wait until the app is up: cleaning the Records folder and probing the encoder."""
+    thread = threading.Thread(target=background_checks, name="Precheck Thread", daemon=True)
+    thread.start()
+    return thread
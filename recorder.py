@@ -1,42 +1,60 @@
-import os
-import tempfile
 import threading as tr
-from time import sleep
+from collections import deque
+from time import perf_counter, time
 
-import dxcam
 import ffmpeg
 
-# from thumbnailer import ThumbnailProcessor
-import numpy as np
-
 import bouncer
+import catalog
+import encoder_profile
+import events
+import framesource
+import metrics
 import timelines
 import settings
-import util
 from filename_generator import generate_filename
+from changedetect import ChangeDetector
+from ffprogress import PROGRESS_ARGS, Progress, ProgressReader
+from framewriter import FrameWriter
+from thumbnailer import ThumbnailProcessor
 
-CODEC = "hevc_nvenc" if util.nvenc_available() else "libx265"
 FFPATH = r".\ffmpeg.exe"
 # MIN_FRAMES_PER_SWITCH = 15
-DIFF_SUBSAMPLE = 4 
-def frameDiff(A: np.ndarray, B: np.ndarray):
-    """
-    Calculate the difference between two frames by subsampling and comparing their elements.
-    This function downsamples the input arrays `A` and `B` by a factor defined by the 
-    global constant `DIFF_SUBSAMPLE`, then computes the total number of differing 
-    elements between the two subsampled arrays.
-    Args:
-        A (np.ndarray): The first input frame as a 2D NumPy array.
-        B (np.ndarray): The second input frame as a 2D NumPy array.
-    Returns:
-        int: The total count of differing elements between the subsampled frames.
-    """
-    
-    A = A[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
-    B = B[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE]
-    # summ the whole frame into one value
-    diff = np.sum(A != B)
-    return diff
+FOCUS_POLL_INTERVAL = 0.5  # seconds between focus checks while an app is out of scope
+# capturing: frames are written, unchanged: nothing moved on screen,
+# out_of_scope: the focused app is not whitelisted or blacklisted, paused: paused by the user
+LOOP_STATES = ("capturing", "unchanged", "out_of_scope", "paused")
+# capturing: frames are taken from the screen, finalising: capture stopped and the encoders
+# write the remaining frames and close the files, failed: an output could not finish its files,
+# done: every file is complete. A recording reports the first state in this order that one of its outputs is in.
+LIFECYCLE_STATES = ("capturing", "finalising", "failed", "done")
+RELEASE_TIMEOUT = 5  # seconds a stop waits for the capture loops to let go of their frame sources
+MAX_FINALISING = 2  # outputs whose encoders are flushed and closed at the same time
+MAX_SESSIONS_KEPT = 50  # finished recordings kept in the session list
+STANDBY_LEAD_SECONDS = 10  # seconds of video before a rollover at which the encoder of the next segment starts
+STDERR_LINES = 5  # last lines of ffmpeg's error output kept for the error of a failed segment
+_FINALISE_SLOTS = tr.BoundedSemaphore(MAX_FINALISING)
+
+
+def codec_options(width: int, height: int) -> dict:
+    """Codec and rate control options, from the calibrated encoder profile if there is one."""
+    profile = encoder_profile.load(width, height)
+    if profile is not None:
+        return encoder_profile.ffmpeg_options(profile)
+    codec = encoder_profile.default_codec()
+    # libx265 does not understand the nvenc options
+    if codec.endswith("_nvenc"):
+        return dict(vcodec=codec, cq=settings.QUALITY, preset="p5", tune="hq", weighted_pred=1)
+    # closed GOPs so every keyframe is a clean cut point for the extractor
+    return dict(vcodec=codec, crf=settings.QUALITY, preset="veryfast", **{"x265-params": "open-gop=0"})
+
+
+COLOR_OPTIONS = dict(
+    color_primaries="bt709",  # sRGB uses BT.709 primaries
+    color_trc="iec61966-2-1",  # sRGB transfer characteristics
+    colorspace="bt709",  # sRGB uses BT.709 colorspace
+    color_range="pc",  # Set color range to full
+)
 
 
 def mkv_encoder(width, height, path):
@@ -51,156 +69,523 @@ def mkv_encoder(width, height, path):
         .output(
             str(path),
             r=settings.FRAME_RATE,
-            vcodec=CODEC,
-            cq=settings.QUALITY,
-            preset="p5",
-            tune="hq",
-            weighted_pred=1,
             pix_fmt="yuv420p",
             movflags="faststart",
-            color_primaries="bt709",  # sRGB uses BT.709 primaries
-            color_trc="iec61966-2-1",  # sRGB transfer characteristics
-            colorspace="bt709",  # sRGB uses BT.709 colorspace
-            color_range="pc",  # Set color range to full
+            **COLOR_OPTIONS,
+            **codec_options(width, height),
         )
-        .run_async(pipe_stdin=True, pipe_stderr=True)
+        .global_args(*PROGRESS_ARGS, "-loglevel", "error")
+        .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
     )
 
 
-class Recorder:
-    """Allows for continuous writing to a video file.
-    Gets destroyed after the recording is done.
-    It is replaced by a new recorder instance.
-    """
+class Segment:
+    """One output file of a recording with its own ffmpeg process, writer and progress reader."""
 
-    def __init__(self):
-        """Starts the recording process"""
-        self.file_name = generate_filename() + ".mkv"
-        self.path = settings.HOME_DIR / "Records"  / self.file_name
+    def __init__(self, name: str, index: int, resolution: tuple):
+        self.index = index
+        self.file_name = f"{name}_{index:03}.mkv"
+        self.path = settings.HOME_DIR / "Records" / self.file_name
+        self.frames = 0
 
-        
-        self.total_frames_recorded = 0
-        self.paused = False
-        self.cut = False
-        # start ffmpeg
-        w, h = util.get_desktop_resolution()
+        w, h = resolution
         self.ffprocess = mkv_encoder(w, h, self.path)
+        self.writer = FrameWriter(self.ffprocess.stdin, (h, w, 3), settings.WRITER_RING_SLOTS)
+        self.progress = ProgressReader(self.ffprocess.stdout)
+        self.stderr_tail = deque(maxlen=STDERR_LINES)
+        self.stderr_thread = tr.Thread(target=self._read_stderr, name="Segment Stderr Thread", daemon=True)
+        self.stderr_thread.start()
+
+    def _read_stderr(self):
+        # ffmpeg blocks once the pipe is full, so it is drained even if nobody asks for the errors
+        for line in self.ffprocess.stderr:
+            self.stderr_tail.append(line.decode(errors="replace").strip())
+
+    def full(self, ahead: int = 0) -> bool:
+        """True once the segment holds SEGMENT_MAX_MINUTES of video or SEGMENT_MAX_MB on disk,
+        or will after ahead more frames at the size per frame so far."""
+        max_frames = settings.SEGMENT_MAX_MINUTES * 60 * settings.FRAME_RATE
+        if max_frames and self.frames + ahead >= max_frames:
+            return True
+        # the file size is only checked once per second of video
+        if settings.SEGMENT_MAX_MB and self.frames and self.frames % settings.FRAME_RATE == 0:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                return False
+            return size * (self.frames + ahead) / self.frames >= settings.SEGMENT_MAX_MB * 1_000_000
+        return False
+
+    def close(self):
+        """Write the remaining frames and wait for ffmpeg to finalise the file.
+        Raises RuntimeError if ffmpeg failed or the frames could not be written to it."""
+        self.writer.close()
+        self.ffprocess.wait()
+        self.stderr_thread.join()
+        if not self.frames:
+            # a standby segment that never got a frame
+            self.path.unlink(missing_ok=True)
+        if self.ffprocess.returncode != 0:
+            detail = " | ".join(line for line in self.stderr_tail if line) or "no error output"
+            raise RuntimeError(f"ffmpeg exited with {self.ffprocess.returncode} on {self.file_name}: {detail}")
+        if self.writer.error is not None:
+            raise RuntimeError(f"Writing {self.file_name} failed: {self.writer.error}")
+
+
+class OutputRecorder:
+    """Captures, diffs and encodes a single output (monitor) of a recording on its own thread.
+    Long recordings roll over into numbered segments, see Segment.
+    """
+
+    def __init__(self, recorder, source: framesource.FrameSource, name: str, screen: int = None):
+        """
+        Args:
+            recorder (Recorder): The recording this output belongs to, it owns the pause and stop flags.
+            source (FrameSource): Where the frames of this output come from.
+            name (str): File name prefix of the segments.
+            screen (int): Number of the screen if more than one is recorded, added to the timeline names.
+        """
+        self.recorder = recorder
+        self.name = name
+        self.screen = screen
+        self.total_frames_recorded = 0
+        self.end_record_flag = recorder.end_record_flag
+        self.lifecycle = "capturing"
+        self.error = None
+        self.finished = None
+        self.released = tr.Event()  # set once the capture loop ended and the source is stopped
+
+        # the capture loop parks on this event, it is set on resume, stop and focus changes
+        self.wake = tr.Event()
+        self.loop_state = "capturing"
+        self.loop_seconds = dict.fromkeys(LOOP_STATES, 0.0)
+        self._state_since = perf_counter()
+        self.source = source
+        self.detector = ChangeDetector(self.source.resolution)
+        self.thumbnails = ThumbnailProcessor(name)
+        self.metrics = metrics.loop_metrics(screen)
+        self._span = None  # (title, appname, start frame, wall-clock start) of the focused window
+
+        # start ffmpeg, the encoder of the next segment is started STANDBY_LEAD_SECONDS
+        # before the rollover so switching to it does not hold up the capture loop
+        self.segment = Segment(self.name, 1, self.source.resolution)
+        self.segments = [self.segment]
+        self._standby = None
+        self._standby_thread = None
+        self._segment_threads = []  # closing the segments that were rolled over
+        self._segment_errors = []  # why segments failed to close, reported by _finalise
 
         # launch threads
-        self.end_record_flag = tr.Event()
         self.record_thread = tr.Thread(
-            target=self._record_thread, name="Recording Thread"
-        )
-
-        self.end_status_flag = tr.Event()
-        self.status_thread = tr.Thread(
-            target=self._status_thread, name="Status Thread", daemon=True
+            target=self._record_thread, name=f"Recording Thread {name}"
         )
-
         self.record_thread.start()
-        self.status_thread.start()
+
+    @property
+    def file_name(self) -> str:
+        """File name of the segment that is being written."""
+        return self.segment.file_name
+
+    @property
+    def path(self):
+        return self.segment.path
+
+    @property
+    def progress(self) -> Progress:
+        """Latest encoder progress of the segment that is being written."""
+        return self.segment.progress.snapshot
+
+    def _start_standby(self):
+        """Start the encoder of the next segment in the background."""
+
+        def start():
+            self._standby = Segment(self.name, self.segment.index + 1, self.source.resolution)
+
+        self._standby_thread = tr.Thread(target=start, name="Segment Standby Thread")
+        self._standby_thread.start()
+
+    def _rotate(self):
+        """Switch to the standby segment and finalise the full one in the background.
+        Frames already queued for the old segment are still written to it."""
+        if self._standby_thread is not None:
+            self._standby_thread.join()  # the standby is normally ready long before it is needed
+        old = self.segment
+        self.segment = self._standby or Segment(self.name, old.index + 1, self.source.resolution)
+        self._standby, self._standby_thread = None, None
+        self.segments.append(self.segment)
+
+        thread = tr.Thread(target=self._close_rotated, args=(old,), name="Segment Finalise Thread")
+        thread.start()
+        self._segment_threads = [t for t in self._segment_threads if t.is_alive()] + [thread]
+        print(f"Rolled over to segment {self.segment.file_name}")
+
+    def _close_rotated(self, segment: Segment):
+        """Close a segment that was rolled over, it takes a finalise slot like a stopped output."""
+        with _FINALISE_SLOTS:
+            self._close_segment(segment)
+
+    def _close_segment(self, segment: Segment):
+        """Close a segment, a failure is kept for _finalise to report."""
+        try:
+            segment.close()
+        except Exception as e:
+            self._segment_errors.append(str(e))
+
+    def _register_take(self, appname: str, start_frame: int):
+        """Register the take from start_frame up to the current frame of the current segment."""
+        if appname and self.segment.frames - start_frame >= 1:
+            if self.screen is not None:
+                appname = f"{appname} (screen {self.screen})"
+            timelines.register_take(
+                appname=appname,
+                start_frame=start_frame,
+                end_frame=self.segment.frames,
+                clip_name=self.segment.file_name,
+            )
+
+    def _open_span(self, title: str, appname: str):
+        """Start a focus span at the current frame of the current segment."""
+        self._span = (title, appname, self.segment.frames, time())
+
+    def _close_span(self):
+        """Put the focus span up to the current frame into the catalog."""
+        if self._span is None:
+            return
+        title, appname, start_frame, started = self._span
+        self._span = None
+        if self.segment.frames - start_frame >= 1:
+            catalog.add_span(
+                recording=self.name,
+                clip=self.segment.file_name,
+                app=appname,
+                title=title,
+                start_frame=start_frame,
+                end_frame=self.segment.frames,
+                started=started,
+            )
+
+    def _park(self, state: str, timeout: float = None):
+        """Account the time since the last park to the current state and wait.
+        Returns early when woken by a resume, a stop or a focus change."""
+        now = perf_counter()
+        self.loop_seconds[self.loop_state] += now - self._state_since
+        self.loop_state, self._state_since = state, now
+        if timeout is None or timeout > 0:
+            self.wake.wait(timeout)
+        self.wake.clear()
 
     def _record_thread(self):
-        capturecam = dxcam.create()
-        capturecam.start(target_fps=settings.FRAME_RATE)
+        self.source.start(target_fps=settings.FRAME_RATE)
+        unwatch = self.source.watch_focus(self.wake.set)
 
-        previous_frame = capturecam.get_latest_frame()
+        previous_frame = self.source.get_latest_frame()
         previous_switch_frame = 0
         previous_appname = ""
-
+        interval = 0 if self.source.free_running else 1 / settings.FRAME_RATE
+        next_tick = perf_counter()
+        state = "capturing"
+        # the detector learns the noise from every frame of the first CALIBRATION_SECONDS, changed or not,
+        # while those frames are recorded like any other. Ends after that much wall-clock time
+        # or that many frames, whichever comes first, so a source that does not wait is bounded too
+        calibration_end = perf_counter() + settings.CALIBRATION_SECONDS
+        calibration_left = int(settings.CALIBRATION_SECONDS * settings.FRAME_RATE) if settings.AUTO_CALIBRATE else 0
+        calibration_frame = previous_frame
+
+        stats = self.metrics  # lap() times the stage since the previous lap
         while not self.end_record_flag.is_set():
-            new_frame = capturecam.get_latest_frame()
-            if self.paused:
-                previous_frame = new_frame
-                continue
+            # wait for the next frame, or longer while there is nothing to record
+            lap = perf_counter()
+            if state == "paused":
+                self._park(state)
+            elif state == "out_of_scope":
+                self._park(state, FOCUS_POLL_INTERVAL)
+            else:
+                self._park(state, next_tick - perf_counter())
+            lap = stats.lap("capture_wait", lap)
+            next_tick = max(next_tick + interval, lap)
+            if self.end_record_flag.is_set():
+                break
 
-            # PERFORM APP SWITCH CHECKS
-            new_window_title = util.getForegroundWindowTitle()
-            
-            if not (new_appname:=bouncer.isWhiteListed(new_window_title)):
+            if self.recorder.paused:
+                state = "paused"
+                stats.skip(state)
                 continue
 
-            if bouncer.isBlackListed(new_window_title):
+            if calibration_left:
+                new_frame = self.source.current_frame()  # an idle screen is sampled too
+            else:
+                new_frame = self.source.get_latest_frame()
+            lap = stats.lap("grab", lap)
+            if new_frame is None:
+                # the source ran out of frames (replays and finite synthetic scripts)
+                break
+            if calibration_left:
+                if calibration_frame is not None:
+                    self.detector.sample(calibration_frame, new_frame)
+                calibration_frame = new_frame
+                calibration_left -= 1
+                if not calibration_left or perf_counter() >= calibration_end:
+                    calibration_left = 0
+                    self.detector.finish_calibration()
+                lap = perf_counter()  # calibrating is not part of any stage
+            stats.frames_seen += 1
+            if state == "paused":
+                # just resumed, compare against what is on screen now
+                previous_frame = new_frame
+
+            # PERFORM APP SWITCH CHECKS
+            new_window_title = self.source.window_title()
+            lap = stats.lap("window_title", lap)
+
+            new_appname = bouncer.admit(new_window_title)
+            lap = stats.lap("bouncer", lap)
+            if not new_appname:
+                state = "out_of_scope"
+                stats.skip(state)
                 continue
 
-            if frameDiff(new_frame, previous_frame) < settings.CHANGE_THRESHOLD:
+            changed = self.detector.changed(new_frame, previous_frame, self.source.cursor_position())
+            lap = stats.lap("frame_diff", lap)
+            if not changed:
+                state = "unchanged"
+                stats.skip(state)
                 continue
 
+            state = "capturing"
             # AFTER THIS POINT, WE KNOW THAT THE FRAME IS VALID AND WE CAN PROCESS IT
 
-            if (
+            if self._standby_thread is None and self.segment.full(STANDBY_LEAD_SECONDS * settings.FRAME_RATE):
+                self._start_standby()
+            if self.segment.full():
+                # close the take in the full segment, it continues at frame 0 of the next one
+                self._register_take(previous_appname, previous_switch_frame)
+                self._close_span()
+                self._rotate()
+                previous_switch_frame = 0
+            elif (
                 previous_appname != new_appname
                 and previous_appname != ""
-                and self.total_frames_recorded - previous_switch_frame >= 1
+                and self.segment.frames - previous_switch_frame >= 1
             ):
                 # an app switch has occurred
-                timelines.register_take(
-                    appname=previous_appname,
-                    start_frame=previous_switch_frame,
-                    end_frame=self.total_frames_recorded,
-                    clip_name=self.file_name,
-                )
-                previous_switch_frame = self.total_frames_recorded
+                self._register_take(previous_appname, previous_switch_frame)
+                previous_switch_frame = self.segment.frames
                 print(f"App switch detected: {new_appname}")
 
 
             previous_appname = new_appname
-            # Flush the frame to FFmpeg
-            try:
-                self.ffprocess.stdin.write(previous_frame.tobytes())  # write to pipe
-                previous_frame = new_frame
-                self.total_frames_recorded += 1
-            except os.error:
+            if self._span is None or self._span[0] != new_window_title:
+                # the focus moved to another window, or the span was closed by a rollover
+                self._close_span()
+                self._open_span(new_window_title, new_appname)
+            # Hand the frame to the writer thread, only blocks if the ring is full
+            writer = self.segment.writer
+            stalled = writer.stall_seconds
+            lap = perf_counter()  # the rollover above is not part of any stage
+            if not writer.put(previous_frame):
+                # the pipe to ffmpeg broke, _finalise reports why the encoder is gone
+                self.recorder._output_failed(self)
                 break
+            lap = stats.lap("write", lap)
+            stats.write_stall_seconds += writer.stall_seconds - stalled
+            stats.frames_written += 1
+            self.thumbnails.offer(previous_frame, self.total_frames_recorded)
+            stats.lap("thumbnail", lap)
+            previous_frame = new_frame
+            self.segment.frames += 1
+            self.total_frames_recorded += 1
         # the recording ends here
         # everything beyond this point is cleanup
 
-        self.ffprocess.stdin.close()
-        self.ffprocess.wait()
-        capturecam.stop()
-        print("Capture stopped 🎬")
+        self.metrics.retire()
+
+        # release the screen first so the next recording can capture it right away
+        self._register_take(previous_appname, previous_switch_frame)
+        self._close_span()
+        timelines.flush_all_edl_writers()
+        if unwatch is not None:
+            unwatch()
+        self.source.stop()
+        self.released.set()
+        self._park("stopped", 0)
+        self.lifecycle = "finalising"
+        self.recorder._lifecycle_changed()
+        self._finalise()
+        print(f"Capture stopped 🎬 {self.name}", self.get_loop_stats(), self.segment.writer.stats())
+
+    def _finalise(self):
+        """Write the remaining frames and close the files of every segment.
+        At most MAX_FINALISING outputs do this at the same time, the others wait their turn."""
+        # rolled over segments close in their own slot, waiting for them while holding one could deadlock
+        for thread in self._segment_threads:
+            thread.join()
+        if self._standby_thread is not None:
+            self._standby_thread.join()
+        with _FINALISE_SLOTS:
+            try:
+                if self._standby is not None:
+                    self._close_segment(self._standby)
+                self._close_segment(self.segment)
+                self.thumbnails.close()
+                catalog.flush()  # the spans of the recording are searchable once it is done
+                if self._segment_errors:
+                    raise RuntimeError("; ".join(self._segment_errors))
+                self.lifecycle = "done"
+            except Exception as e:
+                self.lifecycle = "failed"
+                self.error = str(e)
+                print(f"Finalising {self.name} failed: {self.error}")
+            finally:
+                self.finished = time()
+        self.recorder._lifecycle_changed()
+
+    def get_loop_stats(self) -> dict:
+        """Seconds the capture loop spent in each state, including the current one."""
+        stats = dict(self.loop_seconds)
+        if self.loop_state in stats:
+            stats[self.loop_state] += perf_counter() - self._state_since
+        return {k: round(v, 3) for k, v in stats.items()}
 
-    def _status_thread(self):
-        self.status = ""
-        buffer = b""
 
-        while not self.end_status_flag.is_set():
-            new_stat = self.ffprocess.stderr.read1()
+class Recorder:
+    """Allows for continuous writing to video files, one OutputRecorder per captured output.
+    Only the outputs whose screen changed emit frames.
+    Gets destroyed after the recording is done.
+    It is replaced by a new recorder instance.
+    """
 
-            # split the status into lines
-            # we'd like to use readline but using \r as the delimiter
-            new_stat = new_stat.split(b"\r")
-            buffer += new_stat[0]
-            if len(new_stat) > 1:
-                # if there is more than one line, the last line is the current status
-                self.status = buffer.decode("utf-8").strip()
-                buffer = new_stat[-1]
+    def __init__(self, source: framesource.FrameSource = None, sources: list = None):
+        """Starts the recording process.
+        Frames come from settings.FRAME_SOURCE and settings.CAPTURE_OUTPUTS unless sources are given."""
+        self.name = generate_filename()
+        self.started = time()
+        self._paused = False
+        self.cut = False
+        self.end_record_flag = tr.Event()
+
+        if source is not None:
+            sources = [source]
+        elif not sources:
+            sources = framesource.open_sources()
+        self.outputs = []  # filled one by one, the first output may already report its state
+        if len(sources) == 1:
+            self.outputs.append(OutputRecorder(self, sources[0], self.name))
+        else:
+            for i, source in enumerate(sources, start=1):
+                self.outputs.append(OutputRecorder(self, source, f"{self.name}_screen{i}", screen=i))
+
+    @property
+    def file_name(self) -> str:
+        """File name of the segment that is being written on the first output."""
+        return self.outputs[0].file_name
+
+    @property
+    def state(self) -> str:
+        """Lifecycle of the recording, see LIFECYCLE_STATES.
+        The slowest output decides, a failed output makes the whole recording failed."""
+        states = {output.lifecycle for output in self.outputs}
+        for state in LIFECYCLE_STATES:
+            if state in states:
+                return state
+
+    @property
+    def finished(self) -> float:
+        """When the last output finished finalising, None before that."""
+        if not self.outputs or self.state not in ("done", "failed"):
+            return None
+        return max(output.finished for output in self.outputs)
+
+    def _output_failed(self, output: OutputRecorder):
+        """Called by an output that can no longer write its frames, the whole recording stops
+        so it is not reported as recording while nothing is written."""
+        print(f"The encoder of {output.name} is gone, stopping the recording")
+        self.cut = True
+        self.end_record_flag.set()
+        for other in self.outputs:
+            other.wake.set()
+            other.source.stop()
+        events.publish("state", {"status": "stopped", "name": self.name})
+
+    def _lifecycle_changed(self):
+        """Called by the outputs when they change lifecycle state."""
+        events.publish("recording", self.as_dict())
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.name,
+            "state": self.state,
+            "error": "; ".join(output.error for output in self.outputs if output.error) or None,
+            "files": [segment.file_name for segment in self.segments],
+            "frames": self.total_frames_recorded,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+    @property
+    def path(self):
+        return self.outputs[0].path
+
+    @property
+    def progress(self) -> Progress:
+        return self.outputs[0].progress
+
+    @property
+    def segments(self) -> list:
+        return [segment for output in self.outputs for segment in output.segments]
+
+    @property
+    def total_frames_recorded(self) -> int:
+        return sum(output.total_frames_recorded for output in self.outputs)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @paused.setter
+    def paused(self, value: bool):
+        self._paused = value
+        for output in self.outputs:
+            output.wake.set()
+
+    def get_loop_stats(self) -> dict:
+        """Seconds the capture loops spent in each state, summed over all outputs."""
+        stats = dict.fromkeys(LOOP_STATES, 0.0)
+        for output in self.outputs:
+            for state, seconds in output.get_loop_stats().items():
+                stats[state] += seconds
+        return {k: round(v, 3) for k, v in stats.items()}
+
+    def join(self):
+        """Wait until every output finished writing."""
+        for output in self.outputs:
+            output.record_thread.join()
 
     def get_status(self):
         if self.cut:
             return {}
 
-        raw_stat = self.status.split(sep="=")
-        raw_stat = [x.strip() for x in raw_stat]
-        listed = []
-        for s in raw_stat:
-            listed.extend(s.split())
-        # pair up the values
-        status = {}
-        for i in range(0, len(listed) - 1, 2):
-            status[listed[i]] = listed[i + 1]
-        return status
+        return self.outputs[0].segment.progress.status()
 
     def end_recording(self):
+        """Stop capturing, returns once every output let go of its frame source.
+        The encoders finish writing in the background."""
         self.cut = True
 
-        # stop the status thread
-        self.end_status_flag.set()
         self.end_record_flag.set()
+        for output in self.outputs:
+            output.wake.set()
+            # a capture device can block in get_latest_frame while the screen does not change
+            output.source.stop()
+        # the next recording may get the same capture device (dxcam has one per output)
+        deadline = perf_counter() + RELEASE_TIMEOUT
+        for output in self.outputs:
+            if not output.released.wait(max(0.0, deadline - perf_counter())):
+                print(f"Capture of {output.name} did not stop within {RELEASE_TIMEOUT}s")
 
 
 # ==========INTERFACE==========
 ACTIVE_RECORDER: Recorder = None
+SESSIONS = {}  # name -> Recorder, the active one, the finalising ones and the last finished ones
 
 
 def is_recording() -> bool:
@@ -216,14 +601,17 @@ def start() -> str:
     """Start or resume recording."""
     global ACTIVE_RECORDER
     if not is_recording():
-        # Make a new recorder
+        # Make a new recorder, earlier ones may still be finalising in the background
         ACTIVE_RECORDER = Recorder()
+        _keep_session(ACTIVE_RECORDER)
         print("Started recording")
+        events.publish("state", {"status": "started", "name": ACTIVE_RECORDER.name})
         return ACTIVE_RECORDER.file_name
 
     if ACTIVE_RECORDER.paused:
         ACTIVE_RECORDER.paused = False
         print("Resumed recording")
+        events.publish("state", {"status": "started", "name": ACTIVE_RECORDER.name})
 
 
 def stop() -> str:
@@ -234,10 +622,35 @@ def stop() -> str:
     ACTIVE_RECORDER.end_recording()
     filename = ACTIVE_RECORDER.file_name
     print("Stopped recording")
+    events.publish("state", {"status": "stopped", "name": ACTIVE_RECORDER.name})
     ACTIVE_RECORDER = None
     return filename
 
 
+def _keep_session(recorder: Recorder):
+    SESSIONS[recorder.name] = recorder
+    finished = [name for name, session in SESSIONS.items() if session.finished is not None]
+    for name in finished[: max(0, len(finished) - MAX_SESSIONS_KEPT)]:
+        del SESSIONS[name]
+
+
+def sessions() -> list:
+    """Every recording this run still knows about, oldest first."""
+    return [session.as_dict() for session in list(SESSIONS.values())]
+
+
+def wait_finalised(timeout: float = None) -> bool:
+    """Wait until every stopped recording finished writing its files, False on timeout."""
+    deadline = None if timeout is None else perf_counter() + timeout
+    for session in list(SESSIONS.values()):
+        for output in session.outputs:
+            remaining = None if deadline is None else max(0.0, deadline - perf_counter())
+            output.record_thread.join(remaining)
+            if output.record_thread.is_alive():
+                return False
+    return True
+
+
 def pause() -> None:
     """Pause the recording if it is active."""
     global ACTIVE_RECORDER
@@ -245,6 +658,7 @@ def pause() -> None:
         return
     ACTIVE_RECORDER.paused = True
     print("Paused recording")
+    events.publish("state", {"status": "paused", "name": ACTIVE_RECORDER.name})
 
 
 if __name__ == "__main__":
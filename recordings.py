@@ -0,0 +1,277 @@
+"""Catalog of the recordings in the Records folder for the web interface.
+
+A recording is every segment file of every screen of one recording name, see
+recorder.Segment. Per recording the catalog knows its files, size, duration,
+start date, the apps that were recorded and its thumbnail.
+
+The catalog is kept up to date incrementally: a refresh lists the Records
+and .thumbnails folders once and only looks again at the files whose size or
+modification time changed and at the recordings that got new focus spans in
+the span catalog. Durations come from the span catalog, only clips without
+spans (recorded before it existed) are probed with ffmpeg, outside the lock
+so the probes do not hold up other requests. The per file results are kept
+in .metadata/recordings.json so a restart does not probe again. Every change of the catalog gets a new ETag.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading as tr
+from datetime import datetime
+from functools import lru_cache
+from time import monotonic
+
+import catalog
+import settings
+
+REFRESH_SECONDS = 2  # the folders are listed at most this often
+# <name>[_screen<n>]_<index>.mkv, recordings made before segments were just <name>.mkv
+SEGMENT_PATTERN = re.compile(r"^(?P<name>.+?)(?:_screen(?P<screen>\d+))?(?:_(?P<index>\d{3}))?\.mkv$")
+DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d\d):(\d\d(?:\.\d+)?)")
+
+_LOCK = tr.Lock()
+_FILES = {}  # file name -> [mtime_ns, size, probed duration or None]
+_RECORDINGS = {}  # recording name -> summary dict
+_DIGESTS = {}  # recording name -> digest of its summary
+_ORDER = []  # recording names, newest first
+_ETAG = None
+_LAST_SPAN = 0  # highest span id looked at
+_REFRESHED = None  # monotonic time of the last refresh
+_LOADED = False
+
+
+def cache_path():
+    return settings.HOME_DIR / ".metadata" / "recordings.json"
+
+
+def probe_duration(path) -> float:
+    """Duration of a finalised clip from its header, None if ffmpeg does not know it (yet)."""
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(path)], capture_output=True)
+    match = DURATION_PATTERN.search(result.stderr.decode(errors="replace"))
+    if match is None:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _load():
+    global _FILES, _LAST_SPAN, _LOADED
+    _LOADED = True
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        _FILES = cached["files"]
+        _LAST_SPAN = cached["last_span"]
+    except (FileNotFoundError, ValueError, KeyError):
+        _FILES, _LAST_SPAN = {}, 0
+
+
+def _save():
+    try:
+        path = cache_path()
+        temp = path.with_suffix(".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"files": _FILES, "last_span": _LAST_SPAN}))
+        os.replace(temp, path)
+    except OSError as e:
+        print(f"Could not save the recordings catalog: {e}")
+
+
+def _list(folder, stat: bool = True) -> dict:
+    """name -> stat result of the files in the folder, one directory listing."""
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name: entry.stat() if stat else None for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _parse(file_name: str):
+    """(recording name, output name) of a segment file, None for other files."""
+    match = SEGMENT_PATTERN.match(file_name)
+    if match is None:
+        return None
+    name, screen, _ = match.groups()
+    return name, f"{name}_screen{screen}" if screen else name
+
+
+def _span_stats(db, outputs: list) -> dict:
+    """Per clip of the outputs: first span start, last frame and frames per app."""
+    stats = {}
+    rows = db.execute(
+        f"""SELECT clip, app, MIN(started), MAX(end_frame), SUM(end_frame - start_frame) FROM spans
+        WHERE recording IN ({', '.join('?' * len(outputs))}) GROUP BY clip, app""",
+        outputs,
+    )
+    for clip, app, started, end_frame, frames in rows:
+        clip_stats = stats.setdefault(clip, {"started": started, "end_frame": 0, "apps": {}})
+        clip_stats["started"] = min(clip_stats["started"], started)
+        clip_stats["end_frame"] = max(clip_stats["end_frame"], end_frame)
+        clip_stats["apps"][app] = clip_stats["apps"].get(app, 0) + frames
+    return stats
+
+
+def _summarise(db, name: str, files: list, thumbnails: set, unprobed: dict) -> dict:
+    """Summary of one recording from its segment files, sorted by screen and index.
+    Clips that still need probing count as 0 seconds and are added to unprobed."""
+    outputs = sorted({output for output, _ in files})
+    stats = _span_stats(db, outputs)
+    durations = {}  # seconds per screen, the screens of a recording run side by side
+    apps = {}
+    started, modified, size = None, 0, 0
+    for output, file_name in files:
+        mtime_ns, file_size, probed = _FILES[file_name]
+        clip = stats.get(file_name)
+        if clip is not None:
+            duration = clip["end_frame"] / settings.FRAME_RATE
+            started = min(started or clip["started"], clip["started"])
+            for app, frames in clip["apps"].items():
+                apps[app] = apps.get(app, 0) + frames
+        else:
+            if probed is None:
+                unprobed[file_name] = (mtime_ns, file_size)
+            duration = probed or 0.0
+        durations[output] = durations.get(output, 0.0) + duration
+        modified = max(modified, mtime_ns / 1e9)
+        size += file_size
+
+    duration = max(durations.values())
+    if started is None:
+        started = modified - duration
+    thumbnail = next((f"{output}.webp" for output in outputs if f"{output}.webp" in thumbnails), None)
+    return {
+        "id": name,
+        "title": name.replace("_", " "),
+        "files": [file_name for _, file_name in files],
+        "screens": len(outputs),
+        "size": size,
+        "duration": round(duration, 2),
+        "started": started,
+        "date": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+        "apps": sorted(apps, key=apps.get, reverse=True),
+        "thumbnail": f"/api/media/thumbnails/{thumbnail}" if thumbnail else None,
+    }
+
+
+def refresh(force: bool = False):
+    """Bring the catalog up to date with the Records folder, at most every REFRESH_SECONDS."""
+    with _LOCK:
+        if not force and _REFRESHED is not None and monotonic() - _REFRESHED < REFRESH_SECONDS:
+            return
+        unprobed = _update()
+    if not unprobed:
+        return
+
+    # one ffmpeg per clip, the catalog stays usable meanwhile
+    durations = {file_name: probe_duration(settings.HOME_DIR / "Records" / file_name) for file_name in unprobed}
+    with _LOCK:
+        probed = set()
+        for file_name, duration in durations.items():
+            known = _FILES.get(file_name)
+            if known is not None and tuple(known[:2]) == unprobed[file_name]:
+                known[2] = duration
+                probed.add(_parse(file_name)[0])
+        # clips that cannot be probed yet are tried again when their recording changes
+        if probed:
+            _update(probed)
+
+
+def _update(stale: set = frozenset()) -> dict:
+    """Refresh with _LOCK held, the recordings in stale are summarised again.
+    Returns file name -> (mtime_ns, size) of the clips that need probing."""
+    global _RECORDINGS, _ORDER, _ETAG, _LAST_SPAN, _REFRESHED
+    _REFRESHED = monotonic()
+    if not _LOADED:
+        _load()
+
+    listing = _list(settings.HOME_DIR / "Records")
+    thumbnails = set(_list(settings.HOME_DIR / ".thumbnails", stat=False))
+    changed = set(stale)  # recording names to summarise again
+
+    segments = {}  # recording name -> [(output, file name)]
+    for file_name, stat in listing.items():
+        parsed = _parse(file_name)
+        if parsed is None:
+            continue
+        name, output = parsed
+        segments.setdefault(name, []).append((output, file_name))
+        known = _FILES.get(file_name)
+        if known is None or known[0] != stat.st_mtime_ns or known[1] != stat.st_size:
+            _FILES[file_name] = [stat.st_mtime_ns, stat.st_size, None]
+            changed.add(name)
+    for file_name in set(_FILES) - set(listing):
+        del _FILES[file_name]
+    # recordings whose files were deleted, that are new to this process or whose thumbnail changed
+    changed |= set(_RECORDINGS) - set(segments)
+    changed |= set(segments) - set(_RECORDINGS)
+    for name, summary in _RECORDINGS.items():
+        has_thumbnail = any(f"{output}.webp" in thumbnails for output, _ in segments.get(name, []))
+        if has_thumbnail != (summary["thumbnail"] is not None):
+            changed.add(name)
+
+    unprobed = {}
+    db = catalog.connect()
+    try:
+        # recordings that got focus spans since the last refresh
+        last_span = db.execute("SELECT MAX(id) FROM spans").fetchone()[0] or 0
+        if last_span != _LAST_SPAN:
+            for (output,) in db.execute("SELECT DISTINCT recording FROM spans WHERE id > ?", (_LAST_SPAN,)):
+                match = re.match(r"^(.+?)(?:_screen\d+)?$", output)
+                changed.add(match.group(1))
+            _LAST_SPAN = last_span
+        if not changed and _ETAG is not None:
+            return unprobed
+
+        recordings = dict(_RECORDINGS)
+        for name in changed:
+            if name in segments:
+                files = sorted(segments[name])
+                recordings[name] = _summarise(db, name, files, thumbnails, unprobed)
+                _DIGESTS[name] = hashlib.sha1(json.dumps(recordings[name]).encode()).digest()
+            else:
+                recordings.pop(name, None)
+                _DIGESTS.pop(name, None)
+    finally:
+        db.close()
+
+    _RECORDINGS = recordings
+    _ORDER = sorted(recordings, key=lambda name: recordings[name]["started"], reverse=True)
+    _ETAG = hashlib.sha1(b"".join(_DIGESTS[name] for name in _ORDER)).hexdigest()[:16]
+    _save()
+    return unprobed
+
+
+def etag() -> str:
+    """Tag of the current state of the catalog, it changes whenever a recording changes."""
+    refresh()
+    return _ETAG
+
+
+def page(offset: int = 0, limit: int = 50, app: str = None, since: float = None, until: float = None, text: str = None) -> dict:
+    """One page of recordings, newest first.
+
+    Args:
+        app (str): Only recordings in which this app was recorded.
+        since (float): Only recordings started after this unix time.
+        until (float): Only recordings started before this unix time.
+        text (str): Only recordings whose name contains the text.
+    Returns:
+        dict: total matching recordings, offset, limit and the recordings of the page as items.
+    """
+    refresh()
+    recordings, order = _RECORDINGS, _ORDER  # replaced, never changed in place, by refresh
+    if app or since is not None or until is not None or text:
+        text = text and text.lower()
+        order = [
+            name
+            for name in order
+            if (not app or app in recordings[name]["apps"])
+            and (since is None or recordings[name]["started"] >= since)
+            and (until is None or recordings[name]["started"] <= until)
+            and (not text or text in recordings[name]["title"].lower())
+        ]
+    items = [recordings[name] for name in order[offset : offset + limit]]
+    return {"total": len(order), "offset": offset, "limit": limit, "items": items}
@@ -6,9 +6,21 @@ RUN_ON_BOOT: bool = False
 FRAME_RATE: int = 30
 THUMBNAIL_RESOLUTION_REDUCTION: int = 5
 THUMBNAIL_SECONDS_INTERVAL: int = 100  # in seconds
-CHANGE_THRESHOLD = 2500  # sub-pixels
-USE_AUTOTRIGGER = False
+CHANGE_FRACTION = 0.006  # share of the sampled pixels that has to change to record a frame
+IGNORE_REGIONS = []  # [x, y, width, height] screen areas that never count as change, e.g. the clock
+IGNORE_CURSOR_RADIUS = 0  # pixels around the mouse cursor that never count as change, 0 disables
+AUTO_CALIBRATE = False  # learn noisy areas and the threshold from the first seconds of a recording
+CALIBRATION_SECONDS = 3
+USE_AUTOTRIGGER = True  # start recording when a whitelisted app gets the focus
 QUALITY = 32
+TARGET_MB_PER_HOUR = 2000  # output size per hour of recorded video the encoder calibration aims for
+FRAME_SOURCE = "dxcam"  # dxcam, synthetic or replay
+CAPTURE_OUTPUTS = [0]  # indices of the monitors to record, or "all"
+REPLAY_PATH = ""  # video file or image folder played by the replay frame source
+WRITER_RING_SLOTS = 8  # frames buffered between capture and ffmpeg
+SEGMENT_MAX_MINUTES = 60  # minutes of video per file before rolling over, 0 disables
+SEGMENT_MAX_MB = 2000  # file size before rolling over, 0 disables
+METRICS = True  # time the stages of the capture loop for /api/metrics
 #GENERATED-VARIABLES--------------------------------
 HOME_DIR: Path = Path("D:/Videos") / "SempRecord"
 
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import settings  # noqa: E402
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """An empty home folder for the recordings, timelines and extracts of one test."""
+    for folder in ("Records", "Timelines", "Extracts", ".thumbnails", ".metadata", ".settings"):
+        (tmp_path / folder).mkdir()
+    monkeypatch.setattr(settings, "HOME_DIR", tmp_path)
+    return tmp_path
@@ -0,0 +1,138 @@
+import http.client
+import threading
+from time import sleep
+
+import pytest
+
+import api
+import framesource
+import recorder
+
+
+def follow(client, location: str, timeout: float = 30) -> dict:
+    """Poll a job until it finished."""
+    for _ in range(int(timeout / 0.05)):
+        job = client.get(location).get_json()
+        if job["finished"] is not None:
+            return job
+        sleep(0.05)
+    pytest.fail(f"{location} did not finish")
+
+
+def test_controls_run_without_a_tray(home, monkeypatch):
+    monkeypatch.setattr(
+        framesource, "open_sources", lambda: [framesource.SyntheticSource((320, 180), realtime=True)]
+    )
+    client = api.app.test_client()
+
+    response = client.post("/api/controls/start")
+    assert response.status_code == 202
+    job = follow(client, response.headers["Location"])
+    assert job["state"] == "done", job["error"]
+    assert recorder.is_recording()
+    name = recorder.ACTIVE_RECORDER.name
+
+    job = follow(client, client.post("/api/controls/pause").headers["Location"])
+    assert job["state"] == "done", job["error"]
+    assert recorder.ACTIVE_RECORDER.paused
+
+    job = follow(client, client.post("/api/controls/stop").headers["Location"])
+    assert job["state"] == "done", job["error"]
+    assert not recorder.is_recording()
+    assert recorder.wait_finalised(60)
+    assert client.get(f"/api/jobs/{name}").get_json()["state"] == "done"
+
+
+def test_media_answers_byte_ranges(home):
+    data = bytes(range(256)) * 64
+    (home / "Records" / "clip_001.mkv").write_bytes(data)
+    client = api.app.test_client()
+
+    response = client.get("/api/media/records/clip_001.mkv", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.data == data[100:200]
+    assert response.mimetype == "video/x-matroska"
+    assert client.get("/api/media/records/../settings.yaml").status_code == 404
+    assert client.get("/api/media/nowhere/clip_001.mkv").status_code == 404
+
+
+def test_extraction_only_takes_apps_with_a_timeline(home):
+    (home / "Timelines" / "Editor 1.edl").write_text("TITLE: Editor\n", encoding="utf-8")
+    client = api.app.test_client()
+
+    response = client.post("/api/extract", json={"apps": ["Editor", "../../outside"]})
+    assert response.status_code == 404
+    assert response.get_json()["apps"] == ["../../outside"]
+    assert client.post("/api/extract", json={"apps": "Editor"}).status_code == 400
+    assert not list((home / "Extracts").iterdir())
+
+
+def test_event_streams_are_capped():
+    client = api.app.test_client()
+    streams = [client.get("/api/events", buffered=False) for _ in range(api.MAX_EVENT_STREAMS)]
+    try:
+        assert all(stream.status_code == 200 for stream in streams)
+        assert client.get("/api/events", buffered=False).status_code == 503
+
+        streams.pop().close()
+        streams.append(client.get("/api/events", buffered=False))
+        assert streams[-1].status_code == 200
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+@pytest.mark.parametrize(
+    "body, status",
+    [
+        (None, 400),
+        ({"speed": 10}, 400),
+        ({"app": ["App"]}, 400),
+        ({"app": "App", "speed": "fast"}, 400),
+        ({"app": "App", "speed": 0}, 400),
+        ({"app": "App", "speed": 2.5}, 400),
+        ({"app": "App", "speed": True}, 400),
+        ({"app": "Unknown", "speed": 10}, 404),
+    ],
+)
+def test_timelapse_requests_are_validated(home, body, status):
+    (home / "Timelines" / "App 1.edl").write_text("TITLE: App\n")
+    response = api.app.test_client().post("/api/timelapse", json=body)
+    assert response.status_code == status
+    assert response.get_json()["error"]
+
+
+def test_a_slow_media_client_does_not_hold_a_worker(home):
+    waitress = pytest.importorskip("waitress")
+    data = bytes(range(256)) * 64
+    with open(home / "Records" / "clip_001.mkv", "wb") as f:
+        f.write(data)
+        f.truncate(64 << 20)  # more than waitress buffers for a client that does not read
+    sockets = {}
+    server = waitress.create_server(api.app, map=sockets, host="127.0.0.1", port=0, threads=1)
+    stopping = threading.Event()
+
+    def serve():
+        while not stopping.is_set():
+            server.asyncore.loop(timeout=0.05, map=sockets, count=1)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        slow = http.client.HTTPConnection("127.0.0.1", server.effective_port, timeout=10)
+        slow.request("GET", "/api/media/records/clip_001.mkv", headers={"Range": "bytes=100-"})
+        assert slow.getresponse().status == 206  # and never read the body
+
+        # the only worker is free for the next request
+        other = http.client.HTTPConnection("127.0.0.1", server.effective_port, timeout=10)
+        other.request("GET", "/api/media/records/clip_001.mkv", headers={"Range": "bytes=100-199"})
+        response = other.getresponse()
+        assert response.status == 206
+        assert response.read() == data[100:200]
+        slow.close()
+        other.close()
+    finally:
+        stopping.set()
+        thread.join()
+        server.close()
+        server.task_dispatcher.shutdown()
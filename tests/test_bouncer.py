@@ -0,0 +1,42 @@
+import pytest
+
+import bouncer
+
+
+@pytest.fixture
+def unloaded(home, monkeypatch):
+    """The bouncer as right after import, with lists on disk that it has not read yet."""
+    (home / ".settings" / "whitelist.txt").write_text("Visual Studio Code\nMozilla Firefox\nTerminal\n")
+    (home / ".settings" / "blacklist.txt").write_text("Private Browsing\nBank\n")
+    lists = bouncer.WHITELIST, bouncer.BLACKLIST
+    bouncer.set_lists([], [])
+    monkeypatch.setattr(bouncer, "_LOADED", False)
+    yield home
+    bouncer.set_lists(*lists)
+
+
+def test_the_lists_are_read_on_first_use(unloaded):
+    assert bouncer.WHITELIST == ()
+    assert bouncer.admit("main.py - Visual Studio Code") == "Visual Studio Code"
+    assert bouncer.WHITELIST == ("Visual Studio Code", "Mozilla Firefox", "Terminal")
+
+
+@pytest.mark.parametrize(
+    "title, verdict",
+    [
+        ("Terminal - bash", "Terminal"),  # starts with a rule
+        ("Release notes - Mozilla Firefox", "Mozilla Firefox"),  # ends with a rule
+        ("Mozilla Firefox Private Browsing", False),  # the blacklist wins
+        ("My Bank - Mozilla Firefox", False),
+        ("Notes about Terminal settings", False),  # contains a rule, neither starts nor ends with it
+        ("", False),  # nothing focused
+    ],
+)
+def test_admit(unloaded, title, verdict):
+    assert bouncer.admit(title) == verdict
+
+
+def test_changed_lists_take_effect_at_once(unloaded):
+    assert bouncer.admit("Terminal - bash") == "Terminal"
+    bouncer.set_lists(["Editor"], ["bash"])
+    assert bouncer.admit("Terminal - bash") is False
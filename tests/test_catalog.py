@@ -0,0 +1,14 @@
+import catalog
+
+
+def test_spans_are_searchable_after_a_flush(home):
+    catalog.add_span("rec", "rec_001.mkv", "Browser", "Release notes - Mozilla Firefox", 0, 60, started=100.0)
+    catalog.add_span("rec", "rec_001.mkv", "Editor", "catalog.py - Visual Studio Code", 60, 90, started=102.0)
+    catalog.flush()
+
+    [span] = catalog.search("relea")  # the last word matches as a prefix
+    assert span["app"] == "Browser"
+    assert (span["start_ms"], span["end_ms"]) == (0, 60 * 1000 // catalog.settings.FRAME_RATE)
+    assert [span["app"] for span in catalog.search("code", app="Editor")] == ["Editor"]
+    assert catalog.search("code", app="Browser") == []
+    assert catalog.search("   ") == []
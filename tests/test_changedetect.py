@@ -0,0 +1,38 @@
+import numpy as np
+
+from changedetect import ChangeDetector
+
+RESOLUTION = (1280, 720)
+
+
+def frames(change):
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (RESOLUTION[1], RESOLUTION[0], 3), dtype=np.uint8)
+    for i in range(30):
+        frame = frame.copy()
+        change(frame, i)
+        yield frame
+
+
+def blinking_caret(frame, i):
+    frame[300:320, 400:402] = 255 if i % 2 else 0
+
+
+def scrolling(frame, i):
+    frame[:] = np.roll(frame, 8, axis=0)
+
+
+def test_calibration_masks_a_blinking_caret():
+    detector = ChangeDetector(RESOLUTION, regions=[], cursor_radius=0)
+    detector.calibrate(frames(blinking_caret))
+    assert detector.learned_mask.sum() == 1
+
+
+def test_calibration_on_a_busy_screen_is_discarded():
+    detector = ChangeDetector(RESOLUTION, regions=[], cursor_radius=0)
+    threshold = detector.threshold
+    detector.calibrate(frames(scrolling))
+    assert not detector.learned_mask.any()
+    assert detector.threshold == threshold
+    a, b = list(frames(scrolling))[:2]
+    assert detector.changed(a, b)
@@ -0,0 +1,48 @@
+import pytest
+
+import encoder_profile
+
+
+def sizes(fits_from: int, too_slow_below: int = 0):
+    """A fake trial whose size halves every 6 quality steps and reaches the target at fits_from."""
+    tried = []
+
+    def run(quality):
+        tried.append(quality)
+        if quality < too_slow_below:
+            return None
+        size = encoder_profile.target_bytes_per_frame() * 2 ** ((fits_from - quality) / 6)
+        return {"fps": 60.0, "bytes_per_frame": size}
+
+    return run, tried
+
+
+@pytest.mark.parametrize(
+    "fits_from, too_slow_below, quality, tried",
+    [
+        (36, 0, 38, [32, 35, 38]),  # too big at settings.QUALITY, stepped up until it fits
+        (24, 0, 26, [32, 29, 26, 23]),  # room to spare, stepped down while it fits
+        (24, 28, 29, [32, 29, 26]),  # better quality would not be real time any more
+        (60, 0, 41, [32, 35, 38, 41]),  # never fits, the smallest is taken
+    ],
+)
+def test_the_quality_is_picked_against_the_size_target(monkeypatch, fits_from, too_slow_below, quality, tried):
+    monkeypatch.setattr(encoder_profile.settings, "QUALITY", 32)
+    run, calls = sizes(fits_from, too_slow_below)
+    picked, result = encoder_profile.pick_quality(run)
+    assert picked == quality
+    assert calls == tried
+
+
+def test_a_trial_runs_the_encoders_of_a_recording_side_by_side(tmp_path, monkeypatch):
+    monkeypatch.setattr(encoder_profile, "TRIAL_SECONDS", 1)
+    monkeypatch.setattr(encoder_profile.settings, "CAPTURE_OUTPUTS", [0])
+    assert encoder_profile.concurrent_encoders() == 2  # the output and its standby encoder
+    resolution = (320, 180)
+    profile = {"codec": "libx265", "preset": "ultrafast", "quality": 32, "threads": 1}
+
+    pool = encoder_profile._frame_pool(resolution)
+    result = encoder_profile.trial(profile, resolution, pool, tmp_path, 2)
+    assert result is not None and result["bytes_per_frame"] > 0
+    assert len(list(tmp_path.glob("*.mkv"))) == 2
+    assert encoder_profile.trial({**profile, "codec": "no_such_encoder"}, resolution, pool, tmp_path, 2) is None
@@ -0,0 +1,49 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import extractor
+import settings
+import timelines
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg on the PATH")
+
+
+def record_clip(path, frames: int):
+    """A clip encoded like the recorder does: libx265, closed GOPs, B-frames, full range."""
+    subprocess.run(
+        [
+            "ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", f"testsrc=size=320x180:rate={settings.FRAME_RATE}",
+            "-frames:v", str(frames), "-c:v", "libx265", "-crf", "32", "-preset", "veryfast",
+            "-x265-params", "open-gop=0:keyint=250:log-level=error", "-pix_fmt", "yuv420p",
+            "-color_primaries", "bt709", "-color_trc", "iec61966-2-1", "-colorspace", "bt709", "-color_range", "pc",
+            str(path),
+        ],
+        check=True,
+    )  # fmt: skip
+
+
+def frame_times(path) -> list:
+    log = subprocess.run(
+        ["ffmpeg", "-i", str(path), "-vf", "showinfo", "-f", "null", "-"], capture_output=True, text=True
+    ).stderr
+    return [float(t) for t in re.findall(r"pts_time:([\d.]+)", log)]
+
+
+def test_extracted_take_has_every_frame_once(home):
+    record_clip(home / "Records" / "clip_001.mkv", 900)
+    writer = timelines.EdlDataWriter("App")
+    writer.add_entry(100, 800, "clip_001.mkv")  # a re-encoded edge on both sides of the copied middle
+    writer.close()
+
+    job = extractor.Extraction("App")
+    job._run()
+    assert job.state == "done", job.error
+    assert job.copied_frames and job.encoded_frames
+
+    times = frame_times(job.output)
+    assert len(times) == 800 - 100
+    steps = [b - a for a, b in zip(times, times[1:])]
+    assert max(steps) < 1.5 / settings.FRAME_RATE, "a gap between the pieces"
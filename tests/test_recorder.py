@@ -0,0 +1,174 @@
+import sys
+import threading
+import types
+from time import sleep
+
+import numpy as np
+import pytest
+
+import bouncer
+import framesource
+import recorder
+import util
+from changedetect import ChangeDetector
+
+TITLE = "Test App"
+
+
+class SharedCamera:
+    """Stands in for a dxcam camera: one object per output, grab() returns None while nothing changed."""
+
+    def __init__(self, output_idx: int):
+        self.width, self.height = 320, 180
+        self.changing = False
+        self.grabs = []  # threads that grabbed, in order
+        self._frame = 0
+
+    def grab(self):
+        self.grabs.append(threading.current_thread())
+        if not self.changing and self._frame:
+            return None
+        self._frame += 1
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame[: self._frame % self.height] = 200
+        return frame
+
+
+@pytest.fixture
+def dxcam(monkeypatch):
+    cameras = {}
+    module = types.ModuleType("dxcam")
+    # like dxcam's factory: creating a camera for an output again returns the existing one
+    module.create = lambda output_idx=0, output_color="RGB": cameras.setdefault(output_idx, SharedCamera(output_idx))
+    monkeypatch.setitem(sys.modules, "dxcam", module)
+    monkeypatch.setattr(framesource, "open_sources", lambda: [framesource.DxcamSource(0)])
+    monkeypatch.setattr(util, "getForegroundWindowTitle", lambda: TITLE)
+    lists = bouncer.WHITELIST, bouncer.BLACKLIST
+    bouncer.set_lists([TITLE], [])
+    yield module
+    bouncer.set_lists(*lists)
+
+
+def wait_until(condition, timeout: float = 10):
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return True
+        sleep(0.02)
+    return False
+
+
+def test_stop_then_start_on_a_static_screen(home, dxcam):
+    camera = dxcam.create(0)
+    recorder.start()
+    first = recorder.ACTIVE_RECORDER
+    # the screen does not change, the capture loop waits for a frame
+    assert wait_until(lambda: len(camera.grabs) > 2)
+
+    recorder.stop()
+    old_thread = first.outputs[0].record_thread
+    assert first.outputs[0].released.is_set(), "stop returned before the capture let go of the camera"
+
+    recorder.start()
+    second = recorder.ACTIVE_RECORDER
+    assert second.outputs[0].source.camera is camera
+    camera.changing = True
+    assert wait_until(lambda: second.total_frames_recorded >= 5), "the new recording captures nothing"
+    assert old_thread not in camera.grabs[camera.grabs.index(second.outputs[0].record_thread) :]
+
+    recorder.stop()
+    assert recorder.wait_finalised(60)
+    assert first.state == second.state == "done"
+
+
+def test_calibration_on_an_idle_screen_ends_in_time(home, dxcam, monkeypatch):
+    monkeypatch.setattr(recorder.settings, "AUTO_CALIBRATE", True)
+    monkeypatch.setattr(recorder.settings, "CALIBRATION_SECONDS", 0.5)
+    calibrated = []
+    monkeypatch.setattr(ChangeDetector, "finish_calibration", lambda self: calibrated.append(len(self._samples)))
+    camera = dxcam.create(0)
+    recorder.start()
+    recording = recorder.ACTIVE_RECORDER
+
+    # nothing changes on screen, the calibration samples the same frame until its time is up
+    assert wait_until(lambda: calibrated, timeout=2), "the calibration waits for the screen to change"
+    assert calibrated[0] >= 5
+
+    camera.changing = True
+    assert wait_until(lambda: recording.total_frames_recorded >= 5)
+    recorder.stop()
+    assert recorder.wait_finalised(60)
+    assert recording.state == "done"
+
+
+def test_frames_are_recorded_while_calibrating(home, dxcam, monkeypatch):
+    monkeypatch.setattr(recorder.settings, "AUTO_CALIBRATE", True)
+    monkeypatch.setattr(recorder.settings, "CALIBRATION_SECONDS", 60)
+    camera = dxcam.create(0)
+    camera.changing = True
+    recorder.start()
+    recording = recorder.ACTIVE_RECORDER
+
+    assert wait_until(lambda: recording.total_frames_recorded >= 5, timeout=5)
+    assert recording.outputs[0].detector._samples, "the calibration has not started"
+    recorder.stop()
+    assert recorder.wait_finalised(60)
+    assert recording.state == "done"
+
+
+def test_the_next_encoder_starts_shortly_before_a_rollover(home, monkeypatch):
+    monkeypatch.setattr(recorder.settings, "SEGMENT_MAX_MINUTES", 0.1)  # 6 seconds
+    monkeypatch.setattr(recorder.settings, "SEGMENT_MAX_MB", 0)
+    monkeypatch.setattr(recorder, "STANDBY_LEAD_SECONDS", 1)
+    started_at = []  # frames in the current segment when the standby was started
+    start_standby = recorder.OutputRecorder._start_standby
+
+    def logged(self):
+        started_at.append(self.segment.frames)
+        start_standby(self)
+
+    monkeypatch.setattr(recorder.OutputRecorder, "_start_standby", logged)
+    lists = bouncer.WHITELIST, bouncer.BLACKLIST
+    bouncer.set_lists([TITLE], [])
+    try:
+        source = framesource.SyntheticSource((320, 180), [("scroll", 400, TITLE)], loop=False)
+        recording = recorder.Recorder(source=source)
+        recording.join()
+    finally:
+        bouncer.set_lists(*lists)
+
+    per_segment = 6 * recorder.settings.FRAME_RATE
+    assert [segment.frames for segment in recording.segments] == [per_segment, per_segment, 400 - 2 * per_segment - 1]
+    assert started_at == [per_segment - recorder.settings.FRAME_RATE] * 2
+    assert recording.state == "done", recording.as_dict()["error"]
+    assert all(segment.path.exists() for segment in recording.segments)
+
+
+@pytest.mark.parametrize(
+    "outputs, state",
+    [
+        (("done", "failed"), "failed"),
+        (("failed", "finalising"), "finalising"),
+        (("capturing", "failed"), "capturing"),
+        (("done", "done"), "done"),
+    ],
+)
+def test_a_failed_output_fails_the_recording(outputs, state):
+    recording = recorder.Recorder.__new__(recorder.Recorder)
+    recording.outputs = [types.SimpleNamespace(lifecycle=lifecycle) for lifecycle in outputs]
+    assert recording.state == state
+
+
+def test_a_bad_codec_fails_the_recording(home, monkeypatch):
+    monkeypatch.setattr(recorder, "codec_options", lambda width, height: dict(vcodec="no_such_encoder"))
+    script = [("typing", 300, TITLE)]
+    lists = bouncer.WHITELIST, bouncer.BLACKLIST
+    bouncer.set_lists([TITLE], [])
+    try:
+        recording = recorder.Recorder(source=framesource.SyntheticSource((320, 180), script, loop=False))
+        recording.join()
+    finally:
+        bouncer.set_lists(*lists)
+
+    assert recording.cut, "the recording still counts as recording without an encoder"
+    assert recording.state == "failed"
+    assert "no_such_encoder" in recording.as_dict()["error"], recording.as_dict()["error"]
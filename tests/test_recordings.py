@@ -0,0 +1,35 @@
+import pytest
+
+import recordings
+
+
+@pytest.fixture
+def fresh_catalog(home, monkeypatch):
+    for name, value in (("_FILES", {}), ("_RECORDINGS", {}), ("_DIGESTS", {}), ("_ORDER", []),
+                        ("_ETAG", None), ("_LAST_SPAN", 0), ("_REFRESHED", None), ("_LOADED", False)):
+        monkeypatch.setattr(recordings, name, value)
+    return home
+
+
+def test_old_recordings_are_probed_without_holding_the_catalog(fresh_catalog, monkeypatch):
+    (fresh_catalog / "Records" / "old_recording.mkv").write_bytes(b"old")
+    (fresh_catalog / "Records" / "new_recording_001.mkv").write_bytes(b"new")
+    (fresh_catalog / "Records" / "notes.txt").write_bytes(b"not a clip")
+    probed = []
+
+    def probe(path):
+        assert not recordings._LOCK.locked(), "probing while the catalog is locked"
+        probed.append(path.name)
+        return 12.5
+
+    monkeypatch.setattr(recordings, "probe_duration", probe)
+    page = recordings.page()
+
+    assert sorted(probed) == ["new_recording_001.mkv", "old_recording.mkv"]
+    by_id = {item["id"]: item for item in page["items"]}
+    assert by_id.keys() == {"old_recording", "new_recording"}
+    assert by_id["old_recording"]["files"] == ["old_recording.mkv"]
+    assert by_id["old_recording"]["duration"] == by_id["new_recording"]["duration"] == 12.5
+
+    recordings.refresh(force=True)
+    assert len(probed) == 2, "unchanged clips were probed again"
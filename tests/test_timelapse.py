@@ -0,0 +1,44 @@
+import shutil
+from time import sleep
+
+import pytest
+
+import api
+import settings
+import timelapse
+import timelines
+from test_extractor import frame_times, record_clip
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg on the PATH")
+
+
+def test_the_pace_carries_over_from_take_to_take(home):
+    (home / "Records" / "clip_001.mkv").touch()
+    takes = [timelines.Take("clip_001.mkv", 0, 7), timelines.Take("clip_001.mkv", 20, 30)]
+    chunks = timelapse.plan_chunks(takes, 5)
+    # frames 0 and 5 of the first take, the timeline goes on with frame 3 of the second
+    assert [(chunk.start_frame, chunk.frames) for chunk in chunks] == [(0, 2), (23, 2)]
+
+
+def test_render_a_timelapse_through_the_api(home, monkeypatch):
+    monkeypatch.setattr(timelapse, "CHUNK_SECONDS", 1)  # several chunks to join
+    record_clip(home / "Records" / "clip_001.mkv", 300)
+    writer = timelines.EdlDataWriter("App")
+    writer.add_entry(0, 150, "clip_001.mkv")
+    writer.add_entry(200, 300, "clip_001.mkv")
+    writer.close()
+
+    client = api.app.test_client()
+    job = client.post("/api/timelapse", json={"app": "App", "speed": "5"}).get_json()
+    assert job["speed"] == 5
+    for _ in range(600):
+        job = next(j for j in client.get("/api/timelapse").get_json() if j["id"] == job["id"])
+        if job["finished"] is not None:
+            break
+        sleep(0.05)
+
+    assert job["state"] == "done", job["error"]
+    assert job["chunks"] == job["chunks_done"] == 2
+    times = frame_times(job["output"])
+    assert len(times) == (150 + 100) // 5
+    assert max(b - a for a, b in zip(times, times[1:])) < 1.5 / settings.FRAME_RATE
@@ -0,0 +1,37 @@
+import timelines
+
+
+def test_a_timeline_resumes_and_rolls_over(home, monkeypatch):
+    monkeypatch.setattr(timelines, "EDL_MAX_ENTRIES", 3)
+    writer = timelines.EdlDataWriter("App")
+    writer.add_entry(0, 30, "a_001.mkv")
+    writer.add_entry(60, 90, "a_001.mkv")
+    writer.close()
+
+    # a restart continues the numbering and the timeline after the last entry
+    writer = timelines.EdlDataWriter("App")
+    assert (writer.entry_number, writer.timeline_frame) == (3, 60)
+    writer.add_entry(0, 15, "b_001.mkv")
+    writer.add_entry(15, 45, "b_001.mkv")  # entry 4 does not fit, it starts "App 2.edl"
+    writer.close()
+
+    assert timelines.list_apps() == ["App"]
+    assert (home / "Timelines" / "App 2.edl").exists()
+    assert timelines.read_takes("App") == [
+        timelines.Take("a_001.mkv", 0, 30),
+        timelines.Take("a_001.mkv", 60, 90),
+        timelines.Take("b_001.mkv", 0, 15),
+        timelines.Take("b_001.mkv", 15, 45),
+    ]
+    writer = timelines.EdlDataWriter("App")
+    assert (writer.edl_path.name, writer.entry_number) == ("App 2.edl", 2)
+    writer.close()
+
+
+def test_entries_are_buffered_until_a_flush(home):
+    writer = timelines.EdlDataWriter("App")
+    writer.add_entry(0, 30, "a_001.mkv")
+    assert timelines.read_takes("App") == []
+    writer.flush()
+    assert timelines.read_takes("App") == [timelines.Take("a_001.mkv", 0, 30)]
+    writer.close()
@@ -0,0 +1,57 @@
+import types
+
+import pytest
+
+import util
+
+
+class Desktop:
+    """Stands in for user32: the foreground window and the title of every window."""
+
+    def __init__(self):
+        self.foreground = 1
+        self.titles = {1: "Notes - Editor", 2: "Login - Banking"}
+        self.reads = 0
+
+    def GetForegroundWindow(self):
+        return self.foreground
+
+    def GetWindowTextLengthW(self, hWnd):
+        return len(self.titles[hWnd])
+
+    def GetWindowTextW(self, hWnd, buffer, size):
+        self.reads += 1
+        buffer.value = self.titles[hWnd][: size - 1]
+        return len(buffer.value)
+
+
+@pytest.fixture
+def desktop(monkeypatch):
+    desktop = Desktop()
+    monkeypatch.setattr(util, "windll", types.SimpleNamespace(user32=desktop))
+    monkeypatch.setattr(util, "_last_window", (None, -1, None, 0.0, 0))
+    monkeypatch.setattr(util, "_title_watch", None)
+    watched = []
+    monkeypatch.setattr(util, "_watch_events", lambda events, callback: watched.append(events) or (lambda: None))
+    desktop.watched = watched
+    return desktop
+
+
+def test_the_title_is_read_once_while_nothing_changes(desktop):
+    assert [util.getForegroundWindowTitle() for _ in range(10)] == ["Notes - Editor"] * 10
+    assert desktop.reads == 1
+    assert desktop.watched == [(util.EVENT_SYSTEM_FOREGROUND, util.EVENT_OBJECT_NAMECHANGE)]
+
+
+def test_switching_to_a_window_with_a_title_of_the_same_length(desktop):
+    desktop.titles[2] = "Login - Bankin"
+    assert util.getForegroundWindowTitle() == "Notes - Editor"
+    desktop.foreground = 2  # read well within TITLE_MAX_AGE
+    assert util.getForegroundWindowTitle() == "Login - Bankin"
+
+
+def test_a_title_change_in_the_same_window_drops_the_cached_title(desktop):
+    assert util.getForegroundWindowTitle() == "Notes - Editor"
+    desktop.titles[1] = "Login - Bankin"  # a tab switch, same window and title length
+    util._title_changed()
+    assert util.getForegroundWindowTitle() == "Login - Bankin"
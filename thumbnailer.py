@@ -0,0 +1,124 @@
+"""Thumbnails of recordings, produced while recording without slowing capture down.
+
+Every settings.THUMBNAIL_SECONDS_INTERVAL seconds of recorded video the
+capture loop hands a frame to its ThumbnailProcessor. The processor keeps a
+strided, downscaled copy in a small bounded queue (frames are dropped, never
+waited for, when the queue is full) and a background thread compresses the
+queued frames to QOI files in .cache/<recording>/.
+
+Once the recording stops the cached frames are turned into an animated webp
+preview in .thumbnails/<recording>.webp by a shared pool of worker processes,
+so encoding the preview does not compete with the recorder for the GIL.
+"""
+
+import multiprocessing
+import queue
+import threading as tr
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import settings
+
+QUEUE_SIZE = 4  # downscaled frames waiting to be compressed, newer frames are dropped when full
+PREVIEW_MAX_FRAMES = 60  # frames in a webp preview, spread evenly over the recording
+PREVIEW_FRAME_MS = 400  # display time of a preview frame
+PREVIEW_WORKERS = 2  # processes building webp previews
+
+_POOL = None
+_POOL_LOCK = tr.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawned like on windows, a forked worker would inherit the stdin pipes of running
+            # encoders and keep them open, so those encoders would never see the end of their input
+            _POOL = ProcessPoolExecutor(max_workers=PREVIEW_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _POOL
+
+
+def build_preview(cache_dir: str, preview_path: str) -> str:
+    """Build an animated webp from the QOI frames in cache_dir. Runs in a worker process."""
+    import qoi
+    from PIL import Image
+
+    frames = sorted(Path(cache_dir).glob("*.qoi"))
+    if not frames:
+        return None
+    if len(frames) > PREVIEW_MAX_FRAMES:
+        picks = np.linspace(0, len(frames) - 1, PREVIEW_MAX_FRAMES).round().astype(int)
+        frames = [frames[i] for i in picks]
+
+    images = [Image.fromarray(qoi.read(str(frame))[..., :3]) for frame in frames]
+    images[0].save(
+        preview_path,
+        format="WEBP",
+        save_all=True,
+        append_images=images[1:],
+        duration=PREVIEW_FRAME_MS,
+        loop=0,
+        quality=70,
+    )
+    return preview_path
+
+
+class ThumbnailProcessor:
+    def __init__(self, name: str, reduction: int = None):
+        """
+        Args:
+            name (str): Name of the recording, names the cache folder and the preview.
+            reduction (int): Downscale factor, settings.THUMBNAIL_RESOLUTION_REDUCTION by default.
+        """
+        self.name = name
+        self.reduction = reduction or settings.THUMBNAIL_RESOLUTION_REDUCTION
+        self.interval = max(1, int(settings.THUMBNAIL_SECONDS_INTERVAL * settings.FRAME_RATE))
+        self.cache_dir = settings.HOME_DIR / ".cache" / name
+        self.preview_path = settings.HOME_DIR / ".thumbnails" / f"{name}.webp"
+        self.saved = 0
+        self.dropped = 0
+        self.preview: Future = None
+
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.thread = tr.Thread(target=self._cache_thread, name=f"Thumbnail Thread {name}", daemon=True)
+        self.thread.start()
+
+    def offer(self, frame: np.ndarray, frame_number: int):
+        """Called by the capture loop for every recorded frame, keeps one every interval.
+        Only copies the downscaled pixels and never blocks."""
+        if frame_number % self.interval:
+            return
+        d = self.reduction
+        small = np.ascontiguousarray(frame[::d, ::d])
+        try:
+            self.queue.put_nowait((frame_number, small))
+        except queue.Full:
+            self.dropped += 1
+
+    def _cache_thread(self):
+        import qoi
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        while (item := self.queue.get()) is not None:
+            frame_number, small = item
+            qoi.write(str(self.cache_dir / f"{frame_number:08}.qoi"), small)
+            self.saved += 1
+
+    def close(self) -> Future:
+        """Finish caching and build the preview in the worker pool.
+        Returns the future of the preview path, the caller does not have to wait for it."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        if self.saved:
+            self.preview = _pool().submit(build_preview, str(self.cache_dir), str(self.preview_path))
+            self.preview.add_done_callback(self._report)
+        return self.preview
+
+    def _report(self, future: Future):
+        if future.exception() is not None:
+            print(f"Preview of {self.name} failed: {future.exception()}")
+        else:
+            print(f"Preview saved: {future.result()}")
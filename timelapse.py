@@ -0,0 +1,193 @@
+"""Renders the timeline of an app into a sped-up timelapse.
+
+Every `speed`-th frame of the timeline is kept, counted over the whole
+timeline so the pace does not restart at every take. The kept frames are cut
+into chunks of at most CHUNK_SECONDS of output that are encoded independently
+on all cores, each chunk starts with a keyframe and carries its own headers.
+The chunks are then joined with the concat demuxer without re-encoding.
+
+    python timelapse.py "Visual Studio Code" --speed 20
+"""
+
+import os
+import shutil
+import threading as tr
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import time
+from typing import NamedTuple
+
+import ffmpeg
+
+import recorder
+import settings
+import timelines
+
+CHUNK_SECONDS = 10  # seconds of timelapse per chunk
+TIMELAPSE_CODEC = "libx265"
+TIMELAPSE_PRESET = "medium"  # the timelapse is small, it can afford a slower preset than the recorder
+RENDER_WORKERS = os.cpu_count() or 1  # chunks encoded at the same time
+
+JOBS = {}  # job id -> Timelapse
+
+
+class Chunk(NamedTuple):
+    clip: str  # path of the recording
+    start_frame: int  # first kept frame in the clip
+    frames: int  # kept frames in the chunk
+
+
+def plan_chunks(takes: list, speed: int) -> list:
+    """Split the kept frames of the takes into chunks. Takes whose recording is missing are skipped."""
+    chunk_frames = CHUNK_SECONDS * settings.FRAME_RATE
+    chunks = []
+    position = 0  # frames of the timeline before the current take
+    for take in takes:
+        clip = settings.HOME_DIR / "Records" / take.clip_name
+        length = take.end_frame - take.start_frame
+        first = (-position) % speed  # the first frame of this take that is kept
+        position += length
+        if first >= length or not clip.exists():
+            continue
+        kept = (length - first + speed - 1) // speed
+        for done in range(0, kept, chunk_frames):
+            start = take.start_frame + first + done * speed
+            chunks.append(Chunk(str(clip), start, min(chunk_frames, kept - done)))
+    return chunks
+
+
+def encode_chunk(chunk: Chunk, speed: int, threads: int, path: str):
+    """Encode one chunk of the timelapse to path, runs on a pool worker."""
+    (
+        # seeking is frame accurate when re-encoding, n counts from the seek position
+        ffmpeg.input(chunk.clip, ss=chunk.start_frame / settings.FRAME_RATE)
+        .output(
+            path,
+            vf=f"select='not(mod(n\\,{speed}))',setpts=N/({settings.FRAME_RATE}*TB)",
+            an=None,
+            r=settings.FRAME_RATE,
+            pix_fmt="yuv420p",
+            vcodec=TIMELAPSE_CODEC,
+            crf=settings.QUALITY,
+            preset=TIMELAPSE_PRESET,
+            # one thread pool per chunk, headers in every chunk so they concatenate cleanly
+            **{
+                "x265-params": f"pools={threads}:frame-threads=1:repeat-headers=1:open-gop=0:log-level=error",
+                "frames:v": chunk.frames,
+            },
+            **recorder.COLOR_OPTIONS,
+        )
+        .global_args("-loglevel", "error")
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
+
+class Timelapse:
+    """Rendering of the timelapse of one app, runs on its own thread with a pool of chunk encoders."""
+
+    def __init__(self, appname: str, speed: int = 10, workers: int = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.appname = appname
+        self.speed = max(1, int(speed))
+        self.workers = workers or RENDER_WORKERS
+        self.state = "queued"  # queued, running, done, failed
+        self.error = None
+        self.output = settings.HOME_DIR / "Timelapses" / f"{appname} x{self.speed}.mkv"
+        self.chunks = 0
+        self.chunks_done = 0
+        self.frames = 0
+        self.started = time()
+        self.finished = None
+        self._lock = tr.Lock()
+        self.thread = tr.Thread(target=self._run, name=f"Timelapse {appname}", daemon=True)
+
+    def start(self):
+        JOBS[self.id] = self
+        self.thread.start()
+        return self
+
+    def _run(self):
+        self.state = "running"
+        workdir = settings.HOME_DIR / ".cache" / f"timelapse_{self.id}"
+        try:
+            workdir.mkdir(parents=True, exist_ok=True)
+            self._render(workdir)
+            self.state = "done"
+            print(f"Rendered timelapse of {self.appname}: {self.output}")
+        except Exception as e:
+            self.state = "failed"
+            self.error = getattr(e, "stderr", None) and e.stderr.decode(errors="replace").strip() or str(e)
+            print(f"Timelapse of {self.appname} failed: {self.error}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            self.finished = time()
+
+    def _render(self, workdir):
+        chunks = plan_chunks(timelines.read_takes(self.appname), self.speed)
+        if not chunks:
+            raise FileNotFoundError(f"No recorded takes of {self.appname} to render")
+        self.chunks = len(chunks)
+        self.frames = sum(chunk.frames for chunk in chunks)
+
+        # spread the cores over the chunks that run at the same time
+        workers = min(self.workers, len(chunks))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        paths = [str(workdir / f"{i:05}.mkv") for i in range(len(chunks))]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Timelapse Worker") as pool:
+            futures = [pool.submit(self._encode, chunk, threads, path) for chunk, path in zip(chunks, paths)]
+            wait(futures)
+        for future in futures:
+            future.result()  # raise the first error
+
+        listing = workdir / "chunks.txt"
+        listing.write_text("".join(f"file '{path}'\n" for path in paths), encoding="utf-8")
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        (
+            ffmpeg.input(str(listing), format="concat", safe=0)
+            .output(str(self.output), c="copy")
+            .global_args("-loglevel", "error")
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+
+    def _encode(self, chunk: Chunk, threads: int, path: str):
+        encode_chunk(chunk, self.speed, threads, path)
+        with self._lock:
+            self.chunks_done += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "app": self.appname,
+            "speed": self.speed,
+            "state": self.state,
+            "error": self.error,
+            "output": str(self.output),
+            "chunks": self.chunks,
+            "chunks_done": self.chunks_done,
+            "progress": round(self.chunks_done / self.chunks, 3) if self.chunks else 0.0,
+            "frames": self.frames,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def render(appname: str, speed: int = 10, workers: int = None) -> Timelapse:
+    """Start rendering the timelapse of the app, returns the running job."""
+    timelines.flush_all_edl_writers()
+    return Timelapse(appname, speed, workers).start()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the timelapse of an app's timeline.")
+    parser.add_argument("app", help="name of the app, as in the Timelines folder")
+    parser.add_argument("--speed", type=int, default=10, help="keep every n-th frame")
+    parser.add_argument("--workers", type=int, default=None, help="chunks encoded at the same time")
+    args = parser.parse_args()
+
+    job = render(args.app, args.speed, args.workers)
+    job.thread.join()
+    print(job.as_dict())
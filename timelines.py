@@ -1,7 +1,8 @@
-from math import e
+import threading as tr
+from time import perf_counter
+from typing import NamedTuple
 
-from flask.cli import F
-from settings import HOME_DIR
+import settings
 
 
 # EXAMPLE EDL FILE:
@@ -26,17 +27,23 @@ entry_template = """
 * FROM CLIP NAME: {clip_name}"""
 
 EDL_FPS: int = 30 # only 30 and 24 fps are supported in EDL files
+EDL_MAX_ENTRIES = 999  # entry numbers have three digits, the timeline continues in a new file
+TAIL_BYTES = 4096  # bytes read from the end of an EDL file to resume it, holds several entries
+FLUSH_ENTRIES = 8  # buffered entries are written to disk after this many entries
+FLUSH_SECONDS = 10  # or when the oldest buffered entry is this old
 EDL_WRITERS = {}
+_WRITERS_LOCK = tr.Lock()
 
 def register_take(appname: str, start_frame: int, end_frame: int, clip_name: str):
     """Register an app switch in the EDL file."""
-    # Find the writer for the appname, or create a new one if it doesn't exist
-    edl_writer = EDL_WRITERS.get(appname)
-    if edl_writer is None:
-        edl_writer = EdlDataWriter(appname)
-        EDL_WRITERS[appname] = edl_writer
-    # add the entry to the writer
-    edl_writer.add_entry(start_frame, end_frame, clip_name)
+    with _WRITERS_LOCK:
+        # Find the writer for the appname, or create a new one if it doesn't exist
+        edl_writer = EDL_WRITERS.get(appname)
+        if edl_writer is None:
+            edl_writer = EdlDataWriter(appname)
+            EDL_WRITERS[appname] = edl_writer
+        # add the entry to the writer
+        edl_writer.add_entry(start_frame, end_frame, clip_name)
 
 
 def frame_to_timecode(frame: int,industry_offset=False) -> str:
@@ -58,93 +65,175 @@ def timecode_to_frame(timecode: str) -> int:
     return (hours * 3600 + minutes * 60 + seconds) * EDL_FPS + frames
 
 
+class Take(NamedTuple):
+    clip_name: str
+    start_frame: int  # first frame of the take in the clip
+    end_frame: int  # first frame after the take
+
+
+def timeline_dir():
+    return settings.HOME_DIR / "Timelines"
+
+
+def list_apps() -> list:
+    """Names of all apps that have a timeline."""
+    return sorted({path.stem.rsplit(" ", 1)[0] for path in timeline_dir().glob("* *.edl")})
+
+
+def read_takes(appname: str) -> list:
+    """All takes of the app in timeline order, over every numbered file of its timeline."""
+    takes = []
+    lapped = 1
+    while (path := timeline_dir() / f"{appname} {lapped}.edl").exists():
+        start_source = end_source = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) == 8 and fields[0].isdigit() and fields[1] == "AX":
+                    start_source, end_source = fields[4], fields[5]
+                elif line.startswith("* FROM CLIP NAME:") and start_source is not None:
+                    clip_name = line.split(":", 1)[1].strip()
+                    takes.append(Take(clip_name, timecode_to_frame(start_source), timecode_to_frame(end_source)))
+                    start_source = None
+        lapped += 1
+    return takes
+
+
 class EdlDataWriter:
-    def __init__(self, appname: str, entry_limit_lapped = 1):
+    """Appends takes to the EDL timeline of one app.
+
+    The file stays open while recording and entries are buffered, they reach the
+    disk every FLUSH_ENTRIES entries, after FLUSH_SECONDS or on flush(). An
+    existing timeline is resumed from the last entries at the end of the file
+    only. After EDL_MAX_ENTRIES entries the timeline continues in the next
+    numbered file: "<app> 1.edl", "<app> 2.edl", ...
+    """
+
+    def __init__(self, appname: str, entry_limit_lapped = None):
         self.appname = appname
-        self.entry_limit_lapped = entry_limit_lapped # every 999 entries, a new file is created 
+        self.source_dir = settings.HOME_DIR / "Records"
+        self.file = None
+        self.pending = 0  # entries written to the buffer but not flushed
+        self.pending_since = 0.0
+
+        if entry_limit_lapped is None:
+            # continue in the newest file of the timeline
+            entry_limit_lapped = 1
+            while self._path(entry_limit_lapped + 1).exists():
+                entry_limit_lapped += 1
+        self._open(entry_limit_lapped)
+
+    def _path(self, lapped: int):
+        return settings.HOME_DIR / "Timelines" / f"{self.appname} {lapped}.edl"
+
+    def _open(self, lapped: int):
+        """Open (or create) the numbered EDL file and position the writer after its last entry."""
+        self.entry_limit_lapped = lapped
         self.entry_number = 1  # there is no entry 0 in EDL files
         self.timeline_frame = 0
-
-        self.source_dir = HOME_DIR / "Records" 
-        self.edl_path = HOME_DIR / "Timelines" / f"{self.appname} {self.entry_limit_lapped}.edl"
+        self.edl_path = self._path(lapped)
         self.edl_path.parent.mkdir(parents=True, exist_ok=True)
 
         valid = self._validate_and_extract_entry()
+        self.file = open(self.edl_path, "a" if valid else "w", encoding="utf-8")
         if not valid:
             self.new_file = True
-            # remove the file if it is invalid if it exists
-            self.edl_path.unlink(missing_ok=True)           
-            self.edl_path.touch()
             self._write_header()
             print(f"Created new EDL file: {self.edl_path}")
 
     def _write_header(self):
         """Write the header to the EDL file."""
-        with open(self.edl_path, "w") as f:
-            output = header_template.format(
-                title=self.appname,
-                source_directory=str(self.source_dir),
-            )
-            f.write(output)
-
-    def _validate_and_extract_entry(self) -> int:
-        """Read and validate the existing EDL file
+        output = header_template.format(
+            title=self.appname,
+            source_directory=str(self.source_dir),
+        )
+        self.file.write(output)
+        self.file.flush()
+
+    def _validate_and_extract_entry(self) -> bool:
+        """Read and validate the end of the existing EDL file
          return true if valid.
          return false if invalid.
-         sets the entry number and timeline frame to the last entry in the file.        
+         sets the entry number and timeline frame to continue after the last entry in the file.
         """
-
-        if  not self.edl_path.exists():    
-            return False    
         try:
-            with open(self.edl_path, "r") as f:
-                lines = f.readlines()
-                if len(lines) < 4:
+            with open(self.edl_path, "rb") as f:
+                if not f.read(6) == b"TITLE:":
                     print("EDL file is empty or malformed.")
-                    
-
-                last_timecode_line = lines[-2] # -2 because the last line is a reference to the clip name
-                last_entry_line = lines[-3]
-                # find the start timecode
-                start_timecode = last_timecode_line.split()[3]
-
-                # find the entry number
-                entry_number = last_entry_line.split()[0]
+                    return False
+                size = f.seek(0, 2)
+                f.seek(max(0, size - TAIL_BYTES))
+                tail = f.read().decode("utf-8", errors="replace")
+        except FileNotFoundError:
+            return False
 
-                self.timeline_frame = timecode_to_frame(start_timecode)
-                self.entry_number = int(entry_number) + 1
+        for line in reversed(tail.splitlines()):
+            fields = line.split()
+            # 001 AX V C <start source> <end source> <start timeline> <end timeline>
+            if len(fields) == 8 and fields[0].isdigit() and fields[1] == "AX":
+                try:
+                    end_timeline = timecode_to_frame(fields[7])
+                except ValueError:
+                    return False
+                self.entry_number = int(fields[0]) + 1
+                self.timeline_frame = end_timeline - EDL_FPS * 3600  # without the industry offset
                 return True
-        except:
-            return False
+        # a header without entries
+        return True
 
     def add_entry(self, start_frame: int, end_frame: int, clip_name: str):
         print(f"Adding entry: {start_frame} - {end_frame} {clip_name}")
+        if self.entry_number > EDL_MAX_ENTRIES:
+            # the timeline continues in the next file
+            self.close()
+            self._open(self.entry_limit_lapped + 1)
+
         # Convert frames to timecodes
         start_source = frame_to_timecode(start_frame)
         end_source = frame_to_timecode(end_frame)
-        start_timeline = frame_to_timecode(self.timeline_frame + start_frame,True)
-        end_timeline = frame_to_timecode(self.timeline_frame + end_frame,True)
+        start_timeline = frame_to_timecode(self.timeline_frame, True)
         self.timeline_frame += end_frame - start_frame
+        end_timeline = frame_to_timecode(self.timeline_frame, True)
         # Create the entry string
         entry = entry_template.format(
-            entry_number=self.entry_number,
+            entry_number=f"{self.entry_number:03}",
             start_source=start_source,
             end_source=end_source,
             start_timeline=start_timeline,
             end_timeline=end_timeline,
             clip_name=clip_name,
         )
-        # Write the entry to the file
-        with open(self.edl_path, "a") as f:
-            f.write(entry)
-            # Increment the entry number
-            self.entry_number += 1
-            # check if the entry number is greater than the limit
-            assert self.entry_number <= 999, "Entry number is greater than 999, we are cooked for now."
-
+        # Write the entry to the buffer, it reaches the file in batches
+        self.file.write(entry)
+        self.entry_number += 1
+        if not self.pending:
+            self.pending_since = perf_counter()
+        self.pending += 1
+        if self.pending >= FLUSH_ENTRIES or perf_counter() - self.pending_since >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries to disk."""
+        if self.file is not None and not self.file.closed:
+            self.file.flush()
+        self.pending = 0
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
 
 
 def flush_all_edl_writers():
     """Flush all EDL writers to their files."""
-    for appname, writer in EDL_WRITERS.items():
-        writer.flush()    
+    with _WRITERS_LOCK:
+        for writer in EDL_WRITERS.values():
+            writer.flush()
+
+
+def close_all_edl_writers():
+    """Flush and close all EDL writers, the next take opens them again."""
+    with _WRITERS_LOCK:
+        for writer in EDL_WRITERS.values():
+            writer.close()
+        EDL_WRITERS.clear()
@@ -6,17 +6,28 @@ from time import sleep
 import pystray
 from windows_toasts import Toast, ToastButton, WindowsToaster
 
+import events
 import recorder
 import run_on_boot
+import timelines
 import trigger
 import bouncer
+import catalog
 from icon_generator import ICONS
 import settings
 
+FINALISE_TIMEOUT = 120  # seconds exiting waits for stopped recordings to finish writing
+
+
 def exit_program():
     print("Exiting safely...""")
     if recorder.is_recording():
         stop()
+    # stopped recordings may still be writing their files
+    if not recorder.wait_finalised(FINALISE_TIMEOUT):
+        print("Some recordings did not finish writing in time")
+    timelines.close_all_edl_writers()
+    catalog.flush()
     settings.save()
     os._exit(0)
  
@@ -38,32 +49,41 @@ def toast(message):
 # as well as the option to open a specific folder in the file explorer
 # and one that opens the management page in the browser
 def start():
-    name = recorder.start()
-    TRAY.icon = ICONS.manual_recording
-    TRAY.menu = generate_menu(recording=True)
-    TRAY.title = "SempRecord - Recording"
-    toast('🔴 Record started | '+name)
+    show_state("start", recorder.start())
 
 
 def stop():
-    TRAY.icon = ICONS.rendering
-    name = recorder.stop()
-    if settings.USE_AUTOTRIGGER:
-        TRAY.icon = ICONS.standby
-    else:
-        TRAY.icon = ICONS.inactive
-    
-    TRAY.menu = generate_menu(recording=False)
-    TRAY.title = "SempRecord - Stopped"
-    toast('💾 Record saved | '+name)
+    if TRAY is not None:
+        TRAY.icon = ICONS.rendering
+    show_state("stop", recorder.stop())
 
 
 def pause():
     recorder.pause()
-    TRAY.icon = ICONS.paused
-    TRAY.menu = generate_menu(recording=True, paused=True)
-    TRAY.title = "SempRecord - Paused"
-    toast('🟡 Recording paused')
+    show_state("pause")
+
+
+def show_state(action: str, name: str = None):
+    """Show the icon, menu and toast of a start, stop or pause.
+    The recorder may be controlled without a tray icon (from the API), then this does nothing."""
+    if TRAY is None:
+        return
+    if action == "start":
+        TRAY.icon = ICONS.manual_recording
+        TRAY.menu = generate_menu(recording=True)
+        TRAY.title = "SempRecord - Recording"
+        toast('🔴 Record started | ' + name if name else '🔴 Recording resumed')
+    elif action == "stop":
+        TRAY.icon = ICONS.standby if settings.USE_AUTOTRIGGER else ICONS.inactive
+        TRAY.menu = generate_menu(recording=False)
+        TRAY.title = "SempRecord - Stopped"
+        if name:
+            toast('💾 Record saved | ' + name)
+    elif action == "pause":
+        TRAY.icon = ICONS.paused
+        TRAY.menu = generate_menu(recording=True, paused=True)
+        TRAY.title = "SempRecord - Paused"
+        toast('🟡 Recording paused')
 
 
 def flip_auto_trigger(icon, item):
@@ -87,10 +107,43 @@ def flip_run_on_boot(icon, item):
 def extract_app():
     """
     Handler for the "Extract app" menu option.
-    Currently does nothing, but will be implemented later.
+    Cuts the takes of every app with a timeline into one video per app in the Extracts folder.
     """
-    # To be implemented
-    pass
+    import extractor
+
+    jobs = extractor.extract()
+    if not jobs:
+        toast('No timelines to extract')
+        return
+    toast(f'✂ Extracting {len(jobs)} apps')
+
+    def wait():
+        for job in jobs:
+            job.thread.join()
+        failed = [job.appname for job in jobs if job.state == "failed"]
+        if failed:
+            toast('⚠ Extraction failed | ' + ', '.join(failed))
+        else:
+            toast('✅ Extraction done | ' + str(settings.HOME_DIR / "Extracts"))
+
+    Thread(target=wait, name="Extraction Wait Thread", daemon=True).start()
+
+
+def calibrate_encoder():
+    import encoder_profile
+
+    def calibrate():
+        toast('⏱ Calibrating encoder...')
+        try:
+            profiles = encoder_profile.calibrate_all()
+        except RuntimeError as e:
+            toast('⚠ ' + str(e))
+            return
+        toast('✅ Encoder calibrated | ' + ', '.join(f"{p['codec']} {p['preset']}" for p in profiles))
+
+    Thread(target=calibrate, name="Calibration Thread", daemon=True).start()
+
+
 def generate_menu(recording=False, paused=False):
     menu_items = []
     if paused:
@@ -108,64 +161,67 @@ def generate_menu(recording=False, paused=False):
     pystray.MenuItem("Open Folder", open_folder),
     pystray.MenuItem("Open Whitelist", bouncer.open_window, enabled=not recording),
     pystray.MenuItem("Extract app", extract_app, enabled=not recording),
+    pystray.MenuItem("Calibrate encoder", calibrate_encoder, enabled=not recording),
     pystray.MenuItem("Exit", exit_program)
     ])
 
     return pystray.Menu(*menu_items)
 
 
-MENU = generate_menu()
-icon = ICONS.standby if settings.USE_AUTOTRIGGER else ICONS.inactive
-TRAY = pystray.Icon(
-    icon=icon, menu=MENU, title="SempRecord", name="SempRecord"
-)
-TRAY.run_detached()
+TRAY = None
 
 
 def tray_status_thread():
     """
-    Continuously updates the title of the system tray icon with the current status of the recorder.
-
-    The function retrieves the status of the recorder every 10 seconds and extracts the following keys:
-    "frame", "size", "time", and "bitrate". If any of these keys are missing, the function skips the update.
-    Otherwise, it constructs a string with the values of these keys separated by newlines and sets it as the
-    title of the system tray icon.
+    Keeps the title of the system tray icon up to date with the encoder status of the recorder.
 
-    This function runs indefinitely until the program is terminated.
+    Listens to the "status" events of the recorder, see events.py, and shows the following keys:
+    "frame", "size", "time", and "bitrate", separated by newlines.
+    Runs until the program is terminated.
     """
+    subscriber = events.subscribe()
     while True:
-        sleep(10)
-        if not recorder.is_recording():
-            continue
-
-        status = recorder.ACTIVE_RECORDER.get_status()
-        if not status:
+        _, kind, status = subscriber.get()
+        if kind != "status" or not recorder.is_recording():
             continue
         try:
-            # try to collect the following the following keys: frame, size, time, bitrate 
             frames = status["frame"]
             size = status["size"]
             time = status["time"]
             bitrate = status["bitrate"]
-        
-            # use newlines to separate the values
-            title = f"Frames: {frames}\nSize: {size}\nTime: {time}\nBitrate: {bitrate}"
-            TRAY.title = title
         except KeyError:
-            break
+            continue
+        TRAY.title = f"Frames: {frames}\nSize: {size}\nTime: {time}\nBitrate: {bitrate}"
 
 
-status_thread = Thread(
-    target=tray_status_thread, daemon=True, name="Tray update status"
-).start()
+def run(setup=None):
+    """
+    Create the tray icon and run it, blocks until the program exits.
+    setup(icon) is called on its own thread once the icon is shown.
+    """
+    global TRAY
+
+    def on_ready(icon):
+        icon.visible = True
+        Thread(target=tray_status_thread, daemon=True, name="Tray update status").start()
+        if setup is not None:
+            setup(icon)
+
+    icon = ICONS.standby if settings.USE_AUTOTRIGGER else ICONS.inactive
+    TRAY = pystray.Icon(icon=icon, menu=generate_menu(), title="SempRecord", name="SempRecord")
+    TRAY.run(setup=on_ready)
 
 
 if __name__ == "__main__":
     # iterate through the various states of the recorder
-    from time import sleep
+    from icon_generator import ICON_COLORS
 
-    for icon in dir(ICONS):
-        if icon.startswith("_"):
-            continue
-        TRAY.icon = getattr(ICONS, icon)
-        sleep(2)
+    def show_states(icon):
+        icon.visible = True
+        for state in ICON_COLORS:
+            icon.icon = getattr(ICONS, state)
+            sleep(2)
+        icon.stop()
+
+    TRAY = pystray.Icon(icon=ICONS.inactive, menu=generate_menu(), title="SempRecord", name="SempRecord")
+    TRAY.run(setup=show_states)
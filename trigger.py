@@ -20,7 +20,10 @@ def trigger_thread(interval=5):
 
 def enable():
     """start the recording trigger thread"""
+    global _thread
     settings.USE_AUTOTRIGGER = True
+    if _thread is not None and _thread.is_alive():
+        return
     _thread =  threading.Thread(target=trigger_thread, name="Auto Trigger Thread", daemon=False)
     _thread.start()
 
@@ -31,5 +34,3 @@ def disable():
     if _thread is not None:
         _thread.join()
         _thread = None
-
-enable()
\ No newline at end of file
@@ -1,30 +1,130 @@
-from ctypes import create_unicode_buffer, windll
-from typing import Optional
+import threading
+from ctypes import byref, c_long, c_void_p, create_unicode_buffer
+from time import monotonic
+from typing import Callable, Optional
 
 import pynvml
 
 import settings
 
+try:
+    from ctypes import WINFUNCTYPE, windll, wintypes
+except ImportError:  # not on windows, e.g. when running the synthetic frame source
+    windll = None
+
+
+TITLE_MAX_AGE = 1.0  # seconds before a cached title is read again even if nothing said it changed
+_title_lock = threading.Lock()
+_title_buffer = create_unicode_buffer(256)
+_last_window = (None, -1, None, 0.0, 0)  # hWnd, title length, title, time read, title changes seen
+_title_changes = 0  # bumped by the hook every time the foreground window or a window title changes
+_title_watch = None  # stops that hook, None until the first title is read
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+
+
+def _title_changed():
+    global _title_changes
+    _title_changes += 1
+
 
 def getForegroundWindowTitle() -> Optional[str]:
     """
     Retrieves the title of the currently active foreground window.
+    The title is read again when the window handle or the title length changes, when a
+    window event says the focus or a title changed since, or when the cached title is
+    older than TITLE_MAX_AGE.
 
     Returns:
         Optional[str]: The title of the foreground window, stripped of any non-ASCII characters.
                        Returns None if the title cannot be retrieved.
     """
-    hWnd = windll.user32.GetForegroundWindow()
-    length = windll.user32.GetWindowTextLengthW(hWnd)
-    buf = create_unicode_buffer(length + 1)
-    windll.user32.GetWindowTextW(hWnd, buf, length + 1)
-    if buf.value:
-        # strip the string of any non-ascii characters
-        text = buf.value.encode("ascii", "ignore").decode()
+    global _title_buffer, _last_window, _title_watch
+    if windll is None:
+        return None
+    with _title_lock:
+        if _title_watch is None:
+            # a tab switch keeps the window and can keep the title length, the cache must hear of it
+            _title_watch = _watch_events((EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE), _title_changed)
+        changes = _title_changes
+        hWnd = windll.user32.GetForegroundWindow()
+        length = windll.user32.GetWindowTextLengthW(hWnd)
+        now = monotonic()
+        last_hWnd, last_length, last_title, last_read, last_changes = _last_window
+        if (
+            hWnd == last_hWnd
+            and length == last_length
+            and changes == last_changes
+            and now - last_read < TITLE_MAX_AGE
+        ):
+            return last_title
+
+        if length + 1 > len(_title_buffer):
+            _title_buffer = create_unicode_buffer(length + 1)
+        copied = windll.user32.GetWindowTextW(hWnd, _title_buffer, length + 1)
+        if copied:
+            # strip the string of any non-ascii characters
+            text = _title_buffer.value.encode("ascii", "ignore").decode()
+        else:
+            text = None
+        # a change that came in while reading leaves the cache stale, the next call reads again
+        _last_window = (hWnd, length, text, now, changes)
         return text
-    else:
+
+
+def _watch_events(events: tuple, callback: Callable[[], None]) -> Optional[Callable[[], None]]:
+    """
+    Calls `callback` from a background thread every time one of the window `events` happens.
+
+    Returns:
+        Optional[Callable]: A function that stops watching, None if not on Windows.
+    """
+    if windll is None:
         return None
 
+    # signature of the WinEventProc callback
+    WinEventProc = WINFUNCTYPE(
+        None, c_void_p, wintypes.DWORD, wintypes.HWND, c_long, c_long, wintypes.DWORD, wintypes.DWORD
+    )
+    started = threading.Event()
+    thread_id = []
+
+    def hook_thread():
+        # the hooks are delivered through the message loop of the thread that set them
+        proc = WinEventProc(lambda *args: callback())
+        hooks = [
+            windll.user32.SetWinEventHook(event, event, 0, proc, 0, 0, WINEVENT_OUTOFCONTEXT) for event in events
+        ]
+        thread_id.append(windll.kernel32.GetCurrentThreadId())
+        started.set()
+        msg = wintypes.MSG()
+        while windll.user32.GetMessageW(byref(msg), 0, 0, 0) > 0:
+            windll.user32.TranslateMessage(byref(msg))
+            windll.user32.DispatchMessageW(byref(msg))
+        for hook in hooks:
+            windll.user32.UnhookWinEvent(hook)
+
+    threading.Thread(target=hook_thread, name="Window Event Watcher", daemon=True).start()
+    started.wait()
+
+    def unwatch():
+        windll.user32.PostThreadMessageW(thread_id[0], WM_QUIT, 0, 0)
+
+    return unwatch
+
+
+def watch_foreground(callback: Callable[[], None]) -> Optional[Callable[[], None]]:
+    """
+    Calls `callback` from a background thread every time the foreground window changes.
+
+    Returns:
+        Optional[Callable]: A function that stops watching, None if not on Windows.
+    """
+    return _watch_events((EVENT_SYSTEM_FOREGROUND,), callback)
+
 
 def nvenc_available() -> bool:
     """
@@ -35,6 +135,11 @@ def nvenc_available() -> bool:
     """
     try:
         pynvml.nvmlInit()
+    except Exception as e:
+        # no nvidia driver, nothing to shut down
+        print("Error: {}".format(e))
+        return False
+    try:
         deviceCount = pynvml.nvmlDeviceGetCount()
         for i in range(deviceCount):
             handle = pynvml.nvmlDeviceGetHandleByIndex(i)
@@ -64,6 +169,21 @@ def get_desktop_resolution():
     return screensize
 
 
+def get_monitors() -> list:
+    """
+    Retrieves the rectangles of all monitors attached to the desktop.
+
+    Returns:
+        list: (left, top, right, bottom) tuples in virtual desktop pixels, empty if not on Windows.
+    """
+    if windll is None:
+        return []
+    import win32api
+
+    windll.user32.SetProcessDPIAware()
+    return [rect for _, _, rect in win32api.EnumDisplayMonitors()]
+
+
 def get_thumbnail_resolution():
     """
     Calculates the resolution for thumbnails based on the desktop resolution